@@ -35,7 +35,7 @@ logging.info(f" - Debug Mode: {DEBUG}")
 if DEBUG:
     ALLOWED_HOSTS = ["*"]
 else:
-    ALLOWED_HOSTS = []
+    ALLOWED_HOSTS = [host for host in os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -51,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # outermost, so session and auth queries are counted too; inert unless PROFILE_REQUESTS
+    'frontend.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,6 +96,13 @@ DATABASES = {
     }
 }
 
+# Throwaway SQLite database, e.g. for loadtest.sh
+if os.getenv('DJANGO_SQLITE_PATH'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DJANGO_SQLITE_PATH'),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -114,6 +123,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hashers by algorithm; only one entry may use 'pbkdf2_sha256'
+PASSWORD_HASHERS = [
+    'frontend.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 work factor; measure it with `manage.py loadtest_signups --hash-only`
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 1_000_000))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -131,6 +152,27 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = Path(os.getenv('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles'))
+
+# collectstatic fingerprints file names and writes .gz/.br copies next to them (frontend/staticfiles.py);
+# runserver's DEBUG static view serves the unhashed source files instead
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'frontend.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+# Fingerprinted static files never change, so browsers may cache them for a year
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Generated images and other user media
+MEDIA_URL = 'media/'
+MEDIA_ROOT = Path(os.getenv('DJANGO_MEDIA_ROOT', BASE_DIR / 'media'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -139,3 +181,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # After login, redirect users to their profile page
 LOGIN_REDIRECT_URL = '/accounts/profile/'
+
+# Image generation queue, see frontend/jobs.py
+# Dotted path to the generator backend class run by `manage.py run_generation_worker`
+GENERATION_BACKEND = os.getenv('GENERATION_BACKEND', 'frontend.generators.PlaceholderGenerator')
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', 2))
+# Seconds the worker waits before polling an empty queue again
+GENERATION_POLL_INTERVAL = float(os.getenv('GENERATION_POLL_INTERVAL', 1.0))
+# Seconds after which a running job is taken for one left behind by a crashed worker and queued again
+GENERATION_STALE_AFTER = float(os.getenv('GENERATION_STALE_AFTER', 3600))
+# Seconds between status checks of the server-sent events endpoint
+GENERATION_EVENTS_INTERVAL = float(os.getenv('GENERATION_EVENTS_INTERVAL', 0.5))
+
+# Gallery, see frontend/gallery.py
+GALLERY_ROOT = Path(os.getenv('GALLERY_ROOT', MEDIA_ROOT / 'gallery'))
+GALLERY_THUMBNAIL_SIZES = (256, 512)
+GALLERY_THUMBNAIL_QUALITY = 80
+GALLERY_PAGE_SIZE = 24
+# Gallery files are addressed by content hash, so browsers may cache them for a year
+GALLERY_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Adds a Server-Timing header (total, SQL, template time) to every response, see frontend/middleware.py
+PROFILE_REQUESTS = bool(os.environ.get('DJANGO_PROFILE_REQUESTS', False))
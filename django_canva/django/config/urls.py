@@ -14,10 +14,12 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.contrib.auth import views as auth_views
-from frontend.views import account_profile, logout_view
+from frontend.views import account_profile, logout_view, static_file
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,3 +28,12 @@ urlpatterns = [
     path('logout/', logout_view, name='logout'),
     path('accounts/profile/', account_profile, name='account-profile'),
 ]
+
+# Serve generated media from the app in debug mode
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Collected static files with pre-compressed variants and immutable caching;
+# runserver in debug mode serves the source files before this is reached
+urlpatterns += [
+    re_path(rf'^{settings.STATIC_URL.lstrip("/")}(?P<path>.+)$', static_file, name='static-file'),
+]
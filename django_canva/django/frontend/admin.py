@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import GalleryImage, GenerationJob
+
+
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'user', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('prompt',)
+
+
+@admin.register(GalleryImage)
+class GalleryImageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'sha256', 'user', 'width', 'height', 'thumbnails_ready', 'created_at')
+    list_filter = ('thumbnails_ready',)
+    search_fields = ('sha256', 'prompt')
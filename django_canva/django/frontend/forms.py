@@ -1,17 +1,22 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db.models import Q
 
 
 class SignupForm(forms.Form):
+    DUPLICATE_EMAIL = 'An account with this email already exists.'
+
     name = forms.CharField(max_length=150)
     email = forms.EmailField()
     password = forms.CharField(widget=forms.PasswordInput())
 
     def clean_email(self):
         email = self.cleaned_data['email'].strip().lower()
-        if User.objects.filter(username=email).exists() or User.objects.filter(email=email).exists():
-            raise forms.ValidationError('An account with this email already exists.')
+        # one query, served by the username index and the case-insensitive email index; the latter
+        # leaves blank emails out, so the lookup has to say so too before Postgres will use it
+        if User.objects.filter(Q(username=email) | (Q(email__iexact=email) & ~Q(email=''))).exists():
+            raise forms.ValidationError(self.DUPLICATE_EMAIL)
         return email
 
     def clean_password(self):
@@ -21,3 +26,12 @@ class SignupForm(forms.Form):
         return password
 
 
+class GenerationForm(forms.Form):
+    prompt = forms.CharField(max_length=2000)
+    style = forms.CharField(max_length=64, required=False)
+    color_scheme = forms.CharField(max_length=64, required=False)
+    product_type = forms.CharField(max_length=64, required=False)
+
+    def options(self):
+        # everything except the prompt is passed through to the generator backend
+        return {key: value for key, value in self.cleaned_data.items() if key != 'prompt' and value}
@@ -0,0 +1,124 @@
+"""
+Content-addressed gallery storage.
+
+Originals live at ``GALLERY_ROOT/ab/cd/<sha256>.<ext>`` and thumbnails at
+``GALLERY_ROOT/thumbs/<size>/ab/cd/<sha256>.webp``, so a file's URL never
+changes its content and can be cached forever. Identical images are written
+once no matter how many gallery entries point at them.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from .models import GalleryImage
+
+THUMBNAIL_FORMAT = 'webp'
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+
+def _root():
+    return Path(settings.GALLERY_ROOT)
+
+
+def _shard(sha256):
+    return Path(sha256[:2]) / sha256[2:4]
+
+
+def original_path(sha256, extension):
+    return _root() / _shard(sha256) / f"{sha256}.{extension}"
+
+
+def thumbnail_path(sha256, size):
+    return _root() / 'thumbs' / str(size) / _shard(sha256) / f"{sha256}.{THUMBNAIL_FORMAT}"
+
+
+def _write_once(path, content):
+    """Atomically create ``path`` unless it already exists."""
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def store(content, extension, user=None, prompt=''):
+    """Save image bytes and return the new :class:`GalleryImage` row."""
+    from PIL import Image
+
+    extension = extension.lower()
+    sha256 = hashlib.sha256(content).hexdigest()
+    _write_once(original_path(sha256, extension), content)
+
+    with Image.open(io.BytesIO(content)) as image:
+        width, height = image.size
+
+    return GalleryImage.objects.create(
+        user=user,
+        prompt=prompt,
+        sha256=sha256,
+        extension=extension,
+        width=width,
+        height=height,
+        size=len(content),
+        thumbnails_ready=GalleryImage.objects.filter(sha256=sha256, thumbnails_ready=True).exists(),
+    )
+
+
+def make_thumbnails(sha256, extension, sizes):
+    """Render every thumbnail size for one original. Runs in a worker process."""
+    from PIL import Image
+
+    with Image.open(original_path(sha256, extension)) as image:
+        image = image.convert('RGB')
+        for size in sizes:
+            path = thumbnail_path(sha256, size)
+            if path.exists():
+                continue
+            thumb = image.copy()
+            thumb.thumbnail((size, size))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    thumb.save(f, THUMBNAIL_FORMAT, quality=settings.GALLERY_THUMBNAIL_QUALITY)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+    return sha256
+
+
+def mark_thumbnails_ready(sha256):
+    # entries sharing a blob share its thumbnails too
+    return GalleryImage.objects.filter(sha256=sha256).update(thumbnails_ready=True)
+
+
+def page(queryset, before=None, page_size=None):
+    """
+    Keyset pagination over ``-id``: returns ``(items, next_cursor)``.
+
+    Unlike OFFSET paging the cost of a page does not grow with its depth.
+    """
+    page_size = page_size or settings.GALLERY_PAGE_SIZE
+    queryset = queryset.order_by('-id')
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    items = list(queryset[:page_size + 1])
+    next_cursor = items[page_size - 1].id if len(items) > page_size else None
+    return items[:page_size], next_cursor
@@ -0,0 +1,52 @@
+"""
+Image generator backends.
+
+A backend is any class with a ``generate(prompt, options)`` method that returns
+the encoded image as ``(bytes, extension)``. The worker picks the backend named
+in ``settings.GENERATION_BACKEND`` and calls it inside a worker process, so
+backends must not touch the database.
+"""
+import hashlib
+import io
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseGenerator:
+    def generate(self, prompt, options):
+        raise NotImplementedError
+
+
+class PlaceholderGenerator(BaseGenerator):
+    """Draws a gradient derived from the prompt; stands in until a real model is wired up."""
+
+    size = (512, 512)
+
+    def generate(self, prompt, options):
+        from PIL import Image
+
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        start, end = digest[:3], digest[3:6]
+        width, height = self.size
+
+        image = Image.new('RGB', self.size)
+        pixels = image.load()
+        for y in range(height):
+            t = y / (height - 1)
+            row = tuple(int(a + (b - a) * t) for a, b in zip(start, end))
+            for x in range(width):
+                pixels[x, y] = row
+
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        return buffer.getvalue(), 'png'
+
+
+def get_generator(path=None):
+    return import_string(path or settings.GENERATION_BACKEND)()
+
+
+def run_generator(path, prompt, options):
+    """Entry point executed in the worker's process pool."""
+    return get_generator(path).generate(prompt, options)
@@ -0,0 +1,37 @@
+"""
+Password hashing with a cost taken from settings.
+
+``PASSWORD_HASH_ITERATIONS`` sets the PBKDF2 work factor. Stored hashes made
+with a different count still verify and are upgraded on the next login.
+:func:`ahash_password` runs the hash off the event loop, so one signup does not
+stall every other request handled by the same ASGI worker.
+"""
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+def timed_make_password(password):
+    """Return ``(encoded_hash, seconds_spent)``."""
+    started = time.perf_counter()
+    encoded = make_password(password)
+    elapsed = time.perf_counter() - started
+    logger.debug("password hashed in %.1f ms", elapsed * 1000)
+    return encoded, elapsed
+
+
+async def ahash_password(password):
+    # hashlib releases the GIL while deriving the key, so a plain thread pool is enough
+    encoded, _ = await sync_to_async(timed_make_password, thread_sensitive=False)(password)
+    return encoded
@@ -0,0 +1,182 @@
+"""
+Generation job queue.
+
+Web views only call :func:`enqueue`; the ``run_generation_worker`` management
+command claims queued rows and hands the actual generation to a process pool,
+so a long generation never occupies a web worker.
+"""
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import gallery
+from .generators import run_generator
+from .models import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(prompt, user=None, options=None):
+    return GenerationJob.objects.create(
+        prompt=prompt,
+        user=user if user is not None and user.is_authenticated else None,
+        options=options or {},
+    )
+
+
+def claim_next():
+    """Mark the oldest queued job as running and return it, or ``None``."""
+    with transaction.atomic():
+        job = (
+            GenerationJob.objects.select_for_update(skip_locked=True)
+            .filter(status=GenerationJob.Status.QUEUED)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = GenerationJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def complete(job, content, extension):
+    job.image = gallery.store(content, extension, user=job.user, prompt=job.prompt)
+    job.status = GenerationJob.Status.SUCCEEDED
+    job.finished_at = timezone.now()
+    job.save(update_fields=['image', 'status', 'finished_at'])
+    return job.image
+
+
+def fail(job, error):
+    job.status = GenerationJob.Status.FAILED
+    job.error = str(error)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+
+
+def requeue_stale(stale_after=None, exclude=()):
+    """
+    Put jobs left ``running`` by a crashed worker back in the queue.
+
+    Other workers may be running jobs right now, so only jobs started more than
+    ``stale_after`` seconds (``GENERATION_STALE_AFTER``) ago count as left behind.
+    ``exclude`` takes the pks of jobs the caller is still running itself.
+    """
+    stale_after = stale_after if stale_after is not None else settings.GENERATION_STALE_AFTER
+    return GenerationJob.objects.filter(
+        status=GenerationJob.Status.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    ).exclude(pk__in=exclude).update(status=GenerationJob.Status.QUEUED, started_at=None)
+
+
+class Worker:
+    """Feeds queued jobs, and the thumbnails of their results, into a pool of processes."""
+
+    def __init__(self, executor=None, backend=None, max_workers=None):
+        self.max_workers = max_workers or settings.GENERATION_WORKERS
+        self.executor = executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        self.backend = backend or settings.GENERATION_BACKEND
+        self.in_flight = {}
+        self.thumbnails_in_flight = {}
+        self.requeued_at = None
+
+    def fill(self):
+        """Submit queued jobs until every pool slot is busy."""
+        submitted = 0
+        while len(self.in_flight) < self.max_workers:
+            job = claim_next()
+            if job is None:
+                break
+            future = self.executor.submit(run_generator, self.backend, job.prompt, job.options)
+            self.in_flight[future] = job
+            submitted += 1
+        return submitted
+
+    def submit_thumbnails(self, image):
+        future = self.executor.submit(
+            gallery.make_thumbnails, image.sha256, image.extension, settings.GALLERY_THUMBNAIL_SIZES
+        )
+        self.thumbnails_in_flight[future] = image
+        return future
+
+    def reap(self):
+        """Persist the results of finished generations and thumbnail renders."""
+        reaped = 0
+        for future in [f for f in self.in_flight if f.done()]:
+            job = self.in_flight.pop(future)
+            try:
+                self._persist(job, future)
+            except Exception:
+                # e.g. the database or the gallery went away; the job stays running until requeue_stale
+                logger.exception("could not save the result of generation job %s", job.pk)
+            reaped += 1
+
+        for future in [f for f in self.thumbnails_in_flight if f.done()]:
+            image = self.thumbnails_in_flight.pop(future)
+            try:
+                future.result()
+            except Exception:
+                # the gallery keeps showing a placeholder; build_thumbnails can retry later
+                logger.exception("thumbnails for %s failed", image.sha256)
+            else:
+                gallery.mark_thumbnails_ready(image.sha256)
+            reaped += 1
+        return reaped
+
+    def _persist(self, job, future):
+        try:
+            content, extension = future.result()
+        except Exception as e:
+            logger.exception("generation job %s failed", job.pk)
+            fail(job, e)
+        else:
+            image = complete(job, content, extension)
+            if not image.thumbnails_ready:
+                self.submit_thumbnails(image)
+
+    def requeue_stale(self):
+        """
+        Requeue stale jobs every quarter of ``GENERATION_STALE_AFTER``, not only at startup: a job
+        whose result couldn't be saved, or whose process died, is otherwise stuck ``running``.
+        """
+        now = time.monotonic()
+        if self.requeued_at is not None and now - self.requeued_at < settings.GENERATION_STALE_AFTER / 4:
+            return 0
+        self.requeued_at = now
+        return requeue_stale(exclude=[job.pk for job in self.in_flight.values()])
+
+    def run_once(self):
+        return self.fill(), self.reap()
+
+    def drain(self):
+        """Wait for everything in flight, including thumbnails of jobs that finish meanwhile."""
+        while self.in_flight or self.thumbnails_in_flight:
+            wait(list(self.in_flight) + list(self.thumbnails_in_flight))
+            self.reap()
+
+    def run_forever(self, poll_interval=None):
+        poll_interval = poll_interval or settings.GENERATION_POLL_INTERVAL
+        try:
+            while True:
+                try:
+                    self.requeue_stale()
+                    self.fill()
+                    reaped = self.reap()
+                except Exception:
+                    # a database hiccup shouldn't stop the worker, the next poll tries again
+                    logger.exception("generation worker poll failed")
+                    reaped = 0
+                if not reaped and not self.in_flight and not self.thumbnails_in_flight:
+                    time.sleep(poll_interval)
+                else:
+                    time.sleep(min(poll_interval, 0.1))
+        finally:
+            self.drain()
+            self.executor.shutdown(wait=True)
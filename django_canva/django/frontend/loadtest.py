@@ -0,0 +1,231 @@
+"""
+Load-test scenarios for every frontend and auth URL.
+
+The runner talks HTTP to a live server (see ``loadtest.sh``) and reads the
+``Server-Timing`` header added by :class:`frontend.middleware.RequestProfilingMiddleware`
+to report latency percentiles, queries per request and template render time.
+Fixtures are created directly in the configured (throwaway) database, so the
+command and the server must share it.
+"""
+import io
+import itertools
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils import timezone
+
+from . import gallery
+from .models import GenerationJob
+
+LOADTEST_USER = 'loadtest@example.com'
+LOADTEST_PASSWORD = 'loadtest-password-123'
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    method: str = 'GET'
+    authenticated: bool = False
+    data: object = None
+    expected_status: int = 200
+
+    def body(self, sequence):
+        return self.data(sequence) if callable(self.data) else self.data
+
+
+@dataclass
+class Sample:
+    status: int
+    seconds: float
+    timings: dict = field(default_factory=dict)
+
+
+def prepare_fixtures():
+    """Create the user, gallery image and finished job the scenarios point at."""
+    from PIL import Image
+
+    user, created = User.objects.get_or_create(username=LOADTEST_USER, defaults={'email': LOADTEST_USER})
+    if created or not user.check_password(LOADTEST_PASSWORD):
+        user.set_password(LOADTEST_PASSWORD)
+        user.save(update_fields=['password'])
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (512, 512), (40, 80, 160)).save(buffer, 'PNG')
+    image = gallery.store(buffer.getvalue(), 'png', user=user, prompt='Load test image')
+    gallery.make_thumbnails(image.sha256, image.extension, settings.GALLERY_THUMBNAIL_SIZES)
+    gallery.mark_thumbnails_ready(image.sha256)
+
+    job = GenerationJob.objects.create(
+        user=user,
+        prompt='Load test job',
+        status=GenerationJob.Status.SUCCEEDED,
+        image=image,
+        finished_at=timezone.now(),
+    )
+    return {'user': user, 'image': image, 'job': job}
+
+
+def build_scenarios(fixtures, run_id='run'):
+    image, job = fixtures['image'], fixtures['job']
+    return [
+        Scenario('frontend-index', reverse('frontend-index')),
+        Scenario('frontend-gallery', reverse('frontend-gallery'), authenticated=True),
+        Scenario('frontend-gallery-file', image.get_absolute_url()),
+        Scenario('frontend-gallery-thumbnail', image.thumbnail_src),
+        Scenario('frontend-templates', reverse('frontend-templates')),
+        Scenario('frontend-profile', reverse('frontend-profile')),
+        Scenario(
+            'frontend-profile-create',
+            reverse('frontend-profile-create'),
+            method='POST',
+            data=lambda n: {
+                'name': 'Load Test',
+                'email': f"loadtest-{run_id}-{n}@example.com",
+                'password': LOADTEST_PASSWORD,
+            },
+            expected_status=302,
+        ),
+        Scenario(
+            'frontend-job-enqueue',
+            reverse('frontend-job-enqueue'),
+            method='POST',
+            authenticated=True,
+            data={'prompt': 'Load test prompt'},
+            expected_status=202,
+        ),
+        Scenario('frontend-job-status', reverse('frontend-job-status', args=[job.pk]), authenticated=True),
+        Scenario('frontend-job-events', reverse('frontend-job-events', args=[job.pk]), authenticated=True),
+        Scenario('login', reverse('login')),
+        Scenario('logout', reverse('logout')),
+        Scenario('account-profile', reverse('account-profile'), authenticated=True),
+        Scenario('static-file', static('frontend/css/app.css')),
+    ]
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Client:
+    """A cookie-keeping HTTP client, optionally logged in as the load-test user."""
+
+    def __init__(self, base_url, authenticated=False):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+        self.request('GET', reverse('login'))
+        if authenticated:
+            sample = self.request('POST', reverse('login'), {'username': LOADTEST_USER, 'password': LOADTEST_PASSWORD})
+            if sample.status != 302:
+                raise RuntimeError(f"load-test login failed with status {sample.status}")
+
+    def _csrf_token(self):
+        return next((c.value for c in self.cookies if c.name == settings.CSRF_COOKIE_NAME), '')
+
+    def request(self, method, path, data=None):
+        url = urllib.parse.urljoin(self.base_url, path)
+        body = None
+        headers = {'Referer': self.base_url}
+        if method == 'POST':
+            headers['X-CSRFToken'] = self._csrf_token()
+            body = urllib.parse.urlencode(data or {}).encode()
+        request = urllib.request.Request(url, data=body, headers=headers, method=method)
+
+        started = time.perf_counter()
+        try:
+            response = self.opener.open(request)
+        except urllib.error.HTTPError as e:
+            response = e
+        with response:
+            response.read()
+            seconds = time.perf_counter() - started
+            return Sample(response.status, seconds, parse_server_timing(response.headers.get('Server-Timing', '')))
+
+
+_TIMING = re.compile(r'(?P<name>[\w-]+)(?:;dur=(?P<dur>[\d.]+))?(?:;desc="(?P<desc>[^"]*)")?')
+
+
+def parse_server_timing(header):
+    """``'db;dur=1.5;desc="3 queries"'`` -> ``{'db': 1.5, 'queries': 3}``."""
+    timings = {}
+    for part in filter(None, (p.strip() for p in header.split(','))):
+        match = _TIMING.match(part)
+        if not match:
+            continue
+        if match['dur'] is not None:
+            timings[match['name']] = float(match['dur'])
+        if match['desc'] and match['desc'].endswith(' queries'):
+            timings['queries'] = int(match['desc'].split()[0])
+    return timings
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an unsorted sequence."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(int(round(p / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def run(base_url, scenarios, requests_per_scenario=50, concurrency=4):
+    """Drive every scenario and return ``{name: [Sample, ...]}``."""
+    sequence = itertools.count()
+    results = {}
+    for scenario in scenarios:
+        # one logged-in client per thread; clients are cheap but logins are not
+        clients = [Client(base_url, scenario.authenticated) for _ in range(concurrency)]
+
+        def hit(i, scenario=scenario, clients=clients):
+            client = clients[i % concurrency]
+            return client.request(scenario.method, scenario.path, scenario.body(next(sequence)))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results[scenario.name] = list(executor.map(hit, range(requests_per_scenario)))
+    return results
+
+
+def summarize(results, scenarios):
+    expected = {scenario.name: scenario.expected_status for scenario in scenarios}
+    summary = {}
+    for name, samples in results.items():
+        latencies = [s.seconds * 1000 for s in samples]
+        summary[name] = {
+            'requests': len(samples),
+            'errors': sum(1 for s in samples if s.status != expected[name]),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'queries': max((s.timings.get('queries', 0) for s in samples), default=0),
+            'template_ms': percentile([s.timings.get('tpl', 0.0) for s in samples], 50),
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance=0.2, min_delta_ms=5.0):
+    """List human-readable regressions of ``summary`` against a saved baseline."""
+    regressions = []
+    for name, current in summary.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if current['errors'] > before.get('errors', 0):
+            regressions.append(f"{name}: {current['errors']} errors (baseline {before.get('errors', 0)})")
+        if current['queries'] > before['queries']:
+            regressions.append(f"{name}: {current['queries']} queries per request (baseline {before['queries']})")
+        limit = max(before['p95_ms'] * (1 + tolerance), before['p95_ms'] + min_delta_ms)
+        if current['p95_ms'] > limit:
+            regressions.append(f"{name}: p95 {current['p95_ms']:.1f} ms (baseline {before['p95_ms']:.1f} ms)")
+    return regressions
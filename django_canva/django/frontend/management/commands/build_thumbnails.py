@@ -0,0 +1,36 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from frontend import gallery
+from frontend.models import GalleryImage
+
+
+class Command(BaseCommand):
+    help = 'Render missing gallery thumbnails in a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Number of processes.')
+
+    def handle(self, *args, **options):
+        pending = (
+            GalleryImage.objects.filter(thumbnails_ready=False)
+            .values_list('sha256', 'extension')
+            .distinct()
+        )
+        done = 0
+        with ProcessPoolExecutor(max_workers=options['workers'] or settings.GENERATION_WORKERS) as executor:
+            futures = [
+                executor.submit(gallery.make_thumbnails, sha256, extension, settings.GALLERY_THUMBNAIL_SIZES)
+                for sha256, extension in pending
+            ]
+            for future in as_completed(futures):
+                try:
+                    sha256 = future.result()
+                except Exception as e:
+                    self.stderr.write(f"Thumbnail failed: {e}")
+                    continue
+                gallery.mark_thumbnails_ready(sha256)
+                done += 1
+        self.stdout.write(f"Rendered thumbnails for {done} image(s)")
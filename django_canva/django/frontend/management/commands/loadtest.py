@@ -0,0 +1,65 @@
+import json
+import urllib.error
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test every frontend URL against a running server started with DJANGO_PROFILE_REQUESTS=1 '
+        'and report latency percentiles, queries per request and template time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/', help='Base URL of the running app.')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per URL.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients per URL.')
+        parser.add_argument('--only', nargs='*', default=None, help='Only run these URL names.')
+        parser.add_argument('--save', metavar='PATH', help='Write the results as a baseline JSON file.')
+        parser.add_argument('--baseline', metavar='PATH', help='Fail if results regress against this baseline.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Allowed p95 slowdown against the baseline, as a fraction (default 0.2).',
+        )
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        scenarios = loadtest.build_scenarios(loadtest.prepare_fixtures(), run_id)
+        if options['only']:
+            scenarios = [s for s in scenarios if s.name in options['only']]
+
+        try:
+            results = loadtest.run(options['url'], scenarios, options['requests'], options['concurrency'])
+        except urllib.error.URLError as e:
+            raise CommandError(f"Could not reach {options['url']}: {e.reason}")
+        finally:
+            User.objects.filter(username__startswith=f"loadtest-{run_id}-").delete()
+        summary = loadtest.summarize(results, scenarios)
+
+        self.stdout.write(
+            f"{'url':<28} {'reqs':>5} {'errs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'tpl ms':>8}"
+        )
+        for name, row in summary.items():
+            self.stdout.write(
+                f"{name:<28} {row['requests']:>5} {row['errors']:>5} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['p99_ms']:>8.1f} {row['queries']:>8} {row['template_ms']:>8.1f}"
+            )
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(summary, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Saved baseline to {options['save']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            regressions = loadtest.compare(summary, baseline, options['tolerance'])
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(f"REGRESSION {regression}")
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}"))
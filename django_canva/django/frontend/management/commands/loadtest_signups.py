@@ -0,0 +1,96 @@
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend.hashers import timed_make_password
+
+EMAIL_PREFIX = 'loadtest-'
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def _signup(base_url, email):
+    """Run one browser-like signup and return ``(succeeded, seconds)``."""
+    cookies = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies), _NoRedirect)
+    opener.open(urllib.parse.urljoin(base_url, '/profile/')).read()
+    token = next((c.value for c in cookies if c.name == settings.CSRF_COOKIE_NAME), '')
+
+    body = urllib.parse.urlencode({
+        'csrfmiddlewaretoken': token,
+        'name': 'Load Test',
+        'email': email,
+        'password': f"Lt-{uuid.uuid4().hex}",
+    }).encode()
+    request = urllib.request.Request(
+        urllib.parse.urljoin(base_url, '/profile/create/'),
+        data=body,
+        headers={'Referer': base_url},
+    )
+    started = time.perf_counter()
+    try:
+        opener.open(request).read()
+        status = 200
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status == 302, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Measure password hashing cost and signups per second against a running server.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/', help='Base URL of the running app.')
+        parser.add_argument('--count', type=int, default=100, help='Number of signups to perform.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Parallel clients.')
+        parser.add_argument('--hash-only', action='store_true', help='Only measure the configured password hash.')
+        parser.add_argument('--keep', action='store_true', help='Keep the created users instead of deleting them.')
+
+    def handle(self, *args, **options):
+        samples = [timed_make_password(uuid.uuid4().hex)[1] for _ in range(5)]
+        self.stdout.write(
+            f"Password hash: {settings.PASSWORD_HASH_ITERATIONS} iterations, "
+            f"{statistics.median(samples) * 1000:.1f} ms median"
+        )
+        if options['hash_only']:
+            return
+
+        run = uuid.uuid4().hex[:8]
+        emails = [f"{EMAIL_PREFIX}{run}-{i}@example.com" for i in range(options['count'])]
+        self.stdout.write(
+            f"Signing up {len(emails)} users at {options['url']} "
+            f"with {options['concurrency']} clients ({settings.DATABASES['default']['ENGINE']})"
+        )
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                results = list(executor.map(lambda email: _signup(options['url'], email), emails))
+        except urllib.error.URLError as e:
+            raise CommandError(f"Could not reach {options['url']}: {e.reason}")
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds for _, seconds in results)
+        succeeded = sum(1 for ok, _ in results if ok)
+        self.stdout.write(f"Succeeded: {succeeded}/{len(results)}")
+        self.stdout.write(f"Throughput: {succeeded / elapsed:.1f} signups/s")
+        self.stdout.write(
+            f"Latency: p50 {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms"
+        )
+
+        if not options['keep']:
+            deleted, _ = User.objects.filter(username__startswith=f"{EMAIL_PREFIX}{run}-").delete()
+            self.stdout.write(f"Removed {deleted} load-test row(s)")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from frontend.jobs import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued image generation jobs in a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Number of generator processes.')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to wait when the queue is empty.')
+
+    def handle(self, *args, **options):
+        worker = Worker(max_workers=options['workers'])
+        self.stdout.write(f"Generation worker started with {worker.max_workers} process(es) using {worker.backend}")
+        try:
+            worker.run_forever(poll_interval=options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Generation worker stopped")
@@ -0,0 +1,116 @@
+"""
+Per-request profiling, enabled with ``PROFILE_REQUESTS = True``.
+
+Each response gets a ``Server-Timing`` header with the total time, the time
+spent in SQL (and the query count) and the time spent rendering templates, so
+browser dev tools and ``manage.py loadtest`` can read them without extra
+plumbing. The same numbers are logged on the ``frontend.profiling`` logger.
+"""
+import contextvars
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import base as template_base
+
+logger = logging.getLogger('frontend.profiling')
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+
+def _profiled_execute(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_time += time.perf_counter() - started
+
+
+def _install_execute_wrapper(sender, connection, **kwargs):
+    # connections are per thread; the wrapper finds the request's profile through
+    # the context variable, which sync_to_async carries into the view's thread
+    if _profiled_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_profiled_execute)
+
+
+_original_template_render = template_base.Template.render
+
+
+def _profiled_template_render(self, context):
+    profile = _current.get()
+    if profile is None:
+        return _original_template_render(self, context)
+    # includes and extends render nested templates; only time the outermost one
+    profile.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        profile.template_depth -= 1
+        if profile.template_depth == 0:
+            profile.template_time += time.perf_counter() - started
+
+
+class RequestProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILE_REQUESTS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        template_base.Template.render = _profiled_template_render
+        connection_created.connect(_install_execute_wrapper)
+        for connection in connections.all(initialized_only=True):
+            _install_execute_wrapper(None, connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _start(self):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        return profile, token, time.perf_counter()
+
+    def _finish(self, request, response, profile, token, started):
+        _current.reset(token)
+        total = time.perf_counter() - started
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+            f'tpl;dur={profile.template_time * 1000:.1f}',
+        ])
+        logger.info(
+            "%s %s %s %.1fms queries=%d db=%.1fms tpl=%.1fms",
+            request.method, request.path, response.status_code, total * 1000,
+            profile.queries, profile.db_time * 1000, profile.template_time * 1000,
+        )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile, token, started = self._start()
+        response = self.get_response(request)
+        return self._finish(request, response, profile, token, started)
+
+    async def __acall__(self, request):
+        profile, token, started = self._start()
+        response = await self.get_response(request)
+        return self._finish(request, response, profile, token, started)
+
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Case-insensitive unique index on ``auth_user.email``.
+
+    Signup looks emails up with ``email__iexact``, which compares ``UPPER(email)``
+    on Postgres, so the index is built on that expression. Blank emails (e.g. a
+    superuser created without one) are left out, which makes the index partial:
+    Postgres only uses it for queries that also exclude blank emails
+    (``~Q(email='')``, see ``SignupForm.clean_email``).
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('frontend', '0002_gallery'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX frontend_auth_user_email_ci_uniq ON auth_user (UPPER(email)) WHERE email <> ''",
+            reverse_sql="DROP INDEX frontend_auth_user_email_ci_uniq",
+        ),
+    ]
@@ -1,3 +1,97 @@
+from django.conf import settings
 from django.db import models
+from django.urls import reverse
 
-# Create your models here.
+
+class GalleryImage(models.Model):
+    """A generated image in a user's gallery; the file itself is stored by content hash."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='gallery_images',
+    )
+    prompt = models.TextField(blank=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    extension = models.CharField(max_length=8)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    thumbnails_ready = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # gallery listings are keyset-paginated per user on descending id
+            models.Index(fields=['user', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]}.{self.extension}"
+
+    def get_absolute_url(self):
+        return reverse('frontend-gallery-file', args=[self.sha256, self.extension])
+
+    def thumbnail_url(self, size):
+        return reverse('frontend-gallery-thumbnail', args=[size, self.sha256])
+
+    @property
+    def thumbnail_src(self):
+        return self.thumbnail_url(min(settings.GALLERY_THUMBNAIL_SIZES))
+
+    def thumbnail_srcset(self):
+        return ', '.join(f"{self.thumbnail_url(size)} {size}w" for size in settings.GALLERY_THUMBNAIL_SIZES)
+
+
+class GenerationJob(models.Model):
+    """A queued image generation; web requests only create and read these rows."""
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='generation_jobs',
+    )
+    prompt = models.TextField()
+    options = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    image = models.ForeignKey(GalleryImage, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # the worker claims the oldest queued job, so keep that lookup indexed
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
+
+    def as_dict(self):
+        return {
+            'id': self.pk,
+            'status': self.status,
+            'prompt': self.prompt,
+            'result_url': self.image.get_absolute_url() if self.image_id else None,
+            'thumbnail_url': self.image.thumbnail_src if self.image_id else None,
+            'error': self.error or None,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,24 @@
+// Scroll functions for horizontal containers
+function scrollContainer(containerId, direction) {
+    const container = document.getElementById(containerId);
+    const scrollAmount = 300;
+    if (direction === 'left') {
+        container.scrollBy({ left: -scrollAmount, behavior: 'smooth' });
+    } else {
+        container.scrollBy({ left: scrollAmount, behavior: 'smooth' });
+    }
+}
+
+// Template function
+function useTemplate(promptText) {
+    document.getElementById('aiPrompt').value = promptText;
+    // Scroll to AI prompt section with better positioning
+    const el = document.getElementById('aiPrompt');
+    if (el) {
+        const rect = el.getBoundingClientRect();
+        const absoluteTop = rect.top + window.scrollY;
+        const offset = 120; // Better offset for header
+        window.scrollTo({ top: absoluteTop - offset, behavior: 'smooth' });
+        el.focus();
+    }
+}
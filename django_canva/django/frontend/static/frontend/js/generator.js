@@ -0,0 +1,343 @@
+// Cookie management for generation tracking
+function getCookie(name) {
+    const value = `; ${document.cookie}`;
+    const parts = value.split(`; ${name}=`);
+    if (parts.length === 2) return parts.pop().split(';').shift();
+    return null;
+}
+
+function setCookie(name, value, days) {
+    const expires = new Date();
+    expires.setTime(expires.getTime() + (days * 24 * 60 * 60 * 1000));
+    document.cookie = `${name}=${value};expires=${expires.toUTCString()};path=/`;
+}
+
+function getGenerationsLeft() {
+    const today = new Date().toDateString();
+    const lastDate = getCookie('lastGenerationDate');
+    const count = getCookie('generationCount');
+
+    if (lastDate !== today) {
+        setCookie('lastGenerationDate', today, 1);
+        setCookie('generationCount', '5', 1);
+        return 5;
+    }
+
+    return count ? parseInt(count) : 5;
+}
+
+function useGeneration() {
+    const current = getGenerationsLeft();
+    if (current > 0) {
+        setCookie('generationCount', (current - 1).toString(), 1);
+        document.getElementById('generationsLeft').textContent = current - 1;
+        return true;
+    }
+    return false;
+}
+
+let selectedProductType = '';
+
+// Product selection
+function selectProduct(productType) {
+    selectedProductType = productType;
+
+    // Remove active state from all products
+    document.querySelectorAll('.product-option').forEach(option => {
+        option.classList.remove('bg-blue-600/30', 'border-blue-400');
+        option.classList.add('bg-gray-800/50', 'border-gray-600');
+    });
+
+    // Add active state to selected product
+    event.target.closest('.product-option').classList.remove('bg-gray-800/50', 'border-gray-600');
+    event.target.closest('.product-option').classList.add('bg-blue-600/30', 'border-blue-400');
+
+    // Show selected product
+    document.getElementById('selectedProduct').classList.remove('hidden');
+    document.getElementById('selectedProductName').textContent = productType.charAt(0).toUpperCase() + productType.slice(1);
+
+    // Update color options based on product type
+    updateColorOptions(productType);
+}
+
+function updateColorOptions(productType) {
+    // Intentionally do nothing – selecting a product should not change color scheme
+    return;
+}
+
+// Section navigation
+function showSection(sectionId) {
+    // Hide all sections
+    document.getElementById('gallery-section').classList.add('hidden');
+    document.getElementById('templates-section').classList.add('hidden');
+    document.getElementById('profile-section').classList.add('hidden');
+
+    // Remove active state from all nav items
+    document.querySelectorAll('nav a').forEach(link => {
+        link.classList.remove('text-blue-400');
+    });
+
+    // Show selected section and highlight nav
+    document.getElementById(sectionId + '-section').classList.remove('hidden');
+    document.getElementById('nav-' + sectionId).classList.add('text-blue-400');
+
+    // Scroll to section
+    document.getElementById(sectionId + '-section').scrollIntoView({ behavior: 'smooth' });
+}
+
+function scrollToTop() {
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+}
+
+// Scroll functions for horizontal containers
+function scrollContainer(containerId, direction) {
+    const container = document.getElementById(containerId);
+    const scrollAmount = 300;
+    if (direction === 'left') {
+        container.scrollBy({ left: -scrollAmount, behavior: 'smooth' });
+    } else {
+        container.scrollBy({ left: scrollAmount, behavior: 'smooth' });
+    }
+}
+
+// Template functions
+function useTemplate(promptText) {
+    document.getElementById('aiPrompt').value = promptText;
+    // Scroll to AI prompt section with better positioning
+    const el = document.getElementById('aiPrompt');
+    if (el) {
+        const rect = el.getBoundingClientRect();
+        const absoluteTop = rect.top + window.scrollY;
+        const offset = 120; // Better offset for header
+        window.scrollTo({ top: absoluteTop - offset, behavior: 'smooth' });
+        el.focus();
+    }
+}
+
+// Login/Profile functions
+function login() {
+    const email = document.getElementById('email').value;
+    const password = document.getElementById('password').value;
+
+    if (!email || !password) {
+        alert('Please fill in all fields');
+        return;
+    }
+
+    // Simulate login
+    setCookie('userLoggedIn', 'true', 7);
+    setCookie('userEmail', email, 7);
+    setCookie('userName', email.split('@')[0], 7);
+
+    showProfileInfo();
+    alert('Login successful!');
+}
+
+function signup() {
+    const name = document.getElementById('signupName').value;
+    const email = document.getElementById('signupEmail').value;
+    const password = document.getElementById('signupPassword').value;
+
+    if (!name || !email || !password) {
+        alert('Please fill in all fields');
+        return;
+    }
+
+    // Simulate signup
+    setCookie('userLoggedIn', 'true', 7);
+    setCookie('userEmail', email, 7);
+    setCookie('userName', name, 7);
+
+    showProfileInfo();
+    alert('Account created successfully!');
+}
+
+function logout() {
+    setCookie('userLoggedIn', '', -1);
+    setCookie('userEmail', '', -1);
+    setCookie('userName', '', -1);
+
+    showLoginForm();
+    alert('Logged out successfully!');
+}
+
+function showLogin() {
+    document.getElementById('loginForm').classList.remove('hidden');
+    document.getElementById('signupForm').classList.add('hidden');
+}
+
+function showSignup() {
+    document.getElementById('loginForm').classList.add('hidden');
+    document.getElementById('signupForm').classList.remove('hidden');
+}
+
+function showProfileInfo() {
+    document.getElementById('loginForm').classList.add('hidden');
+    document.getElementById('signupForm').classList.add('hidden');
+    document.getElementById('profileInfo').classList.remove('hidden');
+
+    document.getElementById('userName').textContent = getCookie('userName') || 'User';
+    document.getElementById('userEmail').textContent = getCookie('userEmail') || '';
+
+    const used = 5 - getGenerationsLeft();
+    document.getElementById('profileGenerationsUsed').textContent = `${used}/5`;
+}
+
+function showLoginForm() {
+    document.getElementById('loginForm').classList.remove('hidden');
+    document.getElementById('signupForm').classList.add('hidden');
+    document.getElementById('profileInfo').classList.add('hidden');
+}
+
+function generateAIProduct() {
+    const prompt = document.getElementById('aiPrompt').value;
+    const style = document.getElementById('styleSelect').value;
+    const colorScheme = document.getElementById('colorScheme').value;
+
+    if (!prompt.trim()) {
+        alert('Please describe your desired product!');
+        return;
+    }
+
+    if (!selectedProductType) {
+        alert('Please select a product type first!');
+        return;
+    }
+
+    if (!useGeneration()) {
+        alert('You have reached your daily limit of 5 generations. Please try again tomorrow!');
+        return;
+    }
+
+    // Show loading modal with enhanced prompt info
+    document.getElementById('loadingModal').classList.remove('hidden');
+    document.getElementById('loadingModal').classList.add('flex');
+
+    const hideLoading = () => {
+        document.getElementById('loadingModal').classList.add('hidden');
+        document.getElementById('loadingModal').classList.remove('flex');
+    };
+
+    // Queue the generation, then follow its status stream until it finishes
+    const body = new URLSearchParams({
+        prompt: prompt,
+        style: style,
+        color_scheme: colorScheme,
+        product_type: selectedProductType,
+    });
+    fetch(document.body.dataset.enqueueUrl, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': getCookie('csrftoken') },
+        body: body,
+    })
+        .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+        .then(({ ok, data }) => {
+            if (!ok) {
+                hideLoading();
+                alert('Could not start the generation. Please check your prompt.');
+                return;
+            }
+            const events = new EventSource(data.events_url);
+            events.addEventListener('status', (event) => {
+                const job = JSON.parse(event.data);
+                if (job.status === 'succeeded') {
+                    events.close();
+                    hideLoading();
+                    window.open(job.result_url, '_blank');
+                } else if (job.status === 'failed') {
+                    events.close();
+                    hideLoading();
+                    alert(`Generation failed: ${job.error}`);
+                }
+            });
+            events.onerror = () => {
+                events.close();
+                hideLoading();
+            };
+        })
+        .catch(() => {
+            hideLoading();
+            alert('Could not reach the server. Please try again.');
+        });
+}
+
+function handleFileUpload(input) {
+    const file = input.files[0];
+    if (file) {
+        const uploadZone = document.getElementById('uploadZone');
+        uploadZone.innerHTML = `
+            <div class="mb-3">
+                <span class="text-4xl">✅</span>
+            </div>
+            <h4 class="text-lg font-semibold mb-2">Image uploaded!</h4>
+            <p class="text-gray-400 mb-2 text-sm">${file.name}</p>
+            <p class="text-xs text-green-400">Ready for processing</p>
+        `;
+    }
+}
+
+function processUploadedImage() {
+    const fileInput = document.getElementById('fileInput');
+    if (!fileInput.files[0]) {
+        alert('Please upload an image first!');
+        return;
+    }
+
+    if (!useGeneration()) {
+        alert('You have reached your daily limit of 5 generations. Please try again tomorrow!');
+        return;
+    }
+
+    // Show loading modal
+    document.getElementById('loadingModal').classList.remove('hidden');
+    document.getElementById('loadingModal').classList.add('flex');
+
+    // Simulate processing
+    setTimeout(() => {
+        document.getElementById('loadingModal').classList.add('hidden');
+        document.getElementById('loadingModal').classList.remove('flex');
+        alert('🎉 Your product has been successfully created! In a real app you could edit it now.');
+    }, 2000);
+}
+
+// Initialize page
+document.addEventListener('DOMContentLoaded', function() {
+    document.getElementById('generationsLeft').textContent = getGenerationsLeft();
+
+    // Check if user is logged in
+    if (getCookie('userLoggedIn') === 'true') {
+        showProfileInfo();
+    } else {
+        showLoginForm();
+    }
+
+    // Show initial section if provided by server
+    const initial = document.body.dataset.initialSection;
+    if (initial) {
+        showSection(initial);
+    }
+});
+
+// Drag and drop functionality
+const uploadZone = document.getElementById('uploadZone');
+
+uploadZone.addEventListener('dragover', (e) => {
+    e.preventDefault();
+    uploadZone.style.borderColor = 'rgba(59, 130, 246, 1)';
+    uploadZone.style.backgroundColor = 'rgba(59, 130, 246, 0.3)';
+});
+
+uploadZone.addEventListener('dragleave', (e) => {
+    e.preventDefault();
+    uploadZone.style.borderColor = 'rgba(59, 130, 246, 0.5)';
+    uploadZone.style.backgroundColor = 'linear-gradient(45deg, rgba(59, 130, 246, 0.1), rgba(147, 51, 234, 0.1))';
+});
+
+uploadZone.addEventListener('drop', (e) => {
+    e.preventDefault();
+    const files = e.dataTransfer.files;
+    if (files.length > 0) {
+        document.getElementById('fileInput').files = files;
+        handleFileUpload(document.getElementById('fileInput'));
+    }
+});
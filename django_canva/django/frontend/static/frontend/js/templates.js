@@ -0,0 +1,16 @@
+// Ensure prompt gets applied on index reliably even if query parsing fails
+document.addEventListener('DOMContentLoaded', function() {
+  document.querySelectorAll('.use-template').forEach(function(el) {
+    el.addEventListener('click', function(ev) {
+      ev.preventDefault();
+      const prompt = el.getAttribute('data-prompt');
+      const href = el.getAttribute('href');
+      if (prompt) {
+        try { sessionStorage.setItem('aiPromptTemplate', prompt); } catch (e) {}
+        try { localStorage.setItem('aiPromptTemplate', prompt); } catch (e) {}
+      }
+      // Navigate after storing
+      setTimeout(function(){ window.location.href = href; }, 0);
+    });
+  });
+});
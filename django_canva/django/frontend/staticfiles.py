@@ -0,0 +1,79 @@
+"""
+Static file storage with fingerprinted names and pre-compressed copies.
+
+``collectstatic`` writes ``app.3f2a9c1b7d4e.css`` next to ``app.css`` (via the
+manifest storage) and then a ``.gz`` and, when Brotli is installed, a ``.br``
+copy of every compressible hashed file. :func:`frontend.views.static_file`
+picks the smallest copy the browser accepts, so serving never compresses on
+the request path.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.html', '.xml', '.ico'}
+# tiny files gain nothing from compression once headers are counted
+MIN_COMPRESS_SIZE = 256
+
+# (Content-Encoding, file suffix), most preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')] if brotli else [('gzip', '.gz')]
+
+
+def _compress(content):
+    yield '.gz', gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli:
+        yield '.br', brotli.compress(content, quality=11)
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts, from an ``Accept-Encoding`` header."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if coding and params not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.lower())
+    return accepted
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # before the first collectstatic (development, tests) there is no
+            # manifest at all; fall back to the plain name instead of failing
+            if self.hashed_files:
+                raise
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            self._write_compressed(hashed_name)
+
+    def _write_compressed(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in _compress(content):
+            # keep only copies that are meaningfully smaller than the original
+            if len(compressed) < len(content) * 0.95:
+                with open(self.path(name + suffix), 'wb') as f:
+                    f.write(compressed)
+
+    def is_immutable(self, name):
+        """Whether ``name`` is a fingerprinted file, whose content never changes."""
+        return name in self.hashed_files.values()
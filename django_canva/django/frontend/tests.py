@@ -1,4 +1,427 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
- 
\ No newline at end of file
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+
+from PIL import Image
+
+from . import gallery, jobs, loadtest, staticfiles
+from .forms import SignupForm
+from .generators import BaseGenerator
+from .models import GalleryImage, GenerationJob
+
+
+def make_png(color=(255, 0, 0), size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class FakeGenerator(BaseGenerator):
+    def generate(self, prompt, options):
+        return make_png(color=(len(prompt) % 256, 0, 0)), 'png'
+
+
+class FailingGenerator(BaseGenerator):
+    def generate(self, prompt, options):
+        raise RuntimeError('model exploded')
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    GALLERY_ROOT=Path(MEDIA_ROOT) / 'gallery',
+    GALLERY_THUMBNAIL_SIZES=(16, 32),
+    GENERATION_BACKEND='frontend.tests.FakeGenerator',
+    GENERATION_WORKERS=2,
+    GENERATION_EVENTS_INTERVAL=0,
+)
+class GenerationJobTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def _drain(self, backend=None):
+        worker = jobs.Worker(executor=ThreadPoolExecutor(max_workers=2), backend=backend)
+        worker.fill()
+        worker.drain()
+        worker.executor.shutdown(wait=True)
+        return worker
+
+    def test_enqueue_returns_immediately_with_queued_job(self):
+        response = self.client.post(reverse('frontend-job-enqueue'), {'prompt': 'A red fox', 'style': 'Modern'})
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual(data['status'], 'queued')
+        job = GenerationJob.objects.get(pk=data['id'])
+        self.assertEqual(job.options, {'style': 'Modern'})
+
+    def test_enqueue_requires_prompt(self):
+        response = self.client.post(reverse('frontend-job-enqueue'), {})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(GenerationJob.objects.exists())
+
+    def test_worker_runs_backend_and_stores_result(self):
+        job = jobs.enqueue('A red fox')
+        self._drain()
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.SUCCEEDED)
+        self.assertEqual(job.image.prompt, 'A red fox')
+        self.assertTrue(job.image.thumbnails_ready)
+        self.assertTrue(gallery.thumbnail_path(job.image.sha256, 16).exists())
+
+    def test_worker_records_backend_failure(self):
+        job = jobs.enqueue('A red fox')
+        self._drain(backend='frontend.tests.FailingGenerator')
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.FAILED)
+        self.assertIn('model exploded', job.error)
+
+    def test_worker_fills_only_free_slots(self):
+        for i in range(3):
+            jobs.enqueue(f"prompt {i}")
+        worker = jobs.Worker(executor=ThreadPoolExecutor(max_workers=2), max_workers=2)
+        self.assertEqual(worker.fill(), 2)
+        self.assertEqual(GenerationJob.objects.filter(status=GenerationJob.Status.QUEUED).count(), 1)
+        worker.drain()
+        worker.executor.shutdown(wait=True)
+
+    def test_requeue_stale_running_jobs(self):
+        job = jobs.enqueue('A red fox')
+        jobs.claim_next()
+        GenerationJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.QUEUED)
+
+    def test_requeue_stale_leaves_jobs_of_live_workers_alone(self):
+        job = jobs.enqueue('A red fox')
+        jobs.claim_next()
+        self.assertEqual(jobs.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.RUNNING)
+
+    def test_worker_requeues_stale_jobs_while_running(self):
+        stale = jobs.enqueue('A red fox')
+        jobs.claim_next()
+        own = jobs.enqueue('A blue fox')
+        worker = jobs.Worker(executor=ThreadPoolExecutor(max_workers=2))
+        worker.fill()
+        wait(list(worker.in_flight))
+        long_ago = timezone.now() - timedelta(hours=2)
+        GenerationJob.objects.filter(pk__in=[stale.pk, own.pk]).update(started_at=long_ago)
+
+        self.assertEqual(worker.requeue_stale(), 1)
+        stale.refresh_from_db()
+        own.refresh_from_db()
+        self.assertEqual(stale.status, GenerationJob.Status.QUEUED)
+        # still running in this worker
+        self.assertEqual(own.status, GenerationJob.Status.RUNNING)
+
+        # not again until a quarter of GENERATION_STALE_AFTER has passed
+        GenerationJob.objects.filter(pk=stale.pk).update(status=GenerationJob.Status.RUNNING, started_at=long_ago)
+        self.assertEqual(worker.requeue_stale(), 0)
+        worker.requeued_at -= settings.GENERATION_STALE_AFTER / 4
+        self.assertEqual(worker.requeue_stale(), 1)
+        worker.drain()
+        worker.executor.shutdown(wait=True)
+
+    def test_worker_survives_failure_to_save_result(self):
+        job = jobs.enqueue('A red fox')
+        worker = jobs.Worker(executor=ThreadPoolExecutor(max_workers=2))
+        worker.fill()
+        wait(list(worker.in_flight))
+        with mock.patch.object(jobs, 'complete', side_effect=IntegrityError('connection lost')):
+            with self.assertLogs('frontend.jobs', 'ERROR'):
+                self.assertEqual(worker.reap(), 1)
+        worker.executor.shutdown(wait=True)
+        self.assertEqual(worker.in_flight, {})
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.RUNNING)
+
+    def test_status_is_visible_to_creator_only(self):
+        data = self.client.post(reverse('frontend-job-enqueue'), {'prompt': 'A red fox'}).json()
+        self.assertEqual(self.client.get(data['status_url']).json()['status'], 'queued')
+
+        self.client.logout()
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(data['status_url']).status_code, 404)
+
+    async def test_events_stream_until_finished(self):
+        user = await sync_to_async(User.objects.create_user)(username='a@example.com', password='secret-pass-123')
+        await self.async_client.aforce_login(user)
+        job = await sync_to_async(jobs.enqueue)('A red fox', user=user)
+        await sync_to_async(self._drain)()
+
+        response = await self.async_client.get(reverse('frontend-job-events', args=[job.pk]))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode('utf-8')
+        payload = json.loads(body.split('data: ', 1)[1])
+        self.assertEqual(payload['status'], 'succeeded')
+
+
+@override_settings(GALLERY_THUMBNAIL_SIZES=(16, 32), GALLERY_PAGE_SIZE=2)
+class GalleryTests(TestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        storage = override_settings(GALLERY_ROOT=Path(root))
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+        self.user = User.objects.create_user(username='a@example.com', password='secret-pass-123')
+        self.png = make_png()
+        self.image = gallery.store(self.png, 'png', user=self.user, prompt='A red fox')
+
+    def test_store_is_content_addressed(self):
+        again = gallery.store(self.png, 'png', user=self.user)
+        self.assertEqual(again.sha256, self.image.sha256)
+        path = gallery.original_path(self.image.sha256, 'png')
+        self.assertEqual(path.read_bytes(), self.png)
+        self.assertEqual(path.parent.name, self.image.sha256[2:4])
+        self.assertEqual((self.image.width, self.image.height), (64, 48))
+
+    def test_make_thumbnails_fits_every_size(self):
+        gallery.make_thumbnails(self.image.sha256, 'png', (16, 32))
+        gallery.mark_thumbnails_ready(self.image.sha256)
+        with Image.open(gallery.thumbnail_path(self.image.sha256, 32)) as thumb:
+            self.assertEqual(thumb.size, (32, 24))
+        self.assertTrue(gallery.store(self.png, 'png').thumbnails_ready)
+
+    def test_failed_thumbnail_leaves_no_temp_file(self):
+        directory = gallery.thumbnail_path(self.image.sha256, 16).parent
+        with mock.patch('PIL.Image.Image.save', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                gallery.make_thumbnails(self.image.sha256, 'png', (16,))
+        self.assertEqual([path.name for path in directory.glob('.tmp-*')], [])
+        self.assertFalse(gallery.thumbnail_path(self.image.sha256, 16).exists())
+
+    def test_file_is_served_with_immutable_caching(self):
+        response = self.client.get(self.image.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.png)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(self.image.get_absolute_url(), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        url = self.image.get_absolute_url()
+        response = self.client.get(url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.png[:10])
+        self.assertEqual(response['Content-Range'], f'bytes 0-9/{len(self.png)}')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.png[-4:])
+
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(self.png)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_missing_thumbnail_is_404(self):
+        self.assertEqual(self.client.get(self.image.thumbnail_url(16)).status_code, 404)
+        self.assertEqual(self.client.get(self.image.thumbnail_url(16).replace('/16/', '/999/')).status_code, 404)
+
+    def test_gallery_keyset_pagination(self):
+        for i in range(3):
+            gallery.store(make_png(color=(0, i, 0)), 'png', user=self.user)
+        self.client.force_login(self.user)
+
+        first = self.client.get(reverse('frontend-gallery'))
+        self.assertEqual(len(first.context['images']), 2)
+        cursor = first.context['next_cursor']
+
+        second = self.client.get(reverse('frontend-gallery'), {'before': cursor})
+        ids = [image.id for image in first.context['images'] + second.context['images']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(ids)), 4)
+        self.assertIsNone(second.context['next_cursor'])
+
+    def test_gallery_lists_only_own_images(self):
+        other = User.objects.create_user(username='b@example.com', password='secret-pass-123')
+        self.client.force_login(other)
+        response = self.client.get(reverse('frontend-gallery'))
+        self.assertEqual(list(response.context['images']), [])
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SignupTests(TestCase):
+
+    def _form(self, email):
+        return SignupForm({'name': 'Ada', 'email': email, 'password': 'correct-horse-battery'})
+
+    def test_uniqueness_is_one_query(self):
+        User.objects.create_user(username='ada@example.com', email='ada@example.com')
+        form = self._form(' ADA@example.com ')
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertIn('email', form.errors)
+
+    def test_email_of_another_username_is_a_duplicate(self):
+        User.objects.create_user(username='ada', email='Ada@Example.com')
+        self.assertFalse(self._form('ada@example.com').is_valid())
+
+    @skipUnless(connection.vendor == 'postgresql', 'the index is only checked on Postgres')
+    def test_uniqueness_check_uses_the_email_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self._form('ada@example.com').is_valid()
+        with connection.cursor() as cursor:
+            # the table is tiny, so don't let the planner prefer scanning it anyway
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + queries[0]['sql'])
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('frontend_auth_user_email_ci_uniq', plan)
+
+    def test_email_is_unique_case_insensitively_in_the_database(self):
+        User.objects.create(username='one', email='Ada@Example.com')
+        with self.assertRaises(IntegrityError):
+            User.objects.create(username='two', email='ada@example.com')
+
+    def test_blank_emails_are_not_constrained(self):
+        User.objects.create(username='one', email='')
+        User.objects.create(username='two', email='')
+
+    def test_signup_creates_user_with_single_insert(self):
+        with self.assertNumQueries(2):  # uniqueness check + INSERT
+            response = self.client.post(reverse('frontend-profile-create'), {
+                'name': 'Ada', 'email': 'Ada@Example.com', 'password': 'correct-horse-battery',
+            })
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        user = User.objects.get(username='ada@example.com')
+        self.assertEqual(user.first_name, 'Ada')
+        self.assertTrue(user.check_password('correct-horse-battery'))
+        self.assertIn('$1000$', user.password)
+
+    def test_signup_rejects_duplicate(self):
+        User.objects.create_user(username='ada@example.com', email='ada@example.com')
+        response = self.client.post(reverse('frontend-profile-create'), {
+            'name': 'Ada', 'email': 'ada@example.com', 'password': 'correct-horse-battery',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.count(), 1)
+
+
+@override_settings(PROFILE_REQUESTS=True)
+class ProfilingTests(TestCase):
+
+    def test_server_timing_header_counts_queries(self):
+        # the middleware is only instantiated when the handler loads, i.e. per test client
+        self.client = self.client_class()
+        user = User.objects.create_user('p@example.com', 'p@example.com', 'pw-12345678')
+        self.client.force_login(user)
+        response = self.client.get(reverse('frontend-gallery'))
+        timings = loadtest.parse_server_timing(response['Server-Timing'])
+        self.assertEqual(timings['queries'], 3)  # session, user, images
+        self.assertIn('tpl', timings)
+        self.assertGreater(timings['total'], 0)
+
+    @override_settings(PROFILE_REQUESTS=False)
+    def test_disabled_by_default(self):
+        self.client = self.client_class()
+        self.assertNotIn('Server-Timing', self.client.get(reverse('frontend-index')))
+
+
+class LoadTestTests(TestCase):
+
+    def test_scenarios_cover_every_frontend_url(self):
+        names = {name for name in get_resolver().reverse_dict if isinstance(name, str) and not name.startswith('admin')}
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir, ignore_errors=True)
+        with override_settings(GALLERY_ROOT=Path(root_dir), GALLERY_THUMBNAIL_SIZES=(16,)):
+            scenarios = loadtest.build_scenarios(loadtest.prepare_fixtures())
+        self.assertEqual({s.name for s in scenarios}, names)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 50), 50)
+        self.assertEqual(loadtest.percentile(values, 95), 95)
+        self.assertEqual(loadtest.percentile([7], 99), 7)
+        self.assertEqual(loadtest.percentile([], 50), 0.0)
+
+    def test_compare_flags_slower_p95_and_extra_queries(self):
+        baseline = {'index': {'errors': 0, 'queries': 2, 'p95_ms': 100.0}}
+        self.assertEqual(loadtest.compare({'index': {'errors': 0, 'queries': 2, 'p95_ms': 110.0}}, baseline), [])
+        regressions = loadtest.compare({'index': {'errors': 0, 'queries': 3, 'p95_ms': 150.0}}, baseline)
+        self.assertEqual(len(regressions), 2)
+
+
+COMPRESSED_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'frontend.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+
+class StaticFilesTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.root, ignore_errors=True)
+        with override_settings(STATIC_ROOT=cls.root, STORAGES=COMPRESSED_STORAGES):
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+    def setUp(self):
+        override = override_settings(STATIC_ROOT=self.root, STORAGES=COMPRESSED_STORAGES)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.url = static('frontend/css/app.css')
+
+    @override_settings(STATIC_ROOT=tempfile.gettempdir() + '/no-collectstatic-here')
+    def test_unhashed_names_before_collectstatic(self):
+        self.assertEqual(static('frontend/css/app.css'), '/static/frontend/css/app.css')
+
+    def test_collectstatic_fingerprints_and_precompresses(self):
+        self.assertRegex(self.url, r'^/static/frontend/css/app\.[0-9a-f]{12}\.css$')
+        hashed = self.root / self.url[len('/static/'):]
+        self.assertTrue(hashed.with_name(hashed.name + '.gz').is_file())
+        if staticfiles.brotli:
+            self.assertTrue(hashed.with_name(hashed.name + '.br').is_file())
+
+    def test_serves_best_accepted_encoding_with_immutable_caching(self):
+        best = staticfiles.ENCODINGS[0][0]
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], best)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).decode()[:7], '@import')
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', response)
+
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unhashed_file_is_revalidated(self):
+        response = self.client.get('/static/frontend/css/app.css')
+        self.assertEqual(response['Cache-Control'], 'public, no-cache')
+
+    def test_paths_outside_static_root_are_404(self):
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/static/frontend/').status_code, 404)
@@ -1,13 +1,21 @@
-from django.urls import path
-from .views import index, gallery, templates_view, profile, create_profile
+from django.urls import path, re_path
+from .views import (
+    index, gallery, gallery_file, gallery_thumbnail, templates_view, profile, create_profile, enqueue_job, job_status,
+    job_events,
+)
 
 
 urlpatterns = [
     path('', index, name='frontend-index'),
     path('gallery/', gallery, name='frontend-gallery'),
+    re_path(r'^gallery/files/(?P<sha256>[0-9a-f]{64})\.(?P<extension>[a-z]+)$', gallery_file, name='frontend-gallery-file'),
+    re_path(r'^gallery/thumbs/(?P<size>[0-9]+)/(?P<sha256>[0-9a-f]{64})\.webp$', gallery_thumbnail, name='frontend-gallery-thumbnail'),
     path('templates/', templates_view, name='frontend-templates'),
     path('profile/', profile, name='frontend-profile'),
     path('profile/create/', create_profile, name='frontend-profile-create'),
+    path('jobs/', enqueue_job, name='frontend-job-enqueue'),
+    path('jobs/<int:job_id>/', job_status, name='frontend-job-status'),
+    path('jobs/<int:job_id>/events/', job_events, name='frontend-job-events'),
 ]
 
 
@@ -1,3 +1,9 @@
+import asyncio
+import json
+import mimetypes
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.contrib import messages
 from django.contrib.auth.models import User
@@ -7,16 +13,177 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import redirect
-from .forms import SignupForm
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.views.decorators.csrf import ensure_csrf_cookie
+from . import gallery as gallery_store
+from . import jobs, staticfiles
+from .forms import GenerationForm, SignupForm
+from .hashers import ahash_password
+from .models import GenerationJob
 from .templates_catalog import TEMPLATES
 
 
+@ensure_csrf_cookie
 def index(request):
     return render(request, 'frontend.html')
 
 
 def gallery(request):
-    return render(request, 'gallery.html')
+    images, next_cursor = [], None
+    if request.user.is_authenticated:
+        try:
+            before = int(request.GET['before'])
+        except (KeyError, ValueError):
+            before = None
+        images, next_cursor = gallery_store.page(request.user.gallery_images.all(), before=before)
+    return render(request, 'gallery.html', {
+        'images': images,
+        'next_cursor': next_cursor,
+    })
+
+
+def _parse_range(header, length):
+    """Return ``(start, end)`` for a single ``bytes=`` range, ``None`` to ignore it, or ``False`` if unsatisfiable."""
+    if not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[len('bytes='):].strip().partition('-')
+    try:
+        if start == '':
+            suffix = int(end)
+            if suffix == 0:
+                return False
+            return max(length - suffix, 0), length - 1
+        start = int(start)
+        end = int(end) if end else length - 1
+    except ValueError:
+        return None
+    if start >= length or end < start:
+        return False
+    return start, min(end, length - 1)
+
+
+def _read_range(path, start, length, chunk_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _file_response(request, path, content_type, etag, cache_control):
+    """Serve a file from disk with conditional GET and byte ranges."""
+    try:
+        length = path.stat().st_size
+    except FileNotFoundError:
+        raise Http404
+
+    etag = f'"{etag}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        byte_range = _parse_range(request.headers.get('Range', ''), length)
+        if request.headers.get('If-Range', etag) != etag:
+            byte_range = None
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{length}'
+            return response
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{length}'
+            response['Content-Length'] = str(end - start + 1)
+
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def _immutable_file_response(request, path, content_type, etag):
+    """Serve a content-addressed file with far-future caching."""
+    return _file_response(
+        request, path, content_type, etag, f'public, max-age={settings.GALLERY_CACHE_MAX_AGE}, immutable'
+    )
+
+
+@require_http_methods(["GET", "HEAD"])
+def gallery_file(request, sha256, extension):
+    if extension not in gallery_store.CONTENT_TYPES:
+        raise Http404
+    return _immutable_file_response(
+        request,
+        gallery_store.original_path(sha256, extension),
+        gallery_store.CONTENT_TYPES[extension],
+        sha256,
+    )
+
+
+@require_http_methods(["GET", "HEAD"])
+def gallery_thumbnail(request, size, sha256):
+    size = int(size)
+    if size not in settings.GALLERY_THUMBNAIL_SIZES:
+        raise Http404
+    return _immutable_file_response(
+        request,
+        gallery_store.thumbnail_path(sha256, size),
+        gallery_store.CONTENT_TYPES[gallery_store.THUMBNAIL_FORMAT],
+        f'{sha256}-{size}',
+    )
+
+
+@require_http_methods(["GET", "HEAD"])
+def static_file(request, path):
+    """Serve collected static files, preferring a pre-compressed copy the client accepts."""
+    try:
+        full_path = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not full_path.is_file():
+        raise Http404
+
+    content_type = mimetypes.guess_type(full_path.name)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+        content_type += '; charset=utf-8'
+
+    encoding = None
+    candidates = [(coding, full_path.with_name(full_path.name + suffix)) for coding, suffix in staticfiles.ENCODINGS]
+    candidates = [(coding, candidate) for coding, candidate in candidates if candidate.is_file()]
+    accepted = staticfiles.accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    for coding, candidate in candidates:
+        if coding in accepted:
+            encoding, full_path = coding, candidate
+            break
+
+    stat = full_path.stat()
+    etag = f'{stat.st_size:x}-{int(stat.st_mtime):x}' + (f'-{encoding}' if encoding else '')
+    is_immutable = getattr(staticfiles_storage, 'is_immutable', None)
+    if is_immutable is not None and is_immutable(path):
+        cache_control = f'public, max-age={settings.STATIC_CACHE_MAX_AGE}, immutable'
+    else:
+        # unhashed names can change in place: cache, but revalidate with the ETag
+        cache_control = 'public, no-cache'
+
+    response = _file_response(request, full_path, content_type, etag, cache_control)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if candidates:
+        response['Vary'] = 'Accept-Encoding'
+    return response
 
 
 def templates_view(request):
@@ -29,22 +196,30 @@ def profile(request):
     return render(request, 'profile.html')
 
 
+def _signup_failed(request, form):
+    for field, errors in form.errors.items():
+        for error in errors:
+            messages.error(request, f"{field}: {error}")
+    return render(request, 'profile.html', status=400)
+
+
 @require_POST
-def create_profile(request):
+async def create_profile(request):
     form = SignupForm(request.POST)
-    if not form.is_valid():
-        for field, errors in form.errors.items():
-            for error in errors:
-                messages.error(request, f"{field}: {error}")
-        return render(request, 'profile.html', status=400)
+    if not await sync_to_async(form.is_valid)():
+        return await sync_to_async(_signup_failed)(request, form)
 
     name = form.cleaned_data['name']
     email = form.cleaned_data['email']
-    password = form.cleaned_data['password']
+    password = await ahash_password(form.cleaned_data['password'])
+
+    # a single INSERT; the unique indexes catch a concurrent signup for the same email
+    try:
+        await User.objects.acreate(username=email, email=email, first_name=name, password=password)
+    except IntegrityError:
+        form.add_error('email', SignupForm.DUPLICATE_EMAIL)
+        return await sync_to_async(_signup_failed)(request, form)
 
-    user = User.objects.create_user(username=email, email=email, password=password)
-    user.first_name = name
-    user.save()
     messages.success(request, 'Account created successfully. You can now log in.')
     return redirect('login')
 
@@ -59,4 +234,69 @@ def logout_view(request):
     logout(request)
     return render(request, 'registration/logged_out.html')
 
+
+SESSION_JOBS_KEY = 'generation_jobs'
+
+
+def _owns_job(job, user, session_jobs):
+    if job.user_id is not None:
+        return user.is_authenticated and job.user_id == user.pk
+    return job.pk in session_jobs
+
+
+@require_POST
+def enqueue_job(request):
+    form = GenerationForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    job = jobs.enqueue(form.cleaned_data['prompt'], user=request.user, options=form.options())
+    # remember anonymous jobs in the session so only their creator can poll them
+    request.session[SESSION_JOBS_KEY] = request.session.get(SESSION_JOBS_KEY, []) + [job.pk]
+    data = job.as_dict()
+    data['status_url'] = reverse('frontend-job-status', args=[job.pk])
+    data['events_url'] = reverse('frontend-job-events', args=[job.pk])
+    return JsonResponse(data, status=202)
+
+
+@require_http_methods(["GET"])
+def job_status(request, job_id):
+    try:
+        job = GenerationJob.objects.get(pk=job_id)
+    except GenerationJob.DoesNotExist:
+        raise Http404
+    if not _owns_job(job, request.user, request.session.get(SESSION_JOBS_KEY, [])):
+        raise Http404
+    return JsonResponse(job.as_dict())
+
+
+async def job_events(request, job_id):
+    """Server-sent events stream of a job's status; needs the ASGI server to stay non-blocking."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    try:
+        job = await GenerationJob.objects.select_related('image').aget(pk=job_id)
+    except GenerationJob.DoesNotExist:
+        raise Http404
+    user = await request.auser()
+    session_jobs = await request.session.aget(SESSION_JOBS_KEY, [])
+    if not _owns_job(job, user, session_jobs):
+        raise Http404
+
+    async def stream(job):
+        last_status = None
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.as_dict())}\n\n"
+            if job.is_finished:
+                return
+            await asyncio.sleep(settings.GENERATION_EVENTS_INTERVAL)
+            job = await GenerationJob.objects.select_related('image').aget(pk=job.pk)
+
+    response = StreamingHttpResponse(stream(job), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 # Create your views here.
@@ -0,0 +1,43 @@
+#!/usr/bin/env bash
+# Load-test the app against a throwaway SQLite database and a profiling server.
+#
+#   ./loadtest.sh                       # print the report
+#   ./loadtest.sh --save baseline.json  # record a baseline
+#   ./loadtest.sh --baseline baseline.json  # exit non-zero on regressions
+#
+# Extra arguments are passed to `manage.py loadtest`.
+set -euo pipefail
+cd "$(dirname "$0")"
+
+PORT="${LOADTEST_PORT:-8765}"
+WORKDIR="$(mktemp -d)"
+export DJANGO_SQLITE_PATH="$WORKDIR/db.sqlite3"
+export DJANGO_PROFILE_REQUESTS=1
+export DJANGO_ALLOWED_HOSTS="${DJANGO_ALLOWED_HOSTS:-127.0.0.1,localhost}"
+export GALLERY_ROOT="$WORKDIR/gallery"
+export DJANGO_STATIC_ROOT="$WORKDIR/static"
+# keep signup latency representative without making the run take minutes
+export PASSWORD_HASH_ITERATIONS="${PASSWORD_HASH_ITERATIONS:-100000}"
+
+cleanup() {
+    if [[ -n "${SERVER_PID:-}" ]]; then
+        kill "$SERVER_PID" 2>/dev/null || true
+        wait "$SERVER_PID" 2>/dev/null || true
+    fi
+    rm -rf "$WORKDIR"
+}
+trap cleanup EXIT
+
+python manage.py migrate --noinput >/dev/null
+python manage.py collectstatic --noinput >/dev/null
+uvicorn config.asgi:application --host 127.0.0.1 --port "$PORT" --log-level warning &
+SERVER_PID=$!
+
+for _ in $(seq 50); do
+    if python -c "import urllib.request; urllib.request.urlopen('http://127.0.0.1:$PORT/')" 2>/dev/null; then
+        break
+    fi
+    sleep 0.2
+done
+
+python manage.py loadtest --url "http://127.0.0.1:$PORT/" "$@"
@@ -0,0 +1,39 @@
+'''
+Actions per minute with and without the cached login state.
+
+Every action used to reload Tinder to check the login (login_ttl=0 reproduces that);
+with the cache the check is a cookie/token read until the TTL runs out.
+Run it with a stored, logged-in session (e.g. after logging in once with store_session=True):
+
+    python examples/benchmark_login_state.py 20
+'''
+import sys
+import time
+from tinderbotj.session import Session
+from tinderbotj.helpers.login_state import LoginState
+
+
+def actions_per_minute(session, amount):
+    # get_chat_ids is read-only, so the benchmark doesn't like or message anyone
+    started = time.time()
+    for _ in range(amount):
+        session.get_chat_ids(new=True, messaged=False)
+    return amount / (time.time() - started) * 60
+
+
+if __name__ == "__main__":
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    session = Session(store_session=True)
+    if not session._is_logged_in():
+        print("Log in first, this benchmark needs a stored session.")
+        sys.exit(1)
+
+    session.login_state.ttl = 0
+    before = actions_per_minute(session, amount)
+    session.login_state.ttl = LoginState.TTL
+    after = actions_per_minute(session, amount)
+
+    print("before (reload per action): {:.1f} actions/min".format(before))
+    print("after (cached login state): {:.1f} actions/min".format(after))
+    print("login checks: {}".format(session.login_state.stats))
@@ -0,0 +1,6 @@
+import os
+
+from tinderbotj import SHARED_PATH
+
+# the shared helpers, see tinderbotj/__init__.py
+__path__.append(os.path.join(SHARED_PATH, 'helpers'))
@@ -3,20 +3,29 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import *
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
 import time
 import re
+from tinderbotj.helpers.backend import SeleniumBackend
+from tinderbotj.helpers.profile_extractor import read_image_urls
 from tinderbotj.helpers.xpaths import content
+from tinderbotj.helpers.waits import Waits
 from datetime import datetime
 
+# the card of the geomatch on top, and the element holding the photos of an opened profile
+CARD = f'{content}/div/div[1]/div/main/div[1]/div/div/div[1]'
+SLIDES = "(//div[@aria-label='Profile slider'])[1]/.."
+
 class GeomatchHelper:
 
     delay = 5
 
     HOME_URL = "https://www.tinder.com/app/recs"
 
-    def __init__(self, browser):
+    def __init__(self, browser, backend=None):
         self.browser = browser
+        # the session's backend, which carries its metrics, or one of our own
+        self.backend = backend or SeleniumBackend(browser)
+        self.waits = Waits(self.backend)
         if "/app/recs" not in self.browser.current_url:
             self._get_home_page()
 
@@ -46,8 +55,7 @@ class GeomatchHelper:
             #    action = ActionChains(self.browser)
            #    action.drag_and_drop_by_offset(card, 200, 0).perform()
 
-            action = ActionChains(self.browser)
-            action.send_keys(Keys.ARROW_RIGHT).perform()
+            self.backend.press('ArrowRight')
             #time.sleep(1)
             return True
 
@@ -79,8 +87,7 @@ class GeomatchHelper:
             #    action = ActionChains(self.browser)
             #    action.drag_and_drop_by_offset(card, -200, 0).perform()
             
-            action = ActionChains(self.browser)
-            action.send_keys(Keys.ARROW_LEFT).perform()
+            self.backend.press('ArrowLeft')
 
             #time.sleep(1)
         except (TimeoutException, ElementClickInterceptedException):
@@ -97,20 +104,23 @@ class GeomatchHelper:
 
                 superlike_button = self.browser.find_element(By.XPATH, xpath)
 
+                mark = self.waits.network_mark()
                 superlike_button.click()
 
             else:
-                xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div[1]'
+                xpath = CARD
 
                 WebDriverWait(self.browser, self.delay).until(EC.presence_of_element_located(
                     (By.XPATH, xpath)))
 
                 card = self.browser.find_element(By.XPATH, xpath)
 
+                mark = self.waits.network_mark()
                 action = ActionChains(self.browser)
                 action.drag_and_drop_by_offset(card, 0, -200).perform()
 
-            time.sleep(1)
+            # wait for the superlike to reach the API
+            self.waits.network_idle('geomatch.superlike', '/super', mark)
 
         except (TimeoutException, ElementClickInterceptedException):
             self._get_home_page()
@@ -134,8 +144,7 @@ class GeomatchHelper:
             #        continue
 
             # New Implementation
-            action = ActionChains(self.browser)
-            action.send_keys(Keys.ARROW_UP).perform()
+            self.backend.press('ArrowUp')
 
             #time.sleep(1)
 
@@ -319,6 +328,12 @@ class GeomatchHelper:
             self._open_profile()
 
         image_urls = []
+        if not quickload:
+            # every photo the page already holds, read in a single evaluation;
+            # the slider is only clicked through below when some of them can't be read that way
+            image_urls, complete = read_image_urls(self.backend)
+            if complete:
+                return image_urls
 
         # only get url of first few images, and not click all bullets to get all image
         elements = self.browser.find_elements(By.XPATH, "//div[@aria-label='Profile slider']")
@@ -342,8 +357,10 @@ class GeomatchHelper:
             image_btns = self.browser.find_elements_by_class_name(classname)
 
             for btn in image_btns:
+                mark = self.waits.dom_mark(SLIDES)
                 btn.click()
-                time.sleep(1)
+                # the next photo is in once the slides changed
+                self.waits.dom_changed('geomatch.next_photo', SLIDES, mark)
 
                 elements = self.browser.find_elements(By.XPATH, "//div[@aria-label='Profile slider']")
                 for element in elements:
@@ -442,7 +459,7 @@ class GeomatchHelper:
 
     def _get_home_page(self):
         self.browser.get(self.HOME_URL)
-        time.sleep(5)
+        self.waits.element('geomatch.home', CARD, profile='navigation')
 
     def _is_profile_opened(self):
         if '/profile' in self.browser.current_url:
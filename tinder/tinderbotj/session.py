@@ -2,11 +2,7 @@
 from selenium import webdriver
 import undetected_chromedriver as uc
 
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementNotVisibleException
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 
 # some other imports :-)
 import os
@@ -24,20 +20,26 @@ from tinderbotj.helpers.geomatch import Geomatch
 from tinderbotj.helpers.match import Match
 from tinderbotj.helpers.profile_helper import ProfileHelper
 from tinderbotj.helpers.preferences_helper import PreferencesHelper
+from tinderbotj.helpers.preferences import Preferences
 from tinderbotj.helpers.geomatch_helper import GeomatchHelper
 from tinderbotj.helpers.match_helper import MatchHelper
 from tinderbotj.helpers.login_helper import LoginHelper
+from tinderbotj.helpers.backend import SeleniumBackend
+from tinderbotj.helpers.waits import Waits
+from tinderbotj.helpers.login_state import LoginState
+from tinderbotj.helpers.metrics import Metrics, measured
+from tinderbotj.helpers.popup_resolver import PopupResolver
 from tinderbotj.helpers.storage_helper import StorageHelper
 from tinderbotj.helpers.email_helper import EmailHelper
 from tinderbotj.helpers.constants_helper import Printouts
-from tinderbotj.helpers.xpaths import *
 from tinderbotj.addproxy import get_proxy_extension
 
 
 class Session:
     HOME_URL = "https://www.tinder.com/app/recs"
 
-    def __init__(self, headless=False, driver_path=None, store_session=True, proxy=None, user_data=False):
+    def __init__(self, headless=False, driver_path=None, store_session=True, proxy=None, user_data=False,
+                 login_ttl=LoginState.TTL, metrics_path="data/metrics.sqlite3"):
         self.email = None
         self.may_send_email = False
         self.session_data = {
@@ -51,6 +53,12 @@ class Session:
         self.started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         self.browser = None
 
+        # MatchHelper is built on first use and then reused, so it remembers which chat is open
+        self._helpers = {}
+
+        # Latency, outcome and retries of every action and browser call, kept in metrics_path (None: not kept)
+        self.metrics = Metrics(metrics_path, session=self.started) if metrics_path else None
+
         start_session = time.time()
 
         # this function will run when the session ends
@@ -65,6 +73,16 @@ class Session:
             for key in self.session_data:
                 message = "{}: {}".format(key, self.session_data[key])
                 lines.append(message)
+            if hasattr(self, 'popup_resolver'):
+                for name, count in self.popup_resolver.counts.most_common():
+                    lines.append("popup {}: {}".format(name, count))
+            if self.metrics is not None:
+                lines.extend(self.metrics.summary())
+                try:
+                    # for node_exporter's textfile collector
+                    self.metrics.write_prometheus(os.path.splitext(self.metrics.path)[0] + ".prom")
+                finally:
+                    self.metrics.close()
 
             # print out the statistics of the session
             try:
@@ -75,13 +93,9 @@ class Session:
                     print("Started session: {}".format(self.started))
                 y = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
                 print("Ended session: {}".format(y))
-            
+
                 # Close browser properly if it exists
-                if self.browser:
-                    try:
-                        self.browser.quit()
-                    except:
-                        pass
+                self.close()
 
         # Check network connectivity before attempting to download
         if not self._check_network_connectivity():
@@ -143,12 +157,39 @@ class Session:
         
         self.browser = uc.Chrome(options=options, driver_executable_path=driver_path)
 
+        # the shared helpers run against this instead of the driver directly
+        self.backend = SeleniumBackend(self.browser, metrics=self.metrics)
+        self.waits = Waits(self.backend)
+
+        # Known popups are looked up and dismissed in a single script evaluation
+        self.popup_resolver = PopupResolver(self.backend)
+
+        # Remember the login instead of reloading Tinder before every action;
+        # changed auth cookies or a logged-out url invalidate it
+        self.login_state = LoginState(revalidate=self._revalidate_login, ttl=login_ttl)
+
         # Cool banner
         print(Printouts.BANNER.value)
         time.sleep(1)
 
         print("Started session: {}\n\n".format(self.started))
 
+    def close(self):
+        """Quit the browser now rather than when the program exits."""
+        if self.browser:
+            try:
+                self.browser.quit()
+            except:
+                pass
+        self.browser = None
+
+    def _helper(self, cls):
+        # built on first use, and again when the browser was swapped (e.g. by the harness)
+        helper = self._helpers.get(cls)
+        if helper is None or helper.browser is not self.browser:
+            helper = self._helpers[cls] = cls(browser=self.browser, backend=self.backend)
+        return helper
+
     def _check_network_connectivity(self):
         """Check if we can resolve DNS and connect to the internet"""
         try:
@@ -220,21 +261,35 @@ class Session:
         self.may_send_email = boolean
 
     # NOTE: Need to be logged in for this
+    @measured('session.set_preferences')
+    def set_preferences(self, km=None, age_range=None, sexuality=None, global_mode=None, location=None):
+        """
+        Change several settings in one visit to the settings page; what's left out or already set is skipped.
+
+        age_range is a (min, max) tuple and location a (latitude, longitude) tuple.
+        Returns the settings that were changed.
+        """
+        if location is not None:
+            self.set_custom_location(*location)
+
+        min_age, max_age = age_range if age_range is not None else (None, None)
+        wanted = Preferences(km=km, min_age=min_age, max_age=max_age, sexuality=sexuality, global_mode=global_mode)
+        if wanted == Preferences():
+            return {}
+        helper = PreferencesHelper(browser=self.browser, backend=self.backend)
+        return helper.apply(wanted)
+
     def set_distance_range(self, km):
-        helper = PreferencesHelper(browser=self.browser)
-        helper.set_distance_range(km)
+        self.set_preferences(km=km)
 
     def set_age_range(self, min, max):
-        helper = PreferencesHelper(browser=self.browser)
-        helper.set_age_range(min, max)
+        self.set_preferences(age_range=(min, max))
 
     def set_sexuality(self, type):
-        helper = PreferencesHelper(browser=self.browser)
-        helper.set_sexualitiy(type)
+        self.set_preferences(sexuality=type)
 
     def set_global(self, boolean):
-        helper = PreferencesHelper(browser=self.browser)
-        helper.set_global(boolean)
+        self.set_preferences(global_mode=boolean)
 
     def set_bio(self, bio):
         helper = ProfileHelper(browser=self.browser)
@@ -250,7 +305,8 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(browser=self.browser)
             helper.login_by_google(email, password)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
@@ -260,7 +316,8 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(browser=self.browser)
             helper.login_by_facebook(email, password)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
@@ -269,11 +326,13 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(browser=self.browser)
             helper.login_by_sms(country, phone_number)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
 
+    @measured('session.store_local')
     def store_local(self, match):
         if isinstance(match, Match):
             filename = 'matches'
@@ -284,21 +343,21 @@ class Session:
             print("Crashing in 3.2.1... :)")
             assert False
 
-        # store its images
-        for url in match.image_urls:
-            hashed_image = StorageHelper.store_image_as(url=url, directory='data/{}/images'.format(filename))
-            match.images_by_hashes.append(hashed_image)
+        # store its images, all downloads at the same time
+        hashed_images = StorageHelper.store_images_as(urls=match.image_urls or [], directory='data/{}/images'.format(filename))
+        match.images_by_hashes.extend(hashed_image for hashed_image in hashed_images if hashed_image)
 
         # store its userdata
         StorageHelper.store_match(match=match, directory='data/{}'.format(filename), filename=filename)
 
+    @measured('session.like')
     def like(self, amount=1, ratio='100%', sleep=1, randomize_sleep = True):
         
         initial_sleep = sleep
         ratio = float(ratio.split('%')[0]) / 100
 
         if self._is_logged_in():
-            helper = GeomatchHelper(browser=self.browser)
+            helper = GeomatchHelper(browser=self.browser, backend=self.backend)
             amount_liked = 0
             # handle one time up front, from then on check after every action instead of before
             self._handle_potential_popups()
@@ -323,9 +382,10 @@ class Session:
 
             self._print_liked_stats()
 
+    @measured('session.dislike')
     def dislike(self, amount=1):
         if self._is_logged_in():
-            helper = GeomatchHelper(browser=self.browser)
+            helper = GeomatchHelper(browser=self.browser, backend=self.backend)
             for _ in range(amount):
                 self._handle_potential_popups()
                 helper.dislike()
@@ -335,9 +395,10 @@ class Session:
                 #time.sleep(1)
             self._print_liked_stats()
 
+    @measured('session.superlike')
     def superlike(self, amount=1):
         if self._is_logged_in():
-            helper = GeomatchHelper(browser=self.browser)
+            helper = GeomatchHelper(browser=self.browser, backend=self.backend)
             for _ in range(amount):
                 self._handle_potential_popups()
                 helper.superlike()
@@ -346,9 +407,10 @@ class Session:
                 time.sleep(1)
             self._print_liked_stats()
 
+    @measured('session.get_geomatch')
     def get_geomatch(self, quickload=True):
         if self._is_logged_in():
-            helper = GeomatchHelper(browser=self.browser)
+            helper = GeomatchHelper(browser=self.browser, backend=self.backend)
             self._handle_potential_popups()
 
             name = None
@@ -356,6 +418,8 @@ class Session:
             max_attempts = 3
             while not name and attempts < max_attempts:
                 attempts += 1
+                if attempts > 1 and self.metrics is not None:
+                    self.metrics.retry()
                 name = helper.get_name()
                 self._handle_potential_popups() # Popup handling on first geomatch
                 time.sleep(1)
@@ -375,181 +439,109 @@ class Session:
             return Geomatch(name=name, age=age, work=work, gender=gender, study=study, home=home, distance=distance,
                             bio=bio, passions=passions, lifestyle=lifestyle, basics=basics, anthem=anthem, looking_for=looking_for, image_urls=image_urls, instagram=instagram)
 
+    @measured('session.get_chat_ids')
     def get_chat_ids(self, new=True, messaged=True):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             return helper.get_chat_ids(new, messaged)
 
-    def get_new_matches(self, amount=100000, quickload=True):
+    @measured('session.get_new_matches')
+    def get_new_matches(self, amount=100000, quickload=True, incremental=False):
+        # incremental: only the matches that showed up since the previous incremental call
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
-            return helper.get_new_matches(amount, quickload)
+            store = StorageHelper.get_store(directory='data/matches', filename='matches') if incremental else None
+            return helper.get_new_matches(amount, quickload, store=store)
 
-    def get_messaged_matches(self, amount=100000, quickload=True):
+    @measured('session.get_messaged_matches')
+    def get_messaged_matches(self, amount=100000, quickload=True, incremental=False):
+        # incremental: only the matches that showed up since the previous incremental call
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
-            return helper.get_messaged_matches(amount, quickload)
+            store = StorageHelper.get_store(directory='data/matches', filename='matches') if incremental else None
+            return helper.get_messaged_matches(amount, quickload, store=store)
 
+    @measured('session.send_message')
     def send_message(self, chatid, message):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_message(chatid, message)
 
+    @measured('session.send_gif')
     def send_gif(self, chatid, gifname):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_gif(chatid, gifname)
 
+    @measured('session.send_song')
     def send_song(self, chatid, songname):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_song(chatid, songname)
 
+    @measured('session.send_socials')
     def send_socials(self, chatid, media):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_socials(chatid, media)
 
+    @measured('session.unmatch')
     def unmatch(self, chatid):
         if self._is_logged_in():
-            helper = MatchHelper(browser=self.browser)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.unmatch(chatid)
 
+    @measured('session.run_chat_actions')
+    def run_chat_actions(self, actions):
+        """
+        Run many chat actions in one go, e.g. [("send_message", chatid, "hey"), ("get_bio", chatid)].
+        The actions are grouped per chat, so each chat is opened once however the list is ordered.
+        """
+        if self._is_logged_in():
+            helper = self._helper(MatchHelper)
+            self._handle_potential_popups()
+            return helper.run_chat_operations(actions)
+
     # Utilities
+    @measured('session.popups')
     def _handle_potential_popups(self):
-        delay = 0.25
-
-        # last possible id based div
-        base_element = self.browser.find_element(By.XPATH, modal_manager)
-
-        # try to deny see who liked you
-        try:
-            xpath = './/main/div/div/div[3]/button[2]'
-            WebDriverWait(base_element, delay).until(
-                EC.presence_of_element_located((By.XPATH, xpath)))
-
-            deny_btn = base_element.find_element(By.XPATH, xpath)
-            deny_btn.click()
-            return "POPUP: Denied see who liked you"
-
-        except NoSuchElementException:
-            pass
-        except TimeoutException:
-            pass
-
-        # Try to dismiss a potential 'upgrade like' popup
-        try:
-            # locate "no thanks"-button
-            xpath = './/main/div/button[2]'
-            base_element.find_element(By.XPATH, xpath).click()
-            return "POPUP: Denied upgrade to superlike"
-        except NoSuchElementException:
-            pass
-
-        # try to deny 'add tinder to homescreen'
-        try:
-            xpath = './/main/div/div[2]/button[2]'
+        popup = self.popup_resolver.resolve()
+        if popup is None:
+            return None
 
-            add_to_home_popup = base_element.find_element(By.XPATH, xpath)
-            add_to_home_popup.click()
-            return "POPUP: Denied Tinder to homescreen"
-
-        except NoSuchElementException:
-            pass
-
-        # deny buying more superlikes
-        try:
-            xpath = './/main/div/div[3]/button[2]'
-            deny = base_element.find_element(By.XPATH, xpath)
-            deny.click()
-            return "POPUP: Denied buying more superlikes"
-        except NoSuchElementException:
-            pass
-
-        # try to dismiss match
-        matched = False
-        try:
-            xpath = '//button[@title="Back to Tinder"]'
-
-            match_popup = base_element.find_element(By.XPATH, xpath)
-            match_popup.click()
-            matched = True
-
-        except NoSuchElementException:
-            pass
-        except:
-            matched = True
-            self.browser.refresh()
-
-        if matched and self.may_send_email:
+        if popup.name == 'new_match' and self.may_send_email:
             try:
                 EmailHelper.send_mail_match_found(self.email)
             except:
                 print("Some error occurred when trying to send mail.")
                 print("Consider opening an Issue on Github.")
                 pass
-            return "POPUP: Dismissed NEW MATCH"
 
-        # try to say 'no thanks' to buy more (super)likes
-        try:
-            xpath = './/main/div/div[3]/button[2]'
-            deny_btn = base_element.find_element(By.XPATH, xpath)
-            deny_btn.click()
-            return "POPUP: Denied buying more superlikes"
-
-        except ElementNotVisibleException:
-            # element is not clickable, probably cuz it's out of view but still there
-            self.browser.refresh()
-        except NoSuchElementException:
-            pass
-        except:
-            # TBD add stale element exception for now just refresh page
-            self.browser.refresh()
-            pass
-
-        # Deny confirmation of email
-        try:
-            xpath = './/main/div/div[1]/div[2]/button[2]'
-            remindmelater = base_element.find_element(By.XPATH, xpath)
-            remindmelater.click()
-
-            time.sleep(3)
-            # handle other potential popups
-            self._handle_potential_popups()
-            return "POPUP: Deny confirmation of email"
-        except:
-            pass
+        return popup.message
 
-        # Deny add location popup
+    @measured('session.login_check', on_false='logged_out')
+    def _is_logged_in(self):
+        # selenium has no navigation or network events, so poll the url as well
         try:
-            xpath = ".//*[contains(text(), 'No Thanks')]"
-            nothanks = base_element.find_element(By.XPATH, xpath)
-            nothanks.click()
-            time.sleep(3)
-            # handle other potential popups
-            self._handle_potential_popups()
-            return "POPUP: Deny confirmation of email"
+            url = self.backend.url
         except:
-            pass
+            url = None
+        return self.login_state.is_logged_in(probe=lambda: LoginState.probe(self.backend), url=url)
 
-        return None
-
-    def _is_logged_in(self):
+    def _revalidate_login(self):
         try:
-            self.browser.get("https://tinder.com/app/recs")
-            WebDriverWait(self.browser, 5).until(
-                EC.presence_of_element_located((By.XPATH, '//div[@id="content"]'))
-            )
-            return True
-        except TimeoutException:
+            self.backend.navigate("https://tinder.com/app/recs")
+            return self.backend.wait('//div[@id="content"]', timeout=5, visible=False)
+        except WebDriverException:
+            # a timeout, a stale or missing element, a crashed page: like Playwright, not known to be logged in
             return False
 
     def _get_msg_box(self, lines, indent=1, width=None, title=None):
@@ -49,11 +49,8 @@ if __name__ == "__main__":
             session.dislike(amount=1)
             session.superlike(amount=1)
 
-            # Adjust preferences
-            session.set_distance_range(km=150)
-            session.set_age_range(18, 55)
-            session.set_sexuality(Sexuality.WOMEN)
-            session.set_global(True)
+            # Adjust preferences, all in one visit to the settings
+            session.set_preferences(km=150, age_range=(18, 55), sexuality=Sexuality.WOMEN, global_mode=True)
 
             # Save old matches
             for match in session.get_messaged_matches():
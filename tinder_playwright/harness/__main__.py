@@ -0,0 +1,83 @@
+'''
+Runs the tinderbotj helpers against the recorded fixtures and reports, per operation,
+latency, browser round trips and page requests. Nothing goes over the network.
+
+    python -m harness                                  # every operation, 3 runs each
+    python -m harness --only geomatch match.get_match  # operations whose name contains one of these
+    python -m harness --save baseline.json             # keep the numbers ...
+    python -m harness --baseline baseline.json         # ... and fail when a change makes them worse
+
+Exits with 1 when a result doesn't match the fixtures or, with --baseline, on a regression.
+'''
+import argparse
+import json
+import sys
+
+from harness.fixture_server import FixtureServer
+from harness.runner import OPERATIONS, Harness, compare, summarize
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness", description="Offline benchmark of the tinderbotj helpers.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation")
+    parser.add_argument("--only", nargs="+", help="only run operations whose name contains one of these")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds before every response")
+    parser.add_argument("--render-delay", type=float, default=0.25, help="seconds before a loaded page shows its content")
+    parser.add_argument("--transition-delay", type=float, default=0.15, help="seconds an in-page transition takes")
+    parser.add_argument("--no-delays", action="store_true", help="serve and render everything immediately")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with results saved earlier with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    operations = [operation for operation in OPERATIONS
+                  if not args.only or any(part in operation.name for part in args.only)]
+    if not operations:
+        parser.error("no operation matches {}".format(args.only))
+
+    if args.no_delays:
+        args.latency = args.render_delay = args.transition_delay = 0
+
+    summary = {}
+    with FixtureServer(latency=args.latency, render_delay=args.render_delay,
+                       transition_delay=args.transition_delay) as server:
+        harness = Harness(server, headless=not args.headed)
+        for operation in operations:
+            print("Running {} ...".format(operation.name))
+            summary[operation.name] = summarize(harness.measure(operation, repeat=args.repeat))
+
+    width = max(len(name) for name in summary)
+    print("\n{:<{}}  {:>10}  {:>10}  {:>11}  {:>8}  {}".format(
+        "operation", width, "p50 ms", "p95 ms", "round trips", "requests", "errors"))
+    for name, result in summary.items():
+        print("{:<{}}  {:>10}  {:>10}  {:>11}  {:>8}  {}".format(
+            name, width, result["p50_ms"], result["p95_ms"], result["round_trips"], result["requests"],
+            len(result["errors"])))
+
+    failed = False
+    for name, result in summary.items():
+        for error in sorted(set(result["errors"])):
+            print("FAIL {}: {}".format(name, error))
+            failed = True
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump({"settings": {"latency": args.latency, "render_delay": args.render_delay,
+                                    "transition_delay": args.transition_delay, "repeat": args.repeat},
+                       "operations": summary}, fp, indent=2)
+        print("\nSaved results to {}".format(args.save))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fp:
+            baseline = json.load(fp)["operations"]
+        regressions = compare(summary, baseline, tolerance=args.tolerance)
+        for regression in regressions:
+            print("REGRESSION {}".format(regression))
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+'''
+Runs the same helper workloads on the Playwright and the Selenium backend against the
+recorded fixtures, and reports latency per workload, startup time and memory, so a
+deployment can pick its backend on numbers.
+
+    python -m harness.backends                          # both backends, 20 runs per workload
+    python -m harness.backends --backends playwright    # just one of them
+    python -m harness.backends --save backends.json
+
+Needs both drivers: pip install playwright selenium && playwright install chromium
+(Selenium finds or downloads a matching chromedriver itself).
+'''
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+from tinderbotj.helpers.backend import PlaywrightBackend, SeleniumBackend
+from tinderbotj.helpers.popup_resolver import PopupResolver
+from tinderbotj.helpers.profile_extractor import read_profile
+
+from harness.fixture_server import FixtureServer
+from harness.runner import percentile
+
+CONTENT_READY = '//div[@id="content"]/div'
+CARD_NAME = '//div[@class="Card"]//h1'
+
+# path: page opened (untimed) before every run, or a function of the FixtureServer returning it
+Workload = namedtuple('Workload', ['name', 'path', 'run'])
+
+
+def _wait(backend, xpath):
+    if not backend.wait(xpath, timeout=5):
+        raise RuntimeError("timed out waiting for {}".format(xpath))
+
+
+WORKLOADS = [
+    Workload('open recs', None,
+             lambda backend, server: (backend.navigate(server.url + '/app/recs'), _wait(backend, CONTENT_READY))),
+    Workload('popup check (none)', '/app/recs',
+             lambda backend, server: PopupResolver(backend).resolve()),
+    Workload('popup dismiss', '/app/recs?popup=new_match',
+             lambda backend, server: PopupResolver(backend).resolve()),
+    Workload('list chat ids', '/app/recs',
+             lambda backend, server: backend.query('//div[@role="tabpanel"]//a | //div[@class="messageList"]//a',
+                                                   attribute='href')),
+    Workload('read match profile', lambda server: '/app/messages/{}'.format(server.data['matches'][0]['chatid']),
+             lambda backend, server: read_profile(backend)),
+    Workload('open geomatch profile', '/app/recs',
+             lambda backend, server: (backend.press('ArrowUp'), _wait(backend, '//div[@class="Row"]'))),
+    Workload('swipe to next card', '/app/recs',
+             lambda backend, server: (backend.press('ArrowRight'), _wait(backend, CARD_NAME))),
+]
+
+
+def launch_playwright(headless):
+    from playwright.sync_api import sync_playwright
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch(headless=headless)
+    page = browser.new_page(viewport={"width": 1920, "height": 1080})
+
+    def close():
+        browser.close()
+        playwright.stop()
+    return PlaywrightBackend(page), close
+
+
+def launch_selenium(headless):
+    from selenium import webdriver
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=options)
+    return SeleniumBackend(driver), driver.quit
+
+
+LAUNCHERS = {'playwright': launch_playwright, 'selenium': launch_selenium}
+
+
+def _rss_mb(pid):
+    try:
+        with open("/proc/{}/status".format(pid), "r") as fp:
+            for line in fp:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def memory_mb():
+    """RSS of this process and of everything it started (driver and browser), in MB; (None, None) off Linux."""
+    if not os.path.isdir("/proc"):
+        return None, None
+
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open("/proc/{}/stat".format(entry), "r") as fp:
+                # the command name may contain spaces, the fields after it don't
+                parent = int(fp.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    descendants, todo = [], [os.getpid()]
+    while todo:
+        for child in children.get(todo.pop(), []):
+            descendants.append(child)
+            todo.append(child)
+    return _rss_mb(os.getpid()), sum(_rss_mb(pid) for pid in descendants)
+
+
+def bench(name, server, repeat=20, headless=True):
+    started = time.perf_counter()
+    backend, close = LAUNCHERS[name](headless)
+    result = {"startup_ms": round((time.perf_counter() - started) * 1000, 1),
+              "python_mb": None, "browser_mb": None, "workloads": {}}
+
+    try:
+        for workload in WORKLOADS:
+            print("{}: {} ...".format(name, workload.name))
+            latencies, errors = [], []
+            for _ in range(repeat):
+                path = workload.path(server) if callable(workload.path) else workload.path
+                if path is not None:
+                    backend.navigate(server.url + path)
+                    _wait(backend, CONTENT_READY)
+
+                started = time.perf_counter()
+                try:
+                    workload.run(backend, server)
+                except Exception as e:
+                    errors.append("{}: {}".format(type(e).__name__, e))
+                latencies.append((time.perf_counter() - started) * 1000)
+
+            result["workloads"][workload.name] = {
+                "p50_ms": round(percentile(latencies, 0.5), 1),
+                "p95_ms": round(percentile(latencies, 0.95), 1),
+                "errors": errors,
+            }
+
+            # keep the peak, the browser grows while it works
+            python_mb, browser_mb = memory_mb()
+            if python_mb is not None:
+                result["python_mb"] = round(max(result["python_mb"] or 0, python_mb), 1)
+                result["browser_mb"] = round(max(result["browser_mb"] or 0, browser_mb), 1)
+    finally:
+        close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.backends",
+                                     description="Compare the Playwright and Selenium backends on the fixtures.")
+    parser.add_argument("--backends", nargs="+", choices=sorted(LAUNCHERS), default=sorted(LAUNCHERS))
+    parser.add_argument("--repeat", type=int, default=20, help="runs per workload")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every response")
+    parser.add_argument("--render-delay", type=float, default=0.0, help="seconds before a loaded page shows its content")
+    parser.add_argument("--headed", action="store_true", help="show the browsers")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    # no synthetic delays by default: they'd be the same for both and only hide the difference
+    with FixtureServer(latency=args.latency, render_delay=args.render_delay, transition_delay=0) as server:
+        for name in args.backends:
+            results[name] = bench(name, server, repeat=args.repeat, headless=not args.headed)
+
+    width = max(len(workload.name) for workload in WORKLOADS)
+    print("\n{:<{}}".format("p50 / p95 ms", width) + "".join("  {:>20}".format(name) for name in results))
+    for workload in WORKLOADS:
+        cells = ["{} / {}".format(result["workloads"][workload.name]["p50_ms"],
+                                  result["workloads"][workload.name]["p95_ms"]) for result in results.values()]
+        print("{:<{}}".format(workload.name, width) + "".join("  {:>20}".format(cell) for cell in cells))
+    for key, label in (("startup_ms", "startup ms"), ("python_mb", "python MB"), ("browser_mb", "driver + browser MB")):
+        print("{:<{}}".format(label, width) + "".join("  {:>20}".format(str(result[key])) for result in results.values()))
+
+    failed = False
+    for name, result in results.items():
+        for workload, numbers in result["workloads"].items():
+            for error in sorted(set(numbers["errors"])):
+                print("FAIL {} {}: {}".format(name, workload, error))
+                failed = True
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+        print("\nSaved results to {}".format(args.save))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from tinderbotj.helpers.profile_extractor import SVG_FIELDS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# field -> icon of its row on a profile, in the order the web app shows them
+ROW_ICONS = {field: path for path, field in SVG_FIELDS.items()}
+ROW_FIELDS = ('work', 'study', 'home', 'gender', 'distance')
+
+# Markup of the popups that can be requested with ?popup=<name>, as the modal manager shows them
+POPUPS = {
+    'add_to_homescreen': (
+        '<main><div><div><h3>Add Tinder to your home screen</h3></div>'
+        '<div><button type="button">Add</button>'
+        '<button type="button" data-action="dismiss-popup" data-popup="add_to_homescreen">Not interested</button>'
+        '</div></div></main>'),
+    'new_match': (
+        '<main><div><h3>It&#x27;s a Match!</h3>'
+        '<button type="button" title="Back to Tinder" data-action="dismiss-popup" data-popup="new_match">'
+        'Back to Tinder</button></div></main>'),
+}
+
+
+def load_data(path=os.path.join(FIXTURES_DIR, "people.json")):
+    with open(path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _fill(template, **values):
+    return re.sub(r"{{(\w+)}}", lambda match: str(values[match.group(1)]), template)
+
+
+def _photos(images):
+    if not images:
+        return ''
+    photos = ('<div class="Slide" aria-label="Profile slider" data-image="{0}" '
+              'style="background-image: url(&quot;{0}&quot;);"></div>').format(html.escape(images[0]))
+    # like the web app, the other photos are only loaded by clicking their bullet
+    if len(images) > 1:
+        photos += ''.join('<button type="button" class="bullet" data-image="{}" aria-label="Photo {}"></button>'
+                          .format(html.escape(url), index + 1) for index, url in enumerate(images))
+    return photos
+
+
+def _rows(person):
+    return ''.join(
+        '<div class="Row"><div><svg viewBox="0 0 24 24" width="16" height="16"><path d="{}"></path></svg></div>'
+        '<div class="Row__value">{}</div></div>'.format(ROW_ICONS[field], html.escape(person[field]))
+        for field in ROW_FIELDS if person.get(field))
+
+
+def _section(headline, items):
+    return ('<div class="Px(16px) Py(12px)"><h2>{}</h2><div>{}</div></div>'
+            .format(headline, ''.join('<div class="Bdrs(100px) Bd D(ib)">{}</div>'.format(html.escape(item))
+                                      for item in items)))
+
+
+def _details(person):
+    details = ''
+    if person.get('looking_for'):
+        details += ('<div class="Px(16px) My(12px)"><div class="D(b)"><div class="Typs(subheading-1) CenterAlign">'
+                    '{}</div></div></div>').format(html.escape(person['looking_for']))
+    if person.get('bio'):
+        details += '<div class="Px(16px) Py(12px) Us(t)">{}</div>'.format(html.escape(person['bio']))
+    details += _rows(person)
+    for headline, key in (('Passions', 'passions'), ('Lifestyle', 'lifestyle'), ('Basics', 'basics')):
+        if person.get(key):
+            details += _section(headline, person[key])
+    if person.get('anthem'):
+        details += ('<div class="Px(16px) Py(12px)"><h2>My anthem</h2><div>'
+                    '<div class="Fz($s) C($c-ds-text-primary)">{}</div>'
+                    '<div class="Fz($xs) C($c-ds-text-secondary)">{}</div></div></div>').format(
+            html.escape(person['anthem']['song']), html.escape(person['anthem']['artist']))
+    return details
+
+
+class FixtureServer:
+    """
+    Serves the recorded, anonymized pages of the web app under the paths it uses.
+
+    Pages are filled in from people.json: /app/recs (and /app/recs/profile) shows the
+    card stack, /app/messages/<chatid> a conversation with the match's profile and
+    /app/profile the preferences. ``?popup=<name>`` adds one of POPUPS to a page.
+
+    Synthetic delays, in seconds: ``latency`` before every response, ``render_delay``
+    between loading a page and its content showing up, and ``transition_delay`` for
+    in-page changes (opening a profile, the next card, a modal).
+    """
+
+    def __init__(self, data=None, latency=0.1, render_delay=0.25, transition_delay=0.15, host="127.0.0.1", port=0):
+        self.data = data or load_data()
+        self.latency = latency
+        self.render_delay = render_delay
+        self.transition_delay = transition_delay
+
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._templates = {}
+        self._images = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._serve(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+        # don't follow redirects, the browser has to see them
+        self._opener = urllib.request.build_opener(type("NoRedirect", (urllib.request.HTTPRedirectHandler,), {
+            "redirect_request": lambda *args: None}))
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def fetch(self, path):
+        """GET ``path`` over HTTP, as the browser would; returns status, headers and body."""
+        try:
+            with self._opener.open(self.url + path) as response:
+                status, headers, body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, headers, body = e.code, e.headers, e.read()
+        headers = {key: value for key, value in headers.items() if key in ("Content-Type", "Location", "Cache-Control")}
+        return status, headers, body
+
+    # rendering
+
+    def _template(self, name):
+        if name not in self._templates:
+            with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as fp:
+                self._templates[name] = fp.read()
+        return self._templates[name]
+
+    def _page(self, template_name, popup=None, **values):
+        return _fill(self._template(template_name), render_delay=int(self.render_delay * 1000),
+                     transition_delay=int(self.transition_delay * 1000), popup=POPUPS.get(popup, ''), **values)
+
+    def _sidebar(self):
+        new_matches = ''.join('<div><a href="/app/messages/{}"><span>{}</span></a></div>'.format(
+            match['chatid'], html.escape(match['name'])) for match in self.data['matches'] if not match['messages'])
+        messaged_matches = ''.join('<a href="/app/messages/{}"><div>{}</div><div>{}</div></a>'.format(
+            match['chatid'], html.escape(match['name']), html.escape(match['messages'][-1]))
+            for match in self.data['matches'] if match['messages'])
+        return _fill(self._template("sidebar.html"), new_matches=new_matches, messaged_matches=messaged_matches)
+
+    def _card(self, person):
+        badge = '<div class="Badge" title="Verified!"></div>' if person.get('verified') else ''
+        return _fill(self._template("card.html"), name=html.escape(person['name']), age=person['age'], badge=badge,
+                     slides=_photos(person['images']), details=_details(person))
+
+    def render_recs(self, popup=None):
+        recs = self.data['recs']
+        card = self._card(recs[0]) if recs else ''
+        next_cards = ''.join('<template>{}</template>'.format(self._card(person)) for person in recs[1:])
+        return self._page("recs.html", popup=popup, sidebar=self._sidebar(), card=card, next_cards=next_cards)
+
+    def render_chat(self, match, popup=None):
+        messages = ''.join('<div class="Message">{}</div>'.format(html.escape(message))
+                           for message in match['messages'])
+        passions = ''.join('<div class="Passion">{}</div>'.format(html.escape(passion))
+                           for passion in match['passions'])
+        return self._page("chat.html", popup=popup, sidebar=self._sidebar(), chatid=match['chatid'],
+                          name=html.escape(match['name']), age=match['age'], bio=html.escape(match['bio'] or ''),
+                          slides=_photos(match['images']), passions=passions, rows=_rows(match), messages=messages)
+
+    def render_profile(self):
+        preferences = self.data['preferences']
+        return self._page("profile.html", sidebar=self._sidebar(), distance_percentage=preferences['distance_percentage'],
+                          min_age_percentage=preferences['min_age_percentage'],
+                          max_age_percentage=preferences['max_age_percentage'],
+                          min_age=preferences['min_age'], max_age=preferences['max_age'],
+                          global_checked=' checked' if preferences['global'] else '',
+                          languages_hidden='' if preferences['global'] else ' hidden')
+
+    def image(self, name):
+        # a small solid jpeg per name, so every photo is distinct but costs nothing to make
+        if name not in self._images:
+            color = tuple(hashlib.sha1(name.encode()).digest()[:3])
+            buffer = io.BytesIO()
+            Image.new("RGB", (64, 64), color).save(buffer, "jpeg")
+            self._images[name] = buffer.getvalue()
+        return self._images[name]
+
+    def respond(self, path, query):
+        """Status, content type and body for a request."""
+        popup = query.get('popup', [None])[0]
+        chats = {match['chatid']: match for match in self.data['matches']}
+
+        if path in ("/", "/app"):
+            return 302, None, b""
+        if path in ("/app/recs", "/app/recs/profile", "/app/matches"):
+            return 200, "text/html; charset=utf-8", self.render_recs(popup).encode()
+        if path == "/app/profile":
+            return 200, "text/html; charset=utf-8", self.render_profile().encode()
+        if path.startswith("/app/messages/") and path.split("/")[-1] in chats:
+            return 200, "text/html; charset=utf-8", self.render_chat(chats[path.split("/")[-1]], popup).encode()
+        if path in ("/fixtures/fixture.js", "/fixtures/fixture.css"):
+            with open(os.path.join(FIXTURES_DIR, os.path.basename(path)), "rb") as fp:
+                content_type = "text/javascript" if path.endswith(".js") else "text/css"
+                return 200, content_type, fp.read()
+        if path.startswith("/images/") and path.endswith(".jpg"):
+            return 200, "image/jpeg", self.image(os.path.basename(path))
+        return 404, "text/plain", b"not found"
+
+    def _serve(self, handler):
+        parts = urlsplit(handler.path)
+        with self._lock:
+            self.requests[parts.path] += 1
+
+        time.sleep(self.latency)
+        status, content_type, body = self.respond(parts.path, parse_qs(parts.query))
+
+        handler.send_response(status)
+        if status == 302:
+            handler.send_header("Location", "/app/recs")
+        else:
+            handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.send_header("Cache-Control", "no-store")
+        handler.end_headers()
+        handler.wfile.write(body)
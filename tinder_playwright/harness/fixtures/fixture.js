@@ -0,0 +1,157 @@
+// Client side of the harness fixtures: mounts the recorded markup after a render delay,
+// like the web app does after loading, and answers the interactions the helpers use.
+// Every interaction is appended to window.fixtureLog so the harness can check what happened.
+(() => {
+    const body = document.body;
+    const renderDelay = Number(body.dataset.renderDelay || 0);
+    const transitionDelay = Number(body.dataset.transitionDelay || 0);
+
+    window.fixtureLog = [];
+    const log = (type, detail) => window.fixtureLog.push(Object.assign({type: type, path: location.pathname}, detail));
+    const later = (fn) => setTimeout(fn, transitionDelay);
+
+    const mount = (templateId, target) => {
+        const template = document.getElementById(templateId);
+        if (template) target.appendChild(template.content.cloneNode(true));
+    };
+
+    setTimeout(() => {
+        mount('app', document.getElementById('content'));
+        mount('modal', document.getElementById('modal-manager'));
+    }, renderDelay);
+
+    // recs: the top card of the stack, its profile and swipes
+    const topCard = () => document.querySelector('.CardStack > .Card');
+
+    const setProfileOpen = (open) => {
+        const card = topCard();
+        if (!card) return;
+        history.pushState({}, '', open ? '/app/recs/profile' : '/app/recs');
+        later(() => { card.querySelector('.Card__details').hidden = !open; });
+    };
+
+    const swipe = (action) => {
+        const card = topCard();
+        if (!card) return;
+        log(action, {name: card.dataset.name});
+        history.pushState({}, '', '/app/recs');
+        card.remove();
+        later(() => {
+            const next = document.querySelector('.CardStack > template');
+            if (next) next.replaceWith(next.content.cloneNode(true));
+        });
+    };
+
+    // photos: bullets load the other slides
+    const showSlide = (bullet) => {
+        const photos = bullet.closest('.Photos');
+        const url = bullet.dataset.image;
+        later(() => {
+            const slides = Array.from(photos.querySelectorAll('[aria-label="Profile slider"]'));
+            if (slides.some((slide) => slide.dataset.image === url)) return;
+            const slide = document.createElement('div');
+            slide.className = 'Slide';
+            slide.setAttribute('aria-label', 'Profile slider');
+            slide.dataset.image = url;
+            slide.style.backgroundImage = 'url("' + url + '")';
+            photos.insertBefore(slide, photos.querySelector('.bullet'));
+        });
+    };
+
+    const modal = (html) => { document.getElementById('modal-manager').innerHTML = html; };
+
+    const actions = {
+        like: () => swipe('like'),
+        dislike: () => swipe('dislike'),
+        superlike: () => swipe('superlike'),
+        rewind: () => log('rewind', {}),
+        report: () => log('report', {}),
+        unmatch: () => later(() => modal(
+            '<div class="Modal"><div><div><h3>Unmatch?</h3></div>' +
+            '<div><button type="button" data-action="confirm-unmatch">Unmatch</button>' +
+            '<button type="button" data-action="close-modal">Cancel</button></div></div></div>')),
+        'confirm-unmatch': () => { log('unmatch', {}); modal(''); },
+        'close-modal': () => modal(''),
+        'dismiss-popup': (button) => { log('popup', {name: button.dataset.popup}); modal(''); },
+    };
+
+    document.addEventListener('click', (e) => {
+        const tab = e.target.closest('[role="tab"]');
+        if (tab) {
+            document.querySelectorAll('[role="tab"]').forEach((t) => t.setAttribute('aria-selected', String(t === tab)));
+            document.querySelectorAll('[data-panel]').forEach((panel) => { panel.hidden = panel.dataset.panel !== tab.dataset.tab; });
+            return;
+        }
+
+        const bullet = e.target.closest('.bullet');
+        if (bullet) return showSlide(bullet);
+
+        const option = e.target.closest('[aria-pressed]');
+        if (option) {
+            option.setAttribute('aria-pressed', 'true');
+            return log('sexuality', {value: option.textContent.trim()});
+        }
+
+        const link = e.target.closest('a[href="/app/settings/gender"]');
+        if (link) {
+            e.preventDefault();
+            return later(() => { document.querySelector('.GenderOptions').hidden = false; });
+        }
+
+        const action = e.target.closest('[data-action]');
+        if (action && actions[action.dataset.action]) actions[action.dataset.action](action);
+    });
+
+    document.addEventListener('change', (e) => {
+        if (e.target.name !== 'global') return;
+        log('global', {value: e.target.checked});
+        later(() => { document.querySelector('a[href="/app/settings/global/languages"]').hidden = !e.target.checked; });
+    });
+
+    document.addEventListener('keydown', (e) => {
+        if (e.target.tagName === 'TEXTAREA') {
+            if (e.key !== 'Enter' || e.shiftKey) return;
+            e.preventDefault();
+            const text = e.target.value.trim();
+            if (!text) return;
+            const message = document.createElement('div');
+            message.className = 'Message Message--own';
+            message.textContent = text;
+            document.querySelector('.Chat__messages').appendChild(message);
+            e.target.value = '';
+            return log('message', {chatid: e.target.dataset.chatid, text: text});
+        }
+
+        if (body.dataset.page !== 'recs') return;
+        if (e.key === 'ArrowUp') setProfileOpen(true);
+        else if (e.key === 'ArrowDown') setProfileOpen(false);
+        else if (e.key === 'ArrowRight') swipe('like');
+        else if (e.key === 'ArrowLeft') swipe('dislike');
+    });
+
+    // dragging: slider handles follow the mouse, a card dragged upwards is superliked
+    let drag = null;
+
+    document.addEventListener('mousedown', (e) => {
+        const handle = e.target.closest('[role="slider"]');
+        if (handle) {
+            e.preventDefault();
+            drag = {handle: handle, x: e.clientX, start: parseFloat(handle.style.left),
+                    width: handle.parentElement.getBoundingClientRect().width};
+            return;
+        }
+        if (e.target.closest('.Card')) drag = {y: e.clientY};
+    });
+
+    document.addEventListener('mousemove', (e) => {
+        if (!drag || !drag.handle) return;
+        const percentage = Math.min(100, Math.max(0, drag.start + (e.clientX - drag.x) / drag.width * 100));
+        drag.handle.setAttribute('style', 'left: ' + Math.round(percentage * 100) / 100 + '%;');
+    });
+
+    document.addEventListener('mouseup', (e) => {
+        if (drag && drag.handle) log('slider', {label: drag.handle.getAttribute('aria-label'), value: parseFloat(drag.handle.style.left)});
+        else if (drag && drag.y - e.clientY > 100) swipe('superlike');
+        drag = null;
+    });
+})();
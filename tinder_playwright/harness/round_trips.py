@@ -0,0 +1,73 @@
+from collections import Counter
+
+
+class RoundTripCounter:
+    """
+    Counts the calls that go from Python to the browser and back.
+
+    ``wrap(page)`` returns a stand-in that forwards everything to the page. Every
+    method call on it counts as a round trip, except the ones Playwright answers
+    on the Python side: building locators (``page.locator(...)``, ``.first``, ...)
+    and registering listeners. Locators, element handles, the keyboard and the
+    mouse handed out by the page are wrapped as well, so their calls count too.
+    """
+
+    WRAPPED_TYPES = ('Locator', 'FrameLocator', 'ElementHandle', 'JSHandle', 'Keyboard', 'Mouse')
+    LOCAL_TYPES = ('Locator', 'FrameLocator')
+    LOCAL_METHODS = ('on', 'once', 'remove_listener', 'is_closed', 'set_default_timeout',
+                     'set_default_navigation_timeout')
+
+    def __init__(self):
+        self.total = 0
+        self.calls = Counter()
+
+    def wrap(self, target):
+        return _Counted(target, self)
+
+    def _wrap_result(self, value):
+        if isinstance(value, list):
+            return [self._wrap_result(item) for item in value]
+        if type(value).__name__ in self.WRAPPED_TYPES:
+            return _Counted(value, self)
+        return value
+
+    def _count(self, target, method, result):
+        if method in self.LOCAL_METHODS or type(result).__name__ in self.LOCAL_TYPES:
+            return
+        self.total += 1
+        self.calls["{}.{}".format(type(target).__name__, method)] += 1
+
+
+def _unwrap(value):
+    if isinstance(value, _Counted):
+        return object.__getattribute__(value, '_target')
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+class _Counted:
+    def __init__(self, target, counter):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_counter', counter)
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, '_target')
+        counter = object.__getattribute__(self, '_counter')
+        value = getattr(target, name)
+        if not callable(value):
+            return counter._wrap_result(value)
+
+        def call(*args, **kwargs):
+            result = value(*_unwrap(args), **_unwrap(kwargs))
+            counter._count(target, name, result)
+            return counter._wrap_result(result)
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, '_target'), name, value)
+
+    def __repr__(self):
+        return "<counted {!r}>".format(object.__getattribute__(self, '_target'))
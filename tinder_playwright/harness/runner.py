@@ -0,0 +1,253 @@
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from tinderbotj.session import Session
+from tinderbotj.helpers.geomatch_helper import GeomatchHelper
+from tinderbotj.helpers.match_helper import MatchHelper
+from tinderbotj.helpers.preferences_helper import PreferencesHelper
+
+from harness.round_trips import RoundTripCounter
+
+# path: page opened (uncounted, untimed) before every run, or a function of the Harness returning it;
+#       None to stay where the previous run ended
+# run: the measured call, gets the Harness; check: returns an error message when the result is wrong
+Operation = namedtuple('Operation', ['name', 'path', 'run', 'check'])
+Sample = namedtuple('Sample', ['latency_ms', 'round_trips', 'requests', 'error'])
+
+
+class FixtureSession(Session):
+    # the fixtures are served locally, there is no network to check (or to repair)
+    def _check_network_connectivity(self):
+        return True
+
+
+class Harness:
+    """
+    A Session whose browser only ever talks to a FixtureServer.
+
+    Requests for tinder.com are answered by the fixture server, everything else is
+    aborted, so nothing leaves the machine. The session's page is wrapped in a
+    RoundTripCounter; ``raw_page`` is the unwrapped page, for setup and checks
+    that shouldn't be counted.
+    """
+
+    HOSTS = ("tinder.com", "www.tinder.com")
+    ORIGIN = "https://tinder.com"
+
+    def __init__(self, server, headless=True, **session_options):
+        self.server = server
+        self.data = server.data
+        self.counter = RoundTripCounter()
+
+        # the harness has its own numbers, don't mix fixture runs into the session metrics
+        session_options.setdefault("metrics_path", None)
+        self.session = FixtureSession(headless=headless, store_session=False, **session_options)
+        self.raw_page = self.session.page
+        self.session.context.route("**/*", self._route)
+        self.page = self.session.page = self.session.backend.page = self.counter.wrap(self.raw_page)
+
+    def _route(self, route):
+        parts = urlsplit(route.request.url)
+        if parts.hostname not in self.HOSTS:
+            route.abort()
+            return
+        path = parts.path + ("?" + parts.query if parts.query else "")
+        status, headers, body = self.server.fetch(path)
+        route.fulfill(status=status, headers=headers, body=body)
+
+    def close(self):
+        self.session.close()
+
+    def open(self, path):
+        self.raw_page.goto(self.ORIGIN + path)
+        self.raw_page.wait_for_selector('#content > .App', state='attached')
+
+    def fixture_log(self, entry_type=None):
+        log = self.raw_page.evaluate("() => window.fixtureLog || []")
+        return [entry for entry in log if entry_type is None or entry['type'] == entry_type]
+
+    def measure(self, operation, repeat=3):
+        samples = []
+        for _ in range(repeat):
+            path = operation.path(self) if callable(operation.path) else operation.path
+            if path is not None:
+                self.open(path)
+
+            round_trips, requests = self.counter.total, self.server.total_requests()
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                result = operation.run(self)
+            except Exception as e:
+                error = "{}: {}".format(type(e).__name__, e)
+            latency_ms = (time.perf_counter() - started) * 1000
+            round_trips, requests = self.counter.total - round_trips, self.server.total_requests() - requests
+
+            if error is None:
+                try:
+                    error = operation.check(self, result)
+                except Exception as e:
+                    error = "check failed with {}: {}".format(type(e).__name__, e)
+            samples.append(Sample(latency_ms, round_trips, requests, error))
+        return samples
+
+
+# Expected values, derived from the fixture data the same way the helpers parse the page
+
+def _rec(h):
+    return h.data['recs'][0]
+
+
+def _messaged(h):
+    return [match for match in h.data['matches'] if match['messages']]
+
+
+def _new(h):
+    return [match for match in h.data['matches'] if not match['messages']]
+
+
+def _distance(text):
+    try:
+        return int(text.split(' ')[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+def _row_data(person):
+    rows = {'work': person.get('work'), 'study': person.get('study'), 'gender': person.get('gender')}
+    if person.get('home'):
+        rows['home'] = person['home'].split(' ')[-1]
+    if person.get('distance'):
+        rows['distance'] = _distance(person['distance'])
+    return {field: value for field, value in rows.items() if value is not None}
+
+
+def _expect(actual, expected, what):
+    if actual != expected:
+        return "{}: expected {!r}, got {!r}".format(what, expected, actual)
+    return None
+
+
+def _expect_match(match, person):
+    for field, expected in (('name', person['name']), ('age', person['age']), ('bio', person['bio']),
+                            ('distance', _distance(person['distance'])), ('passions', person['passions'])):
+        error = _expect(getattr(match, field), expected, field)
+        if error:
+            return error
+    return None
+
+
+def _slider(h, label):
+    style = h.raw_page.get_attribute('[aria-label="{}"]'.format(label), 'style')
+    return float(style.split(' ')[1].split('%')[0])
+
+
+def _expect_slider(h, label, expected):
+    actual = _slider(h, label)
+    if abs(actual - expected) > 1:
+        return "{}: expected {}% (+-1), got {}%".format(label, round(expected, 2), actual)
+    return None
+
+
+OPERATIONS = [
+    Operation('session.login_check (revalidate)', None,
+              lambda h: (h.session.login_state.invalidate(), h.session._is_logged_in())[1],
+              lambda h, result: _expect(result, True, 'logged in')),
+    Operation('session.login_check (cached)', '/app/recs',
+              lambda h: h.session._is_logged_in(),
+              lambda h, result: _expect(result, True, 'logged in')),
+    Operation('session.popups (none)', '/app/recs',
+              lambda h: h.session._handle_potential_popups(),
+              lambda h, result: _expect(result, None, 'popup')),
+    Operation('session.popups (add to homescreen)', '/app/recs?popup=add_to_homescreen',
+              lambda h: h.session._handle_potential_popups(),
+              lambda h, result: _expect(result, "POPUP: Denied Tinder to homescreen", 'popup')),
+    Operation('session.popups (new match)', '/app/recs?popup=new_match',
+              lambda h: h.session._handle_potential_popups(),
+              lambda h, result: _expect(result, "POPUP: Dismissed NEW MATCH", 'popup')),
+    Operation('session.like', '/app/recs',
+              lambda h: h.session.like(amount=2, sleep=0, randomize_sleep=False),
+              lambda h, result: _expect(len(h.fixture_log('like')), 2, 'likes')),
+    Operation('session.get_geomatch', '/app/recs',
+              lambda h: h.session.get_geomatch(quickload=True),
+              lambda h, result: _expect((result.name, result.age), (_rec(h)['name'], _rec(h)['age']), 'geomatch')),
+    Operation('geomatch.get_name', '/app/recs',
+              lambda h: GeomatchHelper(page=h.page).get_name(),
+              lambda h, result: _expect(result, _rec(h)['name'], 'name')),
+    Operation('geomatch.get_row_data', '/app/recs',
+              lambda h: GeomatchHelper(page=h.page).get_row_data(),
+              lambda h, result: _expect(result, _row_data(_rec(h)), 'rows')),
+    Operation('geomatch.get_bio_and_passions', '/app/recs',
+              lambda h: GeomatchHelper(page=h.page).get_bio_and_passions(),
+              lambda h, result: _expect(result[:2], (_rec(h)['bio'], _rec(h)['passions']), 'bio and passions')),
+    Operation('geomatch.get_image_urls (quickload)', '/app/recs',
+              lambda h: GeomatchHelper(page=h.page).get_image_urls(quickload=True),
+              lambda h, result: _expect([urlsplit(url).path for url in result], _rec(h)['images'][:1], 'images')),
+    Operation('geomatch.get_image_urls (all)', '/app/recs',
+              lambda h: GeomatchHelper(page=h.page).get_image_urls(quickload=False),
+              lambda h, result: _expect([urlsplit(url).path for url in result], _rec(h)['images'], 'images')),
+    Operation('match.get_chat_ids', '/app/recs',
+              lambda h: MatchHelper(page=h.page).get_chat_ids(new=True, messaged=True),
+              lambda h, result: _expect(sorted(result), sorted(match['chatid'] for match in h.data['matches']),
+                                        'chat ids')),
+    Operation('match.get_match', '/app/recs',
+              lambda h: MatchHelper(page=h.page).get_match(_messaged(h)[0]['chatid'], quickload=True),
+              lambda h, result: _expect_match(result, _messaged(h)[0])),
+    Operation('match.get_messaged_matches', '/app/recs',
+              lambda h: MatchHelper(page=h.page).get_messaged_matches(amount=len(_messaged(h)), quickload=True),
+              lambda h, result: _expect([match.name for match in result], [match['name'] for match in _messaged(h)],
+                                        'matches')),
+    Operation('match.send_message', lambda h: '/app/messages/{}'.format(_messaged(h)[0]['chatid']),
+              lambda h: MatchHelper(page=h.page).send_message(_messaged(h)[0]['chatid'], "Hello from the harness"),
+              lambda h, result: _expect([entry['text'] for entry in h.fixture_log('message')],
+                                        ["Hello from the harness"], 'messages sent')),
+    Operation('match.unmatch', lambda h: '/app/messages/{}'.format(_new(h)[0]['chatid']),
+              lambda h: MatchHelper(page=h.page).unmatch(_new(h)[0]['chatid']),
+              lambda h, result: _expect(len(h.fixture_log('unmatch')), 1, 'unmatches')),
+    Operation('preferences.set_distance_range', '/app/profile',
+              lambda h: PreferencesHelper(page=h.page).set_distance_range(32),
+              lambda h, result: _expect_slider(h, "Maximum distance in kilometres", 32 / 160 * 100)),
+    Operation('preferences.set_age_range', '/app/profile',
+              lambda h: PreferencesHelper(page=h.page).set_age_range(25, 35),
+              lambda h, result: _expect_slider(h, "Minimum age", (25 - 18) * 100 / 82)
+              or _expect_slider(h, "Maximum age", (35 - 18) * 100 / 82)),
+    Operation('preferences.set_global', '/app/profile',
+              lambda h: PreferencesHelper(page=h.page).set_global(True),
+              lambda h, result: _expect([entry['value'] for entry in h.fixture_log('global')], [True], 'global')),
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples):
+    latencies = [sample.latency_ms for sample in samples]
+    return {
+        "runs": len(samples),
+        "errors": [sample.error for sample in samples if sample.error],
+        "p50_ms": round(percentile(latencies, 0.5), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "round_trips": round(sum(sample.round_trips for sample in samples) / len(samples), 1),
+        "requests": round(sum(sample.requests for sample in samples) / len(samples), 1),
+    }
+
+
+def compare(summary, baseline, tolerance=0.2, min_delta_ms=50.0):
+    """Regressions of ``summary`` against ``baseline``: slower p50 beyond the tolerance, or more round trips."""
+    regressions = []
+    for name, current in summary.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        delta = current["p50_ms"] - previous["p50_ms"]
+        if delta > min_delta_ms and delta > previous["p50_ms"] * tolerance:
+            regressions.append("{}: p50 {} ms -> {} ms".format(name, previous["p50_ms"], current["p50_ms"]))
+        if current["round_trips"] > previous["round_trips"]:
+            regressions.append("{}: round trips {} -> {}".format(name, previous["round_trips"], current["round_trips"]))
+    return regressions
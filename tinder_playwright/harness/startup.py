@@ -0,0 +1,80 @@
+'''
+Measures a cold start against the fixtures: creating the Session, then its first action
+(a like, which includes the login check and the popup check).
+
+    python -m harness.startup                   # fast start, 5 runs; fails when p50 is over the target
+    python -m harness.startup --classic         # the regular start, for comparison
+    python -m harness.startup --target 2000 --save startup.json
+
+Exits with 1 when the p50 cold start to first action is over --target ms.
+'''
+import argparse
+import json
+import sys
+import time
+
+from harness.fixture_server import FixtureServer
+from harness.runner import Harness, percentile
+
+
+def cold_start(server, headless=True, fast_start=True):
+    started = time.perf_counter()
+    harness = Harness(server, headless=headless, fast_start=fast_start)
+    ready = time.perf_counter()
+    try:
+        harness.session.like(amount=1, sleep=0, randomize_sleep=False)
+        done = time.perf_counter()
+        error = None if len(harness.fixture_log('like')) == 1 else "the first like didn't land"
+        phases = dict(harness.session.startup_ms)
+    finally:
+        harness.close()
+    return {"session_ms": (ready - started) * 1000, "first_action_ms": (done - ready) * 1000,
+            "total_ms": (done - started) * 1000, "phases": phases, "error": error}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.startup", description="Cold start benchmark of Session.")
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts to measure")
+    parser.add_argument("--classic", action="store_true", help="measure the regular start instead of the fast start")
+    parser.add_argument("--target", type=float, default=2500, help="p50 cold start to first action, in ms")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds before every response")
+    parser.add_argument("--render-delay", type=float, default=0.25, help="seconds before a loaded page shows its content")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    runs = []
+    with FixtureServer(latency=args.latency, render_delay=args.render_delay) as server:
+        for _ in range(args.repeat):
+            runs.append(cold_start(server, headless=not args.headed, fast_start=not args.classic))
+
+    summary = {key: {"p50_ms": round(percentile([run[key] for run in runs], 0.5), 1),
+                     "p95_ms": round(percentile([run[key] for run in runs], 0.95), 1)}
+               for key in ("session_ms", "first_action_ms", "total_ms")}
+    phases = {phase: round(percentile([run["phases"].get(phase, 0) for run in runs], 0.5), 1)
+              for phase in runs[0]["phases"]}
+
+    print("\n{} start, {} runs".format("regular" if args.classic else "fast", len(runs)))
+    for key, label in (("session_ms", "Session()"), ("first_action_ms", "first action"), ("total_ms", "total")):
+        print("{:<14} p50 {:>8} ms   p95 {:>8} ms".format(label, summary[key]["p50_ms"], summary[key]["p95_ms"]))
+    print("phases (p50): " + ", ".join("{} {} ms".format(phase, ms) for phase, ms in phases.items()))
+
+    failed = False
+    for error in sorted({run["error"] for run in runs if run["error"]}):
+        print("FAIL {}".format(error))
+        failed = True
+    if summary["total_ms"]["p50_ms"] > args.target:
+        print("FAIL cold start to first action took {} ms, the target is {} ms".format(
+            summary["total_ms"]["p50_ms"], args.target))
+        failed = True
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump({"fast_start": not args.classic, "target_ms": args.target, "summary": summary,
+                       "phases": phases, "runs": runs}, fp, indent=2)
+        print("\nSaved results to {}".format(args.save))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import playwright.sync_api  # noqa: F401
+except ImportError:
+    # the tests here skip themselves
+    pass
+else:
+    # tinderbotj_shared/tests stands in a browser-less tinderbotj when it's collected first: swap in the real one
+    if not hasattr(sys.modules.get("tinderbotj"), "__file__"):
+        for name in [name for name in sys.modules if name == "tinderbotj" or name.startswith("tinderbotj.")]:
+            del sys.modules[name]
+    import tinderbotj  # noqa: F401
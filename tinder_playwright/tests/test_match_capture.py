@@ -0,0 +1,108 @@
+import unittest
+from datetime import date
+
+try:
+    import playwright.sync_api  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("needs playwright")
+
+from tinderbotj.helpers.match_capture import MatchCapture
+
+
+class FakeRequest:
+    def __init__(self, method):
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, url, body, status=200, method="GET"):
+        self.url = url
+        self.body = body
+        self.status = status
+        self.request = FakeRequest(method)
+
+    def json(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+
+def match_json(chatid, name, last_activity, messages=(), **person):
+    return {"_id": chatid, "last_activity_date": last_activity, "messages": list(messages),
+            "person": dict(name=name, **person)}
+
+
+def message_json(id, sent_date, text, sender="them"):
+    return {"_id": id, "sent_date": sent_date, "message": text, "from": sender, "to": "me"}
+
+
+API = "https://api.gotinder.com"
+
+
+class MatchCaptureTests(unittest.TestCase):
+
+    def setUp(self):
+        self.capture = MatchCapture()
+
+    def respond(self, path, data, **kwargs):
+        self.capture.on_response(FakeResponse(API + path, {"data": data}, **kwargs))
+
+    def test_matches_pages_fill_both_lists(self):
+        self.respond("/v2/matches?count=60&message=0", {
+            "matches": [match_json("new1", "Ann", "2024-05-02T10:00:00Z")], "next_page_token": "abc"})
+        self.respond("/v2/matches?count=60&message=1", {
+            "matches": [match_json("chat1", "Bea", "2024-05-03T10:00:00Z",
+                                   [message_json("m1", "2024-05-03T10:00:00Z", "hi")]),
+                        match_json("chat2", "Cat", "2024-05-01T10:00:00Z")]})
+
+        self.assertTrue(self.capture.has())
+        self.assertEqual(self.capture.complete, {"new": False, "messaged": True})
+        self.assertEqual(self.capture.chat_ids(), ["chat1", "new1", "chat2"])
+        self.assertEqual(self.capture.chat_ids(messaged=False), ["new1"])
+        self.assertEqual(self.capture.chat_ids(new=False), ["chat1", "chat2"])
+        self.assertEqual(self.capture.responses, 2)
+
+    def test_new_match_with_a_message_counts_as_messaged(self):
+        self.respond("/v2/matches?message=0", {"matches": [match_json("new1", "Ann", "2024-05-02T10:00:00Z")]})
+        self.respond("/v2/matches/new1/messages?count=100", {"messages": [message_json("m1", "2024-05-02T11:00:00Z", "hey")]})
+        self.assertEqual(self.capture.chat_ids(new=False), ["new1"])
+
+    def test_messages_are_merged_and_returned_oldest_first(self):
+        self.respond("/v2/matches?message=1", {"matches": [
+            match_json("chat1", "Bea", "2024-05-03T10:00:00Z", [message_json("m2", "2024-05-03T10:00:00Z", "how are you?")])]})
+        self.respond("/v2/matches/chat1/messages?locale=en&count=100", {"messages": [
+            message_json("m2", "2024-05-03T10:00:00Z", "how are you?"),
+            message_json("m1", "2024-05-03T09:00:00Z", "hi", sender="me")]})
+
+        self.assertEqual(self.capture.get_messages("chat1"), [
+            {"from": "me", "to": "me", "message": "hi", "sent_date": "2024-05-03T09:00:00Z"},
+            {"from": "them", "to": "me", "message": "how are you?", "sent_date": "2024-05-03T10:00:00Z"},
+        ])
+        self.assertEqual(self.capture.get_messages("unknown"), [])
+
+    def test_profile_fields_of_a_match(self):
+        self.respond("/v2/matches?message=0", {"matches": [match_json(
+            "new1", "Ann", "2024-05-02T10:00:00Z", birth_date="1990-01-01T00:00:00.000Z", gender=1,
+            bio="", distance_mi=10, city={"name": "Ghent"}, schools=[{"name": "UGent"}],
+            jobs=[{"title": {"name": "Engineer"}, "company": {"name": "Acme"}}],
+            user_interests={"selected_interests": [{"name": "Hiking"}]},
+            photos=[{"url": "https://images/1.jpg"}, {"id": "no url"}])]})
+
+        match = self.capture.get_match("new1")
+        self.assertEqual(match.get_chat_id(), "new1")
+        self.assertEqual((match.name, match.age, match.gender, match.bio), ("Ann", date.today().year - 1990, "Woman", None))
+        self.assertEqual((match.work, match.study, match.home), ("Engineer at Acme", "UGent", "Ghent"))
+        self.assertEqual(match.distance, 16)
+        self.assertEqual(match.passions, ["Hiking"])
+        self.assertEqual(match.image_urls, ["https://images/1.jpg"])
+        self.assertIsNone(self.capture.get_match("unknown"))
+
+    def test_other_responses_are_ignored(self):
+        self.respond("/v2/recs/core", {"results": []})
+        self.respond("/v2/matches?message=0", {"matches": [match_json("new1", "Ann", "")]}, status=401)
+        self.respond("/v2/matches?message=0", {"matches": [match_json("new1", "Ann", "")]}, method="POST")
+        self.capture.on_response(FakeResponse("https://tinder.com/v2/matches?message=0", {"data": {}}))
+        self.capture.on_response(FakeResponse(API + "/v2/matches?message=0", ValueError("no json")))
+        self.assertEqual(self.capture.matches, {})
+        self.assertEqual(self.capture.responses, 0)
+        self.assertFalse(self.capture.has())
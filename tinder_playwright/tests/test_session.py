@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import playwright.sync_api  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("needs playwright")
+
+from tinderbotj.helpers.match_capture import MatchCapture
+from tinderbotj.helpers.match_helper import MatchHelper
+from tinderbotj.session import Session
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookies = []
+        self.scripts = []
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def add_init_script(self, script):
+        self.scripts.append(script)
+
+
+class ImportStorageStateTests(unittest.TestCase):
+    def test_imports_cookies_and_local_storage(self):
+        state = {
+            "cookies": [{"name": "session", "value": "1", "domain": ".tinder.com", "path": "/"}],
+            "origins": [{"origin": "https://tinder.com",
+                         "localStorage": [{"name": "TinderWeb/APIToken", "value": "abc"}]}],
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.json")
+            with open(path, "w", encoding="utf-8") as fp:
+                json.dump(state, fp)
+
+            session = Session.__new__(Session)
+            session.context = FakeContext()
+            session._import_storage_state(path)
+
+        self.assertEqual(session.context.cookies, state["cookies"])
+        self.assertEqual(len(session.context.scripts), 1)
+        self.assertIn('"https://tinder.com", {"TinderWeb/APIToken": "abc"}', session.context.scripts[0])
+
+    def test_missing_state_file_is_skipped(self):
+        session = Session.__new__(Session)
+        session.context = FakeContext()
+        session._import_storage_state("/nonexistent/state.json")
+        self.assertEqual(session.context.scripts, [])
+
+
+class FakePage:
+    def __init__(self, url):
+        self.url = url
+
+    def goto(self, url):
+        self.url = url
+
+
+class FakeBackend:
+    metrics = None
+
+    def __init__(self, page):
+        self.page = page
+        self.pressed = []
+
+    @property
+    def url(self):
+        return self.page.url
+
+    def wait(self, xpath, timeout=None, visible=True):
+        return True
+
+    def press(self, key):
+        self.pressed.append((key, self.page.url))
+
+
+class GeomatchAfterChatTests(unittest.TestCase):
+    def test_like_after_a_chat_action_goes_back_to_recs(self):
+        session = Session.__new__(Session)
+        session.page = FakePage(Session.HOME_URL)
+        session.backend = FakeBackend(session.page)
+        session.metrics = None
+        session._helpers = {}
+        session.session_data = {"like": 0, "dislike": 0, "superlike": 0}
+        session.match_capture = MatchCapture()
+        session._is_logged_in = lambda: True
+        session._handle_potential_popups = lambda: None
+        session._print_liked_stats = lambda: None
+        session._wait_for_capture = lambda loaded, timeout=None: None
+
+        session.like(sleep=0, randomize_sleep=False)
+        with mock.patch.object(MatchHelper, "_open_chat", autospec=True,
+                               side_effect=lambda helper, chatid: helper.page.goto(
+                                   "https://tinder.com/app/messages/" + chatid)):
+            session.get_messages("chat1")
+        self.assertIn("/app/messages/chat1", session.page.url)
+
+        session.like(sleep=0, randomize_sleep=False)
+        self.assertIn("/app/recs", session.page.url)
+        self.assertEqual([url for key, url in session.backend.pressed], [Session.HOME_URL, session.page.url])
+        self.assertEqual(session.session_data["like"], 2)
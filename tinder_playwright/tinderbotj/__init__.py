@@ -1,3 +1,12 @@
+import os
+
+# Everything that doesn't depend on the browser library (the helpers written against
+# helpers/backend.py, the daemon) lives once in tinderbotj_shared/, next to this tree,
+# and is imported from there as part of this package: tinderbotj.daemon, tinderbotj.helpers.match, ...
+SHARED_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                                            'tinderbotj_shared'))
+__path__.append(SHARED_PATH)
+
 from tinderbotj.session import Session
 
 from tinderbotj.helpers.profile_helper import ProfileHelper
@@ -9,6 +18,7 @@ from tinderbotj.helpers.match_helper import MatchHelper
 from tinderbotj.helpers.login_helper import LoginHelper
 from tinderbotj.helpers.storage_helper import StorageHelper
 from tinderbotj.helpers.loadingbar import LoadingBar
+from tinderbotj.helpers.progress import EventLog, Progress
 
 from tinderbotj.helpers.constants_helper import *
 from tinderbotj.helpers.xpaths import *
@@ -1,17 +1,27 @@
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 import time
 import re
+from tinderbotj.helpers.backend import PlaywrightBackend
+from tinderbotj.helpers.profile_extractor import read_image_urls
 from tinderbotj.helpers.xpaths import content
+from tinderbotj.helpers.waits import Waits
 from datetime import datetime
 
+# the card of the geomatch on top, and the element holding the photos of an opened profile
+CARD = f'{content}/div/div[1]/div/main/div[1]/div/div/div[1]'
+SLIDES = "(//div[@aria-label='Profile slider'])[1]/.."
+
 class GeomatchHelper:
 
     delay = 5000  # Playwright uses milliseconds
 
     HOME_URL = "https://www.tinder.com/app/recs"
 
-    def __init__(self, page):
+    def __init__(self, page, backend=None):
         self.page = page
+        # the session's backend, which carries its metrics, or one of our own
+        self.backend = backend or PlaywrightBackend(page)
+        self.waits = Waits(self.backend)
         if "/app/recs" not in self.page.url:
             self._get_home_page()
 
@@ -38,7 +48,7 @@ class GeomatchHelper:
 
             #    card.drag_to(card, target_position={'x': 200, 'y': 0})
 
-            self.page.keyboard.press('ArrowRight')
+            self.backend.press('ArrowRight')
             #time.sleep(1)
             return True
 
@@ -67,7 +77,7 @@ class GeomatchHelper:
 
             #    card.drag_to(card, target_position={'x': -200, 'y': 0})
 
-            self.page.keyboard.press('ArrowLeft')
+            self.backend.press('ArrowLeft')
 
             #time.sleep(1)
         except (PlaywrightTimeoutError, PlaywrightError):
@@ -83,19 +93,22 @@ class GeomatchHelper:
 
                 superlike_button = self.page.locator(xpath)
 
+                mark = self.waits.network_mark()
                 superlike_button.click()
 
             else:
-                xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div[1]'
+                xpath = CARD
 
                 self.page.wait_for_selector(xpath, timeout=self.delay)
 
                 card = self.page.locator(xpath).first
 
                 # Drag card upwards
+                mark = self.waits.network_mark()
                 card.drag_to(card, target_position={'x': 0, 'y': -200})
 
-            time.sleep(1)
+            # wait for the superlike to reach the API
+            self.waits.network_idle('geomatch.superlike', '/super', mark)
 
         except (PlaywrightTimeoutError, PlaywrightError):
             self._get_home_page()
@@ -118,7 +131,7 @@ class GeomatchHelper:
             #        continue
 
             # New Implementation
-            self.page.keyboard.press('ArrowUp')
+            self.backend.press('ArrowUp')
 
             #time.sleep(1)
 
@@ -300,6 +313,12 @@ class GeomatchHelper:
             self._open_profile()
 
         image_urls = []
+        if not quickload:
+            # every photo the page already holds, read in a single evaluation;
+            # the slider is only clicked through below when some of them can't be read that way
+            image_urls, complete = read_image_urls(self.backend)
+            if complete:
+                return image_urls
 
         # only get url of first few images, and not click all bullets to get all image
         elements = self.page.locator("//div[@aria-label='Profile slider']").all()
@@ -326,8 +345,10 @@ class GeomatchHelper:
             image_btns = self.page.locator(f'.{classname}').all()
 
             for btn in image_btns:
+                mark = self.waits.dom_mark(SLIDES)
                 btn.click()
-                time.sleep(1)
+                # the next photo is in once the slides changed
+                self.waits.dom_changed('geomatch.next_photo', SLIDES, mark)
 
                 elements = self.page.locator("//div[@aria-label='Profile slider']").all()
                 for element in elements:
@@ -430,7 +451,7 @@ class GeomatchHelper:
 
     def _get_home_page(self):
         self.page.goto(self.HOME_URL)
-        time.sleep(5)
+        self.waits.element('geomatch.home', CARD, profile='navigation')
 
     def _is_profile_opened(self):
         if '/profile' in self.page.url:
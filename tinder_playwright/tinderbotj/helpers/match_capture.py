@@ -0,0 +1,135 @@
+import re
+from datetime import date, datetime
+
+from tinderbotj.helpers.match import Match
+
+
+class MatchCapture:
+    """
+    Builds our own matches and their messages from the API responses the web app loads anyway.
+
+    Listens to the page's responses (see ``attach``) and keeps the JSON of every match and
+    message the app fetched, so matches can be listed and read without walking tabs,
+    scrolling lists or scraping the profile. Only what the app loaded is known: the first
+    pages of both match lists load with the app, a chat's messages when the chat is opened.
+    ``complete`` tells whether a list was loaded up to its last page.
+    """
+
+    API_HOST = "api.gotinder.com"
+
+    # /v2/matches?message=0|1&page_token=... and /v2/matches/<match id>/messages?...
+    MATCHES_PATH = re.compile(r"/v2/matches/?(\?|$)")
+    MESSAGES_PATH = re.compile(r"/v2/matches/(?P<chatid>[^/?]+)/messages/?(\?|$)")
+
+    GENDERS = {0: "Man", 1: "Woman"}
+
+    def __init__(self):
+        self.matches = {}  # chat id -> match json
+        self.lists = {}  # chat id -> "new" or "messaged", the list the app loaded it for
+        self.messages = {}  # chat id -> {message id -> message json}
+        self.complete = {"new": False, "messaged": False}
+        self.responses = 0
+
+    def attach(self, page):
+        page.on("response", self.on_response)
+
+    def on_response(self, response):
+        url = response.url
+        if self.API_HOST not in url or response.request.method != "GET" or response.status != 200:
+            return
+
+        path = url.split(self.API_HOST, 1)[1]
+        messages_path = self.MESSAGES_PATH.search(path)
+        if not messages_path and not self.MATCHES_PATH.search(path):
+            return
+
+        try:
+            data = response.json().get("data") or {}
+        except Exception:
+            # a redirect, an empty body or a response the app aborted
+            return
+
+        self.responses += 1
+        if messages_path:
+            self.add_messages(messages_path.group("chatid"), data.get("messages") or [])
+        else:
+            list_name = "messaged" if "message=1" in path else "new"
+            self.add_matches(data.get("matches") or [], list_name)
+            if not data.get("next_page_token"):
+                self.complete[list_name] = True
+
+    def add_matches(self, matches, list_name):
+        for match in matches:
+            chatid = match.get("_id") or match.get("id")
+            if chatid:
+                self.matches[chatid] = match
+                self.lists[chatid] = list_name
+                # the matches list comes with the last message of every match
+                self.add_messages(chatid, match.get("messages") or [])
+
+    def add_messages(self, chatid, messages):
+        known = self.messages.setdefault(chatid, {})
+        for message in messages:
+            known[message.get("_id") or message.get("sent_date")] = message
+
+    def has(self, new=True, messaged=True):
+        """True once the app loaded (a first page of) every list asked for."""
+        loaded = set(self.lists.values())
+        return (not new or "new" in loaded or self.complete["new"]) and \
+               (not messaged or "messaged" in loaded or self.complete["messaged"])
+
+    def _list_of(self, chatid):
+        # a new match moves to the messages once a message was sent
+        return "messaged" if self.lists.get(chatid) == "messaged" or self.messages.get(chatid) else "new"
+
+    def _last_activity(self, match):
+        return match.get("last_activity_date") or match.get("created_date") or ""
+
+    def chat_ids(self, new=True, messaged=True):
+        """Chat ids of the captured matches, most recent activity first, like the lists in the app."""
+        lists = {name for name, wanted in (("new", new), ("messaged", messaged)) if wanted}
+        ordered = sorted(self.matches, key=lambda chatid: self._last_activity(self.matches[chatid]), reverse=True)
+        return [chatid for chatid in ordered if self._list_of(chatid) in lists]
+
+    def get_match(self, chatid):
+        match = self.matches.get(chatid)
+        if match is None:
+            return None
+
+        person = match.get("person") or {}
+        jobs = person.get("jobs") or []
+        work = None
+        if jobs:
+            work = " at ".join(part for part in ((jobs[0].get("title") or {}).get("name"),
+                                                 (jobs[0].get("company") or {}).get("name")) if part) or None
+        schools = person.get("schools") or []
+        interests = (person.get("user_interests") or {}).get("selected_interests") or []
+
+        return Match(name=person.get("name"), chatid=chatid, age=self._age(person.get("birth_date")), work=work,
+                     study=schools[0].get("name") if schools else None, home=(person.get("city") or {}).get("name"),
+                     gender=self.GENDERS.get(person.get("gender")), bio=person.get("bio") or None,
+                     distance=self._distance(person), passions=[interest.get("name") for interest in interests],
+                     image_urls=[photo["url"] for photo in person.get("photos") or [] if photo.get("url")])
+
+    def get_messages(self, chatid):
+        """Captured messages of a match, oldest first, as dicts with 'from', 'to', 'message' and 'sent_date'."""
+        messages = sorted(self.messages.get(chatid, {}).values(), key=lambda message: message.get("sent_date") or "")
+        return [{"from": message.get("from"), "to": message.get("to"), "message": message.get("message"),
+                 "sent_date": message.get("sent_date")} for message in messages]
+
+    @staticmethod
+    def _age(birth_date):
+        try:
+            born = datetime.strptime(birth_date[:10], "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return None
+        today = date.today()
+        return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+    @staticmethod
+    def _distance(person):
+        # only present for some matches, in miles
+        miles = person.get("distance_mi")
+        if miles is None:
+            return None
+        return int(round(miles * 1.609))
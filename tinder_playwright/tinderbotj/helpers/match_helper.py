@@ -1,42 +1,38 @@
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
-import time
 
-from tinderbotj.helpers.match import Match
 from tinderbotj.helpers.constants_helper import Socials
-from tinderbotj.helpers.loadingbar import LoadingBar
+from tinderbotj.helpers.progress import Progress
+from tinderbotj.helpers.backend import PlaywrightBackend
+from tinderbotj.helpers.match_sync import MatchListSync, scroll_to_bottom
+from tinderbotj.helpers.navigation import CLICK_JS, ChatNavigator
+from tinderbotj.helpers.profile_extractor import SVG_FIELDS, read_image_urls, read_profile
+from tinderbotj.helpers.waits import Waits
 from tinderbotj.helpers.xpaths import content, modal_manager
 
+# endpoints whose requests tell when a chat action went through
+SEND_ENDPOINT = "/user/matches/"
+GIF_SEARCH_ENDPOINT = "/giphy/"
+SONG_SEARCH_ENDPOINT = "/spotify/"
+
+# the element holding the photos of an opened profile
+SLIDES = "(//div[@aria-label='Profile slider'])[1]/.."
+
 class MatchHelper:
 
     delay = 5
 
     HOME_URL = "https://tinder.com/app/recs"
 
-    def __init__(self, page):
+    def __init__(self, page, backend=None):
         self.page = page
+        # the session's backend, which carries its metrics, or one of our own
+        self.backend = backend or PlaywrightBackend(page)
+        self.waits = Waits(self.backend)
+        # remembers the open chat, so the getters and senders below only navigate when it changes
+        self.navigator = ChatNavigator(self.backend, self._click_chat)
 
     def _scroll_down(self, xpath):
-        eula = self.page.locator(xpath).first
-        self.page.evaluate('(element) => element.scrollTop = element.scrollHeight', eula.element_handle())
-
-        SCROLL_PAUSE_TIME = 0.5
-
-        # Get scroll height
-        last_height = self.page.evaluate("(element) => element.scrollHeight", eula.element_handle())
-
-        while True:
-            # Scroll down to bottom
-            self.page.evaluate("(element) => element.scrollTo(0, element.scrollHeight);", eula.element_handle())
-
-            # Wait to load page
-            time.sleep(SCROLL_PAUSE_TIME)
-
-            # Calculate new scroll height and compare with last scroll height
-            new_height = self.page.evaluate("(element) => element.scrollHeight", eula.element_handle())
-            if new_height == last_height:
-                return True
-            last_height = new_height
-
+        return scroll_to_bottom(self.backend, xpath)
 
     def get_chat_ids(self, new, messaged):
         chatids = []
@@ -47,7 +43,8 @@ class MatchHelper:
         except PlaywrightTimeoutError:
             print("match tab could not be found, trying again")
             self.page.goto(self.HOME_URL)
-            time.sleep(1)
+            self.navigator.forget()
+            self.waits.element('matches.tabs', xpath, profile='navigation')
             return self.get_chat_ids(new, messaged)
 
         tabs = self.page.locator(xpath).all()
@@ -60,6 +57,7 @@ class MatchHelper:
                         tab.click()
                     except:
                         self.page.goto(self.HOME_URL)
+                        self.navigator.forget()
                         return self.get_chat_ids(new, messaged)
 
 
@@ -94,6 +92,7 @@ class MatchHelper:
                         tab.click()
                     except:
                         self.page.goto(self.HOME_URL)
+                        self.navigator.forget()
                         return self.get_chat_ids(new, messaged)
 
             # Start scraping the chatted matches
@@ -118,93 +117,30 @@ class MatchHelper:
 
         return chatids
 
-    def get_new_matches(self, amount, quickload):
-        matches = []
-        used_chatids = []
-        iteration = 0
-        while True:
-            iteration += 1
-            if len(matches) >= amount:
-                break
-
-            new_chatids = self.get_chat_ids(new=True, messaged=False)
-            copied = new_chatids.copy()
-            for index in range(len(copied)):
-                chatid = copied[index]
-                if chatid in used_chatids:
-                    new_chatids.remove(chatid)
-                else:
-                    used_chatids.append(chatid)
-
-            # no new matches are found, MAX LIMIT
-            if len(new_chatids) == 0:
-                break
-
-            # shorten the list so doesn't fetch ALL matches but just the amount it needs
-            diff = len(matches) + len(new_chatids) - amount
-
-            if diff > 0:
-                del new_chatids[-diff:]
-
-            print(f"\nGetting not-interacted-with, NEW MATCHES, part {iteration}")
-            loadingbar = LoadingBar(len(new_chatids), "new matches")
-            for index, chatid in enumerate(new_chatids):
-                matches.append(self.get_match(chatid, quickload))
-                loadingbar.update_loading(index)
-            print("\n")
-
-            # scroll down to get more chatids
-            xpath = '//div[@role="tabpanel"]'
-            tab = self.page.locator(xpath).first
-            self.page.evaluate('(element) => element.scrollTop = element.scrollHeight;', tab.element_handle())
-            time.sleep(4)
+    def get_new_matches(self, amount, quickload, store=None):
+        return self._get_matches('new', amount, quickload, store, "not-interacted-with, NEW MATCHES", "new matches")
 
-        return matches
+    def get_messaged_matches(self, amount, quickload, store=None):
+        return self._get_matches('messaged', amount, quickload, store, "interacted-with, MESSAGED MATCHES",
+                                 "interacted-with-matches")
 
-    def get_messaged_matches(self, amount, quickload):
+    def _get_matches(self, list_name, amount, quickload, store, title, description):
+        # with a MatchStore, only the matches added since the previous sync are fetched
+        sync = MatchListSync(self.backend, store, delay=self.delay)
         matches = []
-        used_chatids = []
-        iteration = 0
-        while True:
-            iteration += 1
-            if len(matches) >= amount:
-                break
-
-            new_chatids = self.get_chat_ids(new=False, messaged=True)
-            copied = new_chatids.copy()
-            for index in range(len(copied)):
-                if copied[index] in used_chatids:
-                    new_chatids.remove(copied[index])
-                else:
-                    used_chatids.append(new_chatids[index])
-
-            # no new matches are found, MAX LIMIT
-            if len(new_chatids) == 0:
-                break
-
-            # shorten the list so doesn't fetch ALL matches but just the amount it needs
-            diff = len(matches) + len(new_chatids) - amount
-            if diff > 0:
-                del new_chatids[-diff:]
-
-            print(f"\nGetting interacted-with, MESSAGED MATCHES, part {iteration}")
-            loadingbar = LoadingBar(len(new_chatids), "interacted-with-matches")
-            for index, chatid in enumerate(new_chatids):
-                matches.append(self.get_match(chatid, quickload))
-                loadingbar.update_loading(index)
-            print("\n")
-
-            # scroll down to get more chatids
-            xpath = '//div[@class="messageList"]'
-            tab = self.page.locator(xpath).first
-            self.page.evaluate('(element) => element.scrollTop = element.scrollHeight;', tab.element_handle())
-            time.sleep(4)
+        for part, chatids in enumerate(sync.batches(list_name, amount), start=1):
+            print(f"\nGetting {title}, part {part}")
+            with Progress(len(chatids), description) as progress:
+                for chatid in chatids:
+                    match = self.get_match(chatid, quickload)
+                    matches.append(match)
+                    sync.mark_seen(list_name, [chatid])
+                    progress.advance(ok=match is not None, chatid=chatid, list=list_name)
 
         return matches
 
     def send_message(self, chatid, message):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         # locate the textbox and send message
         try:
@@ -214,19 +150,18 @@ class MatchHelper:
 
             textbox = self.page.locator(xpath).first
             textbox.fill(message)
+            mark = self.waits.network_mark()
             textbox.press("Enter")
 
+            # wait for the message to reach the API
+            self.waits.network_idle('chat.send_message', SEND_ENDPOINT, mark)
             print("Message sent succesfully.\nmessage: {}\n".format(message))
-
-            # sleep so message can be sent
-            time.sleep(1.5)
         except Exception as e:
             print("SOMETHING WENT WRONG LOCATING TEXTBOX")
             print(e)
 
     def send_gif(self, chatid, gifname):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             xpath = '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[2]/button'
@@ -234,25 +169,27 @@ class MatchHelper:
             self.page.wait_for_selector(xpath, timeout=self.delay*1000)
             gif_btn = self.page.locator(xpath).first
 
+            gif_xpath = '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div/div[1]/div[1]/div/div/div'
             gif_btn.click()
-            time.sleep(1.5)
+            self.waits.element('chat.gif_picker', gif_xpath)
 
             search_box = self.page.locator('//textarea').first
+            mark = self.waits.network_mark()
             search_box.fill(gifname)
             # give chance to load gif
-            time.sleep(1.5)
+            self.waits.network_idle('chat.gif_search', GIF_SEARCH_ENDPOINT, mark, profile='search')
 
-            gif = self.page.locator('/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div/div[1]/div[1]/div/div/div').first
+            gif = self.page.locator(gif_xpath).first
+            mark = self.waits.network_mark()
             gif.click()
-            # sleep so gif can be sent
-            time.sleep(1.5)
+            # wait for the gif to be sent
+            self.waits.network_idle('chat.send_gif', SEND_ENDPOINT, mark)
 
         except Exception as e:
             print(e)
 
     def send_song(self, chatid, songname):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             xpath = '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[4]/div/div[3]/button'
@@ -260,23 +197,26 @@ class MatchHelper:
             self.page.wait_for_selector(xpath, timeout=self.delay*1000)
             song_btn = self.page.locator(xpath).first
 
+            song_xpath = '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[2]/div/div[1]/div[1]/div/div[1]/div/button'
+            confirm_xpath = '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[2]/div/div[1]/div[2]/div/div[2]/button'
             song_btn.click()
-            time.sleep(1.5)
+            self.waits.element('chat.song_picker', '//textarea')
 
             search_box = self.page.locator('//textarea').first
+            mark = self.waits.network_mark()
             search_box.fill(songname)
-            # give chance to load gif
-            time.sleep(1.5)
+            # give chance to load the songs
+            self.waits.network_idle('chat.song_search', SONG_SEARCH_ENDPOINT, mark, profile='search')
 
-            song = self.page.locator(
-                '/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[2]/div/div[1]/div[1]/div/div[1]/div/button').first
+            song = self.page.locator(song_xpath).first
             song.click()
-            time.sleep(0.5)
+            self.waits.element('chat.song_confirm', confirm_xpath)
 
-            confirm_btn = self.page.locator('/html/body/div[1]/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[2]/div/div[1]/div[2]/div/div[2]/button').first
+            confirm_btn = self.page.locator(confirm_xpath).first
+            mark = self.waits.network_mark()
             confirm_btn.click()
-            # sleep so song can be sent
-            time.sleep(1.5)
+            # wait for the song to be sent
+            self.waits.network_idle('chat.send_song', SEND_ENDPOINT, mark)
 
         except Exception as e:
             print(e)
@@ -289,8 +229,7 @@ class MatchHelper:
 
         if not did_match: print("Media must be of type Socials"); return
 
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[1]/div/div/div[3]/div/div[1]/button'
@@ -299,7 +238,6 @@ class MatchHelper:
             socials_btn = self.page.locator(xpath).first
 
             socials_btn.click()
-            time.sleep(1)
 
             xpath = '//img[@alt="{}"]'.format(media.value)
             self.page.wait_for_selector(xpath, timeout=self.delay*1000)
@@ -309,10 +247,11 @@ class MatchHelper:
 
             # locate the sendbutton and send social
             try:
+                mark = self.waits.network_mark()
                 self.page.locator("//button[@type='submit']").first.click()
+                # wait for the social card to be sent
+                self.waits.network_idle('chat.send_socials', SEND_ENDPOINT, mark)
                 print("Succesfully send social card")
-                # sleep so message can be sent
-                time.sleep(1.5)
             except Exception as e:
                 print("SOMETHING WENT WRONG LOCATING TEXTBOX")
                 print(e)
@@ -320,98 +259,87 @@ class MatchHelper:
         except Exception as e:
             print(e)
             self.page.reload()
+            self.navigator.forget()
             self.send_socials(chatid, media)
 
     def unmatch(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             #'//button[text()="Unmatch"]'
             unmatch_button = self.page.locator(f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[2]/div/div[2]/div/button[1]').first
+            confirm_xpath = f'{modal_manager}/div/div/div[2]/button[1]'
             unmatch_button.click()
-            time.sleep(1)
-
+            self.waits.element('chat.unmatch_dialog', confirm_xpath)
 
-            unmatch_button = self.page.locator(f'{modal_manager}/div/div/div[2]/button[1]').first
+            unmatch_button = self.page.locator(confirm_xpath).first
+            mark = self.waits.network_mark()
             unmatch_button.click()
-            time.sleep(1)
+            self.waits.network_idle('chat.unmatch', SEND_ENDPOINT, mark)
 
         except Exception as e:
             print("SOMETHING WENT WRONG FINDING THE UNMATCH BUTTONS")
             print(e)
 
+    def run_chat_operations(self, operations):
+        """
+        Run ``(action, chatid, *args)`` tuples, e.g. ("send_message", chatid, "hey") or ("get_bio", chatid),
+        one chat at a time so every chat is only opened once; the results come back in the order given.
+        """
+        results = [None] * len(operations)
+        for index, (action, chatid, *args) in self.navigator.plan(operations):
+            results[index] = getattr(self, action)(chatid, *args)
+        return results
+
     def _open_chat(self, chatid):
-        if self._is_chat_opened(chatid): return;
+        self.navigator.open(chatid)
 
+    def _click_chat(self, chatid):
         href = "/app/messages/{}".format(chatid)
+        link = '//a[@href="{}"]'.format(href)
 
-        # look for the match with that chatid
-        # first we're gonna look for the match in the already interacted matches
-        try:
-            xpath = '//*[@role="tab"]'
-            # wait for element to appear
-            self.page.wait_for_selector(xpath, timeout=self.delay*1000)
-
-            tabs = self.page.locator(xpath).all()
-            for tab in tabs:
-                if tab.text_content() == "Messages":
-                    tab.click()
-            time.sleep(1)
-        except Exception as e:
-            self.page.goto(self.HOME_URL)
-            print(e)
-            return self._open_chat(chatid)
-
-        try:
-            match_button = self.page.locator('//a[@href="{}"]'.format(href)).first
-            self.page.evaluate("(element) => element.click();", match_button.element_handle())
-
-        except Exception as e:
-            # match reference not found, so let's see if match exists in the new not yet interacted matches
-            xpath = '//*[@role="tab"]'
-            # wait for element to appear
-            self.page.wait_for_selector(xpath, timeout=self.delay*1000)
-
-            tabs = self.page.locator(xpath).all()
-            for tab in tabs:
-                if tab.text_content() == "Matches":
-                    tab.click()
-
-            time.sleep(1)
-
+        # the sidebar still shows the list the previous chat was in, so the match is often right there
+        if not self.backend.evaluate(CLICK_JS, {'xpath': link}):
             try:
-                matched_button = self.page.locator('//a[@href="{}"]'.format(href)).first
-                matched_button.click()
+                xpath = '//*[@role="tab"]'
+                # wait for element to appear
+                self.page.wait_for_selector(xpath, timeout=self.delay*1000)
+
+                # look in the tab the previous chat was found in first, then in the other one
+                for name in self.navigator.tabs():
+                    for tab in self.page.locator(xpath).all():
+                        if tab.text_content() == name:
+                            tab.click()
+                    if self.waits.element('chat.match_link', link, visible=False):
+                        self.navigator.found_in(name)
+                        break
             except Exception as e:
-                # some kind of error happened, probably cuz chatid/ref/match doesnt exist (anymore)
-                # Another error could be that the elements could not be found, cuz we're at a wrong url (potential bug)
+                self.page.goto(self.HOME_URL)
+                self.navigator.forget()
                 print(e)
-        time.sleep(1)
+                return self._click_chat(chatid)
 
-    def get_match(self, chatid, quickload):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+            if not self.backend.evaluate(CLICK_JS, {'xpath': link}):
+                # probably cuz chatid/ref/match doesnt exist (anymore)
+                print("Match with chatid {} could not be found".format(chatid))
+                return
+        self.waits.url('chat.open', href)
 
-        name = self.get_name(chatid)
-        age = self.get_age(chatid)
-        bio = self.get_bio(chatid)
-        image_urls = self.get_image_urls(chatid, quickload)
-
-        rowdata = self.get_row_data(chatid)
-        work = rowdata.get('work')
-        study = rowdata.get('study')
-        home = rowdata.get('home')
-        gender = rowdata.get('gender')
-        distance = rowdata.get('distance')
+    def get_match(self, chatid, quickload):
+        record = self.get_profile_record(chatid)
+        if not quickload:
+            # the remaining images only load after clicking through the slider
+            record = record._replace(image_urls=self.get_image_urls(chatid, quickload))
+        return record.to_match(chatid)
 
-        passions = self.get_passions(chatid)
+    def get_profile_record(self, chatid):
+        """Every field of the opened profile, read in a single script evaluation."""
+        self._open_chat(chatid)
 
-        return Match(name=name, chatid=chatid, age=age, work=work, study=study, home=home, gender=gender, distance=distance, bio=bio, passions=passions, image_urls=image_urls)
+        return read_profile(self.backend, timeout=self.delay)
 
     def get_name(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[2]/div/div[1]/div/div/div[2]/div[1]/div/div[1]/div[1]/h1'
@@ -422,8 +350,7 @@ class MatchHelper:
             print(e)
 
     def get_age(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         age = None
 
@@ -441,55 +368,12 @@ class MatchHelper:
         return age
 
 
-    _WORK_SVG_PATH = "M7.15 3.434h5.7V1.452a.728.728 0 0 0-.724-.732H7.874a.737.737 0 0 0-.725.732v1.982z"
-    _STUDYING_SVG_PATH = "M11.87 5.026L2.186 9.242c-.25.116-.25.589 0 .705l.474.204v2.622a.78.78 0 0 0-.344.657c0 .42.313.767.69.767.378 0 .692-.348.692-.767a.78.78 0 0 0-.345-.657v-2.322l2.097.921a.42.42 0 0 0-.022.144v3.83c0 .45.27.801.626 1.101.358.302.842.572 1.428.804 1.172.46 2.755.776 4.516.776 1.763 0 3.346-.317 4.518-.777.586-.23 1.07-.501 1.428-.803.355-.3.626-.65.626-1.1v-3.83a.456.456 0 0 0-.022-.145l3.264-1.425c.25-.116.25-.59 0-.705L12.13 5.025c-.082-.046-.22-.017-.26 0v.001zm.13.767l8.743 3.804L12 13.392 3.257 9.599l8.742-3.806zm-5.88 5.865l5.75 2.502a.319.319 0 0 0 .26 0l5.75-2.502v3.687c0 .077-.087.262-.358.491-.372.29-.788.52-1.232.68-1.078.426-2.604.743-4.29.743s-3.212-.317-4.29-.742c-.444-.161-.86-.39-1.232-.68-.273-.23-.358-.415-.358-.492v-3.687z"
-    _HOME_SVG_PATH = "M19.695 9.518H4.427V21.15h15.268V9.52zM3.109 9.482h17.933L12.06 3.709 3.11 9.482z"
-    _LOCATION_SVG_PATH = "M11.436 21.17l-.185-.165a35.36 35.36 0 0 1-3.615-3.801C5.222 14.244 4 11.658 4 9.524 4 5.305 7.267 2 11.436 2c4.168 0 7.437 3.305 7.437 7.524 0 4.903-6.953 11.214-7.237 11.48l-.2.167zm0-18.683c-3.869 0-6.9 3.091-6.9 7.037 0 4.401 5.771 9.927 6.897 10.972 1.12-1.054 6.902-6.694 6.902-10.95.001-3.968-3.03-7.059-6.9-7.059h.001z"
-
-    _WORK_SVG_PATH = "M7.15 3.434h5.7V1.452a.728.728 0 0 0-.724-.732H7.874a.737.737 0 0 0-.725.732v1.982z"
-    _STUDYING_SVG_PATH = "M11.87 5.026L2.186 9.242c-.25.116-.25.589 0 .705l.474.204v2.622a.78.78 0 0 0-.344.657c0 .42.313.767.69.767.378 0 .692-.348.692-.767a.78.78 0 0 0-.345-.657v-2.322l2.097.921a.42.42 0 0 0-.022.144v3.83c0 .45.27.801.626 1.101.358.302.842.572 1.428.804 1.172.46 2.755.776 4.516.776 1.763 0 3.346-.317 4.518-.777.586-.23 1.07-.501 1.428-.803.355-.3.626-.65.626-1.1v-3.83a.456.456 0 0 0-.022-.145l3.264-1.425c.25-.116.25-.59 0-.705L12.13 5.025c-.082-.046-.22-.017-.26 0v.001zm.13.767l8.743 3.804L12 13.392 3.257 9.599l8.742-3.806zm-5.88 5.865l5.75 2.502a.319.319 0 0 0 .26 0l5.75-2.502v3.687c0 .077-.087.262-.358.491-.372.29-.788.52-1.232.68-1.078.426-2.604.743-4.29.743s-3.212-.317-4.29-.742c-.444-.161-.86-.39-1.232-.68-.273-.23-.358-.415-.358-.492v-3.687z"
-    _HOME_SVG_PATH = "M19.695 9.518H4.427V21.15h15.268V9.52zM3.109 9.482h17.933L12.06 3.709 3.11 9.482z"
-    _LOCATION_SVG_PATH = "M11.436 21.17l-.185-.165a35.36 35.36 0 0 1-3.615-3.801C5.222 14.244 4 11.658 4 9.524 4 5.305 7.267 2 11.436 2c4.168 0 7.437 3.305 7.437 7.524 0 4.903-6.953 11.214-7.237 11.48l-.2.167zm0-18.683c-3.869 0-6.9 3.091-6.9 7.037 0 4.401 5.771 9.927 6.897 10.972 1.12-1.054 6.902-6.694 6.902-10.95.001-3.968-3.03-7.059-6.9-7.059h.001z"
-    _LOCATION_SVG_PATH_2 = "M11.445 12.5a2.945 2.945 0 0 1-2.721-1.855 3.04 3.04 0 0 1 .641-3.269 2.905 2.905 0 0 1 3.213-.645 3.003 3.003 0 0 1 1.813 2.776c-.006 1.653-1.322 2.991-2.946 2.993zm0-5.544c-1.378 0-2.496 1.139-2.498 2.542 0 1.404 1.115 2.544 2.495 2.546a2.52 2.52 0 0 0 2.502-2.535 2.527 2.527 0 0 0-2.499-2.545v-.008z"
-    _GENDER_SVG_PATH = "M15.507 13.032c1.14-.952 1.862-2.656 1.862-5.592C17.37 4.436 14.9 2 11.855 2 8.81 2 6.34 4.436 6.34 7.44c0 3.07.786 4.8 2.02 5.726-2.586 1.768-5.054 4.62-4.18 6.204 1.88 3.406 14.28 3.606 15.726 0 .686-1.71-1.828-4.608-4.4-6.338"
-
     def get_row_data(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
-
-        rowdata = {}
-
-        xpath = '//div[@class="Row"]'
-        rows = self.page.locator(xpath).all()
-
-        for row in rows:
-            svg = row.locator(".//*[starts-with(@d, 'M')]").first.get_attribute('d')
-            value = row.locator(".//div[2]").first.text_content()
-            if svg == self._WORK_SVG_PATH:
-                rowdata['work'] = value
-            if svg == self._STUDYING_SVG_PATH:
-                rowdata['study'] = value
-            if svg == self._HOME_SVG_PATH:
-                rowdata['home'] = value.split(' ')[-1]
-            if svg == self._GENDER_SVG_PATH:
-                rowdata['gender'] = value
-            if svg == self._LOCATION_SVG_PATH or svg == self._LOCATION_SVG_PATH_2:
-                distance = value.split(' ')[0]
-                try:
-                    distance = int(distance)
-                except TypeError:
-                    # Means the text has a value of 'Less than 1 km away'
-                    distance = 1
-                except ValueError:
-                    distance = None
-
-                rowdata['distance'] = distance
-
-        return rowdata
+        record = self.get_profile_record(chatid)
+        return {field: getattr(record, field) for field in set(SVG_FIELDS.values()) if getattr(record, field) is not None}
 
     def get_passions(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         passions = []
         xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[2]/div/div[1]/div/div/div[2]/div/div/div[2]/div[2]/div'
@@ -500,8 +384,7 @@ class MatchHelper:
         return passions
 
     def get_bio(self, chatid):
-        if not self._is_chat_opened(chatid):
-            self._open_chat(chatid)
+        self._open_chat(chatid)
 
         try:
             xpath = f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[2]/div/div[1]/div/div/div[2]/div[2]/div'
@@ -512,10 +395,15 @@ class MatchHelper:
 
     def get_image_urls(self, chatid, quickload):
         try:
-            if not self._is_chat_opened(chatid):
-                self._open_chat(chatid)
+            self._open_chat(chatid)
 
             image_urls = []
+            if not quickload:
+                # every photo the page already holds, read in a single evaluation;
+                # the slider is only clicked through below when some of them can't be read that way
+                image_urls, complete = read_image_urls(self.backend)
+                if complete:
+                    return image_urls
 
             # only get url of first few images, and not click all bullets to get all image
             elements = self.page.locator("//div[@aria-label='Profile slider']").all()
@@ -540,8 +428,10 @@ class MatchHelper:
             image_btns = self.page.locator(classname).all()
 
             for btn in image_btns:
+                mark = self.waits.dom_mark(SLIDES)
                 btn.click()
-                time.sleep(1)
+                # the next photo is in once the slides changed
+                self.waits.dom_changed('profile.next_photo', SLIDES, mark)
 
                 elements = self.page.locator("//div[@aria-label='Profile slider']").all()
                 for element in elements:
@@ -565,8 +455,4 @@ class MatchHelper:
         return image_urls
 
     def _is_chat_opened(self, chatid):
-        # open the correct user if not happened yet
-        if chatid in self.page.url:
-            return True
-        else:
-            return False
+        return self.navigator.is_open(chatid)
@@ -1,6 +1,8 @@
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 
 from tinderbotj.helpers.constants_helper import Sexuality
+from tinderbotj.helpers.backend import PlaywrightBackend
+from tinderbotj.helpers.preferences import XPATHS, read_preferences, changed_preferences
 import time
 
 class PreferencesHelper:
@@ -9,8 +11,10 @@ class PreferencesHelper:
 
     HOME_URL = "https://www.tinder.com/app/profile"
 
-    def __init__(self, page):
+    def __init__(self, page, backend=None):
         self.page = page
+        # the session's backend, which carries its metrics, or one of our own
+        self.backend = backend or PlaywrightBackend(page)
 
         # open profile
         try:
@@ -20,7 +24,42 @@ class PreferencesHelper:
         except:
             pass
 
+    def apply(self, wanted):
+        """
+        Change every setting of ``wanted`` (a Preferences) that differs from the current one, in one visit.
+
+        The current settings are read in a single round trip and the ones that already match
+        are skipped. Sexuality goes last, as it opens a page of its own. Returns the changes.
+        """
+        self.backend.wait(XPATHS['max_age'], timeout=self.delay, visible=False)
+        current, raw = read_preferences(self.backend)
+        changes = changed_preferences(current, wanted)
+        if not changes:
+            print("Preferences are already as wanted, nothing to change.")
+            return changes
+
+        if 'km' in changes:
+            self._slide_distance(changes['km'])
+        if 'min_age' in changes or 'max_age' in changes:
+            ages = (changes.get('min_age', current.min_age), changes.get('max_age', current.max_age))
+            if None in ages:
+                print("Couldn't read the current age range, give both min_age and max_age to change it.")
+            else:
+                self._slide_ages(*ages)
+        if 'global_mode' in changes:
+            self._toggle_global(changes['global_mode'], is_activated=raw['global'])
+        if 'sexuality' in changes:
+            self._choose_sexuality(changes['sexuality'])
+
+        # the app saves the settings by itself, one wait covers all of them
+        time.sleep(5)
+        return changes
+
     def set_distance_range(self, km):
+        self._slide_distance(km)
+        time.sleep(5)
+
+    def _slide_distance(self, km):
         # correct out of bounds values
         if km > 160:
             final_percentage = 100
@@ -72,9 +111,12 @@ class PreferencesHelper:
             current_percentage = float(link.get_attribute('style').split(' ')[1].split('%')[0])
 
         print("Ended slider with {}% = {}km\n\n".format(current_percentage, current_percentage*1.6))
-        time.sleep(5)
 
     def set_age_range(self, min, max):
+        self._slide_ages(min, max)
+        time.sleep(5)
+
+    def _slide_ages(self, min, max):
         # locate elements
         xpath = '//*[@aria-label="Minimum age"]'
         self.page.wait_for_selector(xpath, timeout=self.delay*1000)
@@ -165,9 +207,12 @@ class PreferencesHelper:
 
         print("Ended slider with ages from {} years old  to {} years old\n\n".format((current_percentage_min/percentage_per_year)+min_age_tinder,
               (current_percentage_max / percentage_per_year) + min_age_tinder))
-        time.sleep(5)
 
     def set_sexualitiy(self, type):
+        self._choose_sexuality(type)
+        time.sleep(5)
+
+    def _choose_sexuality(self, type):
         if not isinstance(type, Sexuality):
             assert False
 
@@ -187,7 +232,6 @@ class PreferencesHelper:
                 break
 
         print("clicked on " + type.value)
-        time.sleep(5)
 
     def set_global(self, boolean, language=None):
         # check if global is already activated
@@ -202,10 +246,7 @@ class PreferencesHelper:
         except:
             pass
 
-        if boolean != is_activated:
-            xpath = '//*[@name="global"]'
-            element = self.page.locator(xpath)
-            element.click()
+        self._toggle_global(boolean, is_activated)
 
         if is_activated and language:
             print("\nUnfortunately, Languages setting feature does not yet exist")
@@ -219,3 +260,9 @@ class PreferencesHelper:
             self.page.locator(xpath).all().click()
             '''
             time.sleep(5)
+
+    def _toggle_global(self, boolean, is_activated):
+        if boolean != is_activated:
+            xpath = '//*[@name="global"]'
+            element = self.page.locator(xpath)
+            element.click()
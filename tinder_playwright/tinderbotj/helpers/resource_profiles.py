@@ -0,0 +1,110 @@
+import base64
+from collections import Counter, namedtuple
+
+# block: resource types (or 'tracker') that are aborted
+# stub: resource types answered with an empty placeholder, for pages that wait for them to load
+ResourceProfile = namedtuple('ResourceProfile', ['name', 'block', 'stub'])
+
+PROFILES = {
+    # everything loads, like a normal browser
+    'full': ResourceProfile('full', block=frozenset(), stub=frozenset()),
+    # liking, disliking and reading geomatches: photo urls are read from the styles, so the photos needn't load
+    'swipe': ResourceProfile('swipe', block=frozenset({'media', 'font', 'tracker'}), stub=frozenset({'image'})),
+    # reading matches and sending messages: text only
+    'chat': ResourceProfile('chat', block=frozenset({'image', 'media', 'font', 'tracker'}), stub=frozenset()),
+}
+
+VIEWPORTS = {
+    'full': {"width": 1920, "height": 1080},
+    # still wide enough for the desktop layout with the match list next to the cards
+    'compact': {"width": 1280, "height": 720},
+}
+
+# never add arkoselabs.com: it serves the captcha of the login, which can't pass without it
+TRACKERS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "connect.facebook.net",
+    "branch.io", "app.link", "appsflyer.com", "hotjar.com", "segment.io", "amplitude.com",
+    "appboycdn.com", "braze.com", "sentry.io", "datadoghq",
+)
+
+# 1x1 transparent gif
+PIXEL = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# rough sizes of what is blocked, used when this session loaded nothing of that type to average over
+ESTIMATED_BYTES = {
+    'image': 60000,
+    'media': 500000,
+    'font': 40000,
+    'tracker': 30000,
+}
+
+
+class ResourceBlocker:
+    """
+    Aborts or stubs the requests a workload doesn't need, per ResourceProfile.
+
+    Every request of the browser context goes through ``route``, so attach it only
+    for a profile that blocks something. Blocked requests are counted by type, and
+    ``bytes_saved`` estimates what they would have cost from the average size of
+    what did load (or ESTIMATED_BYTES when nothing of that type loaded).
+    """
+
+    def __init__(self, profile):
+        self.profile = PROFILES[profile] if isinstance(profile, str) else profile
+        self.blocked = Counter()
+        self.stubbed = Counter()
+        self.loaded = Counter()
+        self.loaded_bytes = Counter()
+
+    def attach(self, context):
+        context.route("**/*", self.route)
+        context.on("response", self.on_response)
+
+    @staticmethod
+    def kind_of(url, resource_type):
+        if any(tracker in url for tracker in TRACKERS):
+            return 'tracker'
+        return resource_type
+
+    def route(self, route):
+        request = route.request
+        kind = self.kind_of(request.url, request.resource_type)
+        if kind in self.profile.block:
+            self.blocked[kind] += 1
+            route.abort("blockedbyclient")
+        elif kind in self.profile.stub:
+            self.stubbed[kind] += 1
+            route.fulfill(status=200, content_type="image/gif", body=PIXEL)
+        else:
+            route.continue_()
+
+    def on_response(self, response):
+        kind = self.kind_of(response.url, response.request.resource_type)
+        if kind in self.profile.stub:
+            # the placeholders, not what the page asked for
+            return
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            size = 0
+        self.loaded[kind] += 1
+        self.loaded_bytes[kind] += size
+
+    def average_bytes(self, kind):
+        if self.loaded[kind] and self.loaded_bytes[kind]:
+            return self.loaded_bytes[kind] / self.loaded[kind]
+        return ESTIMATED_BYTES.get(kind, 0)
+
+    def bytes_saved(self):
+        skipped = self.blocked + self.stubbed
+        return int(sum(count * self.average_bytes(kind) for kind, count in skipped.items()))
+
+    def summary(self):
+        """Lines for the session's statistics box."""
+        lines = ["resources: {}".format(self.profile.name)]
+        skipped = self.blocked + self.stubbed
+        for kind, count in skipped.most_common():
+            lines.append("skipped {}: {}".format(kind, count))
+        lines.append("bytes loaded: {:.1f} MB".format(sum(self.loaded_bytes.values()) / 1e6))
+        lines.append("bytes saved: ~{:.1f} MB".format(self.bytes_saved() / 1e6))
+        return lines
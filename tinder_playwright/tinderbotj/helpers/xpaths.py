@@ -1,3 +0,0 @@
-content = '/html/body/div[1]' #'//div[starts-with(@id, "q-")]'
-
-modal_manager = '/html/body/div[2]' #'//div[starts-with(@id, "q")]'
\ No newline at end of file
@@ -4,8 +4,8 @@ import os
 import platform
 import time
 import random
-import requests
 import atexit
+import json
 from pathlib import Path
 import subprocess
 import socket
@@ -15,19 +15,28 @@ from tinderbotj.helpers.geomatch import Geomatch
 from tinderbotj.helpers.match import Match
 from tinderbotj.helpers.profile_helper import ProfileHelper
 from tinderbotj.helpers.preferences_helper import PreferencesHelper
+from tinderbotj.helpers.preferences import Preferences
 from tinderbotj.helpers.geomatch_helper import GeomatchHelper
 from tinderbotj.helpers.match_helper import MatchHelper
 from tinderbotj.helpers.login_helper import LoginHelper
+from tinderbotj.helpers.backend import PlaywrightBackend
+from tinderbotj.helpers.waits import Waits
+from tinderbotj.helpers.login_state import LoginState, local_storage_script
+from tinderbotj.helpers.metrics import Metrics, measured
+from tinderbotj.helpers.match_capture import MatchCapture
+from tinderbotj.helpers.popup_resolver import PopupResolver
+from tinderbotj.helpers.resource_profiles import ResourceBlocker, VIEWPORTS
 from tinderbotj.helpers.storage_helper import StorageHelper
 from tinderbotj.helpers.email_helper import EmailHelper
 from tinderbotj.helpers.constants_helper import Printouts
-from tinderbotj.helpers.xpaths import *
 
 
 class Session:
     HOME_URL = "https://www.tinder.com/app/recs"
 
-    def __init__(self, headless=False, driver_path=None, store_session=True, proxy=None, user_data=False):
+    def __init__(self, headless=False, driver_path=None, store_session=True, proxy=None, user_data=False,
+                 login_ttl=LoginState.TTL, capture_matches=False, resources='full', viewport='full',
+                 fast_start=False, metrics_path="data/metrics.sqlite3"):
         self.email = None
         self.may_send_email = False
         self.session_data = {
@@ -44,8 +53,19 @@ class Session:
         self.context = None
         self.playwright = None
 
+        # MatchHelper is built on first use and then reused; a GeomatchHelper is built per action,
+        # as that is what takes the page back to /app/recs after a chat or match list action
+        self._helpers = {}
+
+        # Latency, outcome and retries of every action and browser call, kept in metrics_path (None: not kept)
+        self.metrics = Metrics(metrics_path, session=self.started) if metrics_path else None
+
         start_session = time.time()
 
+        # how long every startup phase took, in ms
+        self.startup_ms = {}
+        phase_started = time.perf_counter()
+
         # this function will run when the session ends
         @atexit.register
         def cleanup():
@@ -58,6 +78,18 @@ class Session:
             for key in self.session_data:
                 message = "{}: {}".format(key, self.session_data[key])
                 lines.append(message)
+            if hasattr(self, 'popup_resolver'):
+                for name, count in self.popup_resolver.counts.most_common():
+                    lines.append("popup {}: {}".format(name, count))
+            if self.metrics is not None:
+                lines.extend(self.metrics.summary())
+                try:
+                    # for node_exporter's textfile collector
+                    self.metrics.write_prometheus(os.path.splitext(self.metrics.path)[0] + ".prom")
+                finally:
+                    self.metrics.close()
+            if getattr(self, 'resource_blocker', None):
+                lines.extend(self.resource_blocker.summary())
 
             # print out the statistics of the session
             try:
@@ -70,30 +102,20 @@ class Session:
                 print("Ended session: {}".format(y))
 
                 # Close browser properly if it exists
-                if self.context:
-                    try:
-                        self.context.close()
-                    except:
-                        pass
-                if self.browser:
-                    try:
-                        self.browser.close()
-                    except:
-                        pass
-                if self.playwright:
-                    try:
-                        self.playwright.stop()
-                    except:
-                        pass
-
-        # Check network connectivity before attempting to download
-        if not self._check_network_connectivity():
-            print("WARNING: Network connectivity issues detected. Trying to proceed...")
-            # Try to fix DNS
-            self._try_fix_dns()
+                self.close()
+
+        # Check network connectivity before attempting to download;
+        # a fast start skips it, the first navigation fails clearly enough without it
+        if not fast_start:
+            if not self._check_network_connectivity():
+                print("WARNING: Network connectivity issues detected. Trying to proceed...")
+                # Try to fix DNS
+                self._try_fix_dns()
+            phase_started = self._time_phase("network check", phase_started)
 
         # Initialize Playwright
         self.playwright = sync_playwright().start()
+        phase_started = self._time_phase("playwright", phase_started)
 
         # Launch browser with appropriate options
         launch_options = {
@@ -127,36 +149,54 @@ class Session:
                     "server": f"http://{proxy}"
                 }
 
-        print("Getting ChromeDriver ...")
-        self.browser = self.playwright.chromium.launch(**launch_options)
-
         # Create context with user data if needed
         context_options = {
-            "viewport": {"width": 1920, "height": 1080},
+            "viewport": VIEWPORTS[viewport] if isinstance(viewport, str) else viewport,
             "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "locale": "en-US",
             "timezone_id": "America/New_York",
         }
 
-        if store_session:
-            if not user_data:
-                user_data = f"{Path().absolute()}/chrome_profile/"
-            if not os.path.isdir(user_data):
-                os.mkdir(user_data)
-
-            # Create persistent context
-            state_file = f"{user_data}/state.json"
-            if os.path.exists(state_file):
-                context_options["storage_state"] = state_file
-
-            self.context = self.browser.new_context(**context_options)
-            self.user_data_dir = user_data
+        if store_session and not user_data:
+            user_data = f"{Path().absolute()}/chrome_profile/"
+        if store_session and not os.path.isdir(user_data):
+            os.mkdir(user_data)
+        self.user_data_dir = user_data if store_session else None
+
+        if fast_start:
+            # The browser keeps cookies and storage in the profile directory itself, nothing to import;
+            # without store_session the profile is a temporary one
+            print("Starting Chromium ...")
+            profile_dir = f"{user_data}/browser" if store_session else ""
+            fresh_profile = not os.path.isdir(profile_dir) if store_session else False
+            self.context = self.playwright.chromium.launch_persistent_context(profile_dir, **launch_options,
+                                                                                **context_options)
+            phase_started = self._time_phase("browser", phase_started)
+
+            if fresh_profile:
+                self._import_storage_state(f"{user_data}/state.json")
         else:
+            print("Getting ChromeDriver ...")
+            self.browser = self.playwright.chromium.launch(**launch_options)
+            phase_started = self._time_phase("browser", phase_started)
+
+            if store_session:
+                # Create persistent context
+                state_file = f"{user_data}/state.json"
+                if os.path.exists(state_file):
+                    context_options["storage_state"] = state_file
             self.context = self.browser.new_context(**context_options)
-            self.user_data_dir = None
+            phase_started = self._time_phase("context", phase_started)
 
-        # Create a new page
-        self.page = self.context.new_page()
+        # Skip what the workload doesn't need: 'swipe' and 'chat' don't load photos, videos, fonts or trackers;
+        # 'full' doesn't route at all, routing every request costs a round trip
+        self.resource_blocker = None
+        if resources != 'full':
+            self.resource_blocker = ResourceBlocker(resources)
+            self.resource_blocker.attach(self.context)
+
+        # Create a new page; a persistent context opens with one already
+        self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
 
         # Add stealth scripts to avoid detection
         self.page.add_init_script("""
@@ -177,11 +217,82 @@ class Session:
             };
         """)
 
+        # the shared helpers run against this instead of the page directly
+        self.backend = PlaywrightBackend(self.page, metrics=self.metrics)
+        self.waits = Waits(self.backend)
+
+        # Known popups are looked up and dismissed in a single script evaluation
+        self.popup_resolver = PopupResolver(self.backend)
+
+        # Remember the login instead of reloading Tinder before every action;
+        # navigations to logged-out pages and unauthorized API calls invalidate it
+        self.login_state = LoginState(revalidate=self._revalidate_login, ttl=login_ttl)
+        self.page.on("framenavigated",
+                     lambda frame: frame == self.page.main_frame and self.login_state.on_navigation(frame.url))
+        self.page.on("response", lambda response: self.login_state.on_response(response.url, response.status))
+
+        # Keep the matches and messages the app loads from the API, to read them without scraping the page
+        self.match_capture = None
+        if capture_matches:
+            self.match_capture = MatchCapture()
+            self.match_capture.attach(self.page)
+
+        self._time_phase("page", phase_started)
+
         # Cool banner
         print(Printouts.BANNER.value)
-        time.sleep(1)
+        if not fast_start:
+            time.sleep(1)
+
+        print("Started session: {}".format(self.started))
+        print("Startup: {} (total {} ms)\n\n".format(
+            ", ".join("{} {} ms".format(phase, ms) for phase, ms in self.startup_ms.items()),
+            round(sum(self.startup_ms.values()), 1)))
 
-        print("Started session: {}\n\n".format(self.started))
+    def close(self):
+        """Close the browser now rather than when the program exits."""
+        if self.context:
+            try:
+                self.context.close()
+            except:
+                pass
+        if self.browser:
+            try:
+                self.browser.close()
+            except:
+                pass
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except:
+                pass
+        self.context = self.browser = self.playwright = None
+
+    def _time_phase(self, phase, started):
+        now = time.perf_counter()
+        self.startup_ms[phase] = round((now - started) * 1000, 1)
+        return now
+
+    def _import_storage_state(self, state_file):
+        # one-time move of what older sessions saved to state.json into the new browser profile
+        if not os.path.exists(state_file):
+            return
+        with open(state_file, "r", encoding="utf-8") as fp:
+            state = json.load(fp)
+
+        if state.get("cookies"):
+            self.context.add_cookies(state["cookies"])
+        # local storage can only be written from a page of its origin, so fill it in when one loads
+        for origin in state.get("origins", []):
+            self.context.add_init_script(local_storage_script(origin))
+        print("Imported {} into the browser profile".format(state_file))
+
+    def _helper(self, cls):
+        # built on first use, and again when the page was swapped (e.g. by the harness)
+        helper = self._helpers.get(cls)
+        if helper is None or helper.page is not self.page:
+            helper = self._helpers[cls] = cls(page=self.page, backend=self.backend)
+        return helper
 
     def _check_network_connectivity(self):
         """Check if we can resolve DNS and connect to the internet"""
@@ -229,21 +340,35 @@ class Session:
         self.may_send_email = boolean
 
     # NOTE: Need to be logged in for this
+    @measured('session.set_preferences')
+    def set_preferences(self, km=None, age_range=None, sexuality=None, global_mode=None, location=None):
+        """
+        Change several settings in one visit to the settings page; what's left out or already set is skipped.
+
+        age_range is a (min, max) tuple and location a (latitude, longitude) tuple.
+        Returns the settings that were changed.
+        """
+        if location is not None:
+            self.set_custom_location(*location)
+
+        min_age, max_age = age_range if age_range is not None else (None, None)
+        wanted = Preferences(km=km, min_age=min_age, max_age=max_age, sexuality=sexuality, global_mode=global_mode)
+        if wanted == Preferences():
+            return {}
+        helper = PreferencesHelper(page=self.page, backend=self.backend)
+        return helper.apply(wanted)
+
     def set_distance_range(self, km):
-        helper = PreferencesHelper(page=self.page)
-        helper.set_distance_range(km)
+        self.set_preferences(km=km)
 
     def set_age_range(self, min, max):
-        helper = PreferencesHelper(page=self.page)
-        helper.set_age_range(min, max)
+        self.set_preferences(age_range=(min, max))
 
     def set_sexuality(self, type):
-        helper = PreferencesHelper(page=self.page)
-        helper.set_sexualitiy(type)
+        self.set_preferences(sexuality=type)
 
     def set_global(self, boolean):
-        helper = PreferencesHelper(page=self.page)
-        helper.set_global(boolean)
+        self.set_preferences(global_mode=boolean)
 
     def set_bio(self, bio):
         helper = ProfileHelper(page=self.page)
@@ -259,7 +384,8 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(page=self.page, context=self.context)
             helper.login_by_google(email, password)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
@@ -269,7 +395,8 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(page=self.page, context=self.context)
             helper.login_by_facebook(email, password)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
@@ -278,11 +405,13 @@ class Session:
         if not self._is_logged_in():
             helper = LoginHelper(page=self.page, context=self.context)
             helper.login_by_sms(country, phone_number)
-            time.sleep(5)
+            # the app lands on /app/... once logged in
+            self.waits.url('session.login', '/app/', profile='login')
         if not self._is_logged_in():
             print('Manual interference is required.')
             input('press ENTER to continue')
 
+    @measured('session.store_local')
     def store_local(self, match):
         if isinstance(match, Match):
             filename = 'matches'
@@ -293,21 +422,21 @@ class Session:
             print("Crashing in 3.2.1... :)")
             assert False
 
-        # store its images
-        for url in match.image_urls:
-            hashed_image = StorageHelper.store_image_as(url=url, directory='data/{}/images'.format(filename))
-            match.images_by_hashes.append(hashed_image)
+        # store its images, all downloads at the same time
+        hashed_images = StorageHelper.store_images_as(urls=match.image_urls or [], directory='data/{}/images'.format(filename))
+        match.images_by_hashes.extend(hashed_image for hashed_image in hashed_images if hashed_image)
 
         # store its userdata
         StorageHelper.store_match(match=match, directory='data/{}'.format(filename), filename=filename)
 
+    @measured('session.like')
     def like(self, amount=1, ratio='100%', sleep=1, randomize_sleep = True):
 
         initial_sleep = sleep
         ratio = float(ratio.split('%')[0]) / 100
 
         if self._is_logged_in():
-            helper = GeomatchHelper(page=self.page)
+            helper = GeomatchHelper(page=self.page, backend=self.backend)
             amount_liked = 0
             # handle one time up front, from then on check after every action instead of before
             self._handle_potential_popups()
@@ -332,9 +461,10 @@ class Session:
 
             self._print_liked_stats()
 
+    @measured('session.dislike')
     def dislike(self, amount=1):
         if self._is_logged_in():
-            helper = GeomatchHelper(page=self.page)
+            helper = GeomatchHelper(page=self.page, backend=self.backend)
             for _ in range(amount):
                 self._handle_potential_popups()
                 helper.dislike()
@@ -344,9 +474,10 @@ class Session:
                 #time.sleep(1)
             self._print_liked_stats()
 
+    @measured('session.superlike')
     def superlike(self, amount=1):
         if self._is_logged_in():
-            helper = GeomatchHelper(page=self.page)
+            helper = GeomatchHelper(page=self.page, backend=self.backend)
             for _ in range(amount):
                 self._handle_potential_popups()
                 helper.superlike()
@@ -355,9 +486,10 @@ class Session:
                 time.sleep(1)
             self._print_liked_stats()
 
+    @measured('session.get_geomatch')
     def get_geomatch(self, quickload=True):
         if self._is_logged_in():
-            helper = GeomatchHelper(page=self.page)
+            helper = GeomatchHelper(page=self.page, backend=self.backend)
             self._handle_potential_popups()
 
             name = None
@@ -365,6 +497,8 @@ class Session:
             max_attempts = 3
             while not name and attempts < max_attempts:
                 attempts += 1
+                if attempts > 1 and self.metrics is not None:
+                    self.metrics.retry()
                 name = helper.get_name()
                 self._handle_potential_popups() # Popup handling on first geomatch
                 time.sleep(1)
@@ -384,166 +518,156 @@ class Session:
             return Geomatch(name=name, age=age, work=work, gender=gender, study=study, home=home, distance=distance,
                             bio=bio, passions=passions, lifestyle=lifestyle, basics=basics, anthem=anthem, looking_for=looking_for, image_urls=image_urls, instagram=instagram)
 
+    @measured('session.get_chat_ids')
     def get_chat_ids(self, new=True, messaged=True):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            capture = self._get_match_capture(new, messaged)
+            if capture is not None:
+                return capture.chat_ids(new, messaged)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             return helper.get_chat_ids(new, messaged)
 
-    def get_new_matches(self, amount=100000, quickload=True):
+    @measured('session.get_new_matches')
+    def get_new_matches(self, amount=100000, quickload=True, incremental=False):
+        # incremental: only the matches that showed up since the previous incremental call
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            store = StorageHelper.get_store(directory='data/matches', filename='matches') if incremental else None
+            capture = self._get_match_capture(new=True, messaged=False)
+            if capture is not None:
+                return self._get_captured_matches(capture, 'new', amount, store)
+
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
-            return helper.get_new_matches(amount, quickload)
+            return helper.get_new_matches(amount, quickload, store=store)
 
-    def get_messaged_matches(self, amount=100000, quickload=True):
+    @measured('session.get_messaged_matches')
+    def get_messaged_matches(self, amount=100000, quickload=True, incremental=False):
+        # incremental: only the matches that showed up since the previous incremental call
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            store = StorageHelper.get_store(directory='data/matches', filename='matches') if incremental else None
+            capture = self._get_match_capture(new=False, messaged=True)
+            if capture is not None:
+                return self._get_captured_matches(capture, 'messaged', amount, store)
+
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
-            return helper.get_messaged_matches(amount, quickload)
+            return helper.get_messaged_matches(amount, quickload, store=store)
 
+    @measured('session.get_messages')
+    def get_messages(self, chatid):
+        # needs capture_matches=True: the messages are only ever read from the API responses
+        if self.match_capture is None:
+            print("Reading messages needs a Session(capture_matches=True)")
+            return None
+        if self._is_logged_in():
+            if not self.match_capture.messages.get(chatid):
+                # opening the chat makes the app load its messages
+                self._helper(MatchHelper)._open_chat(chatid)
+                self._wait_for_capture(lambda: self.match_capture.messages.get(chatid))
+            return self.match_capture.get_messages(chatid)
+
+    def _get_match_capture(self, new=True, messaged=True):
+        # the captured matches once the app loaded the lists asked for, None to read them from the page instead
+        if self.match_capture is None:
+            return None
+        if not self.match_capture.has(new, messaged):
+            # the app loads the first page of both lists when it starts
+            self.page.goto(self.HOME_URL)
+            self._wait_for_capture(lambda: self.match_capture.has(new, messaged))
+        return self.match_capture if self.match_capture.has(new, messaged) else None
+
+    def _wait_for_capture(self, loaded, timeout=MatchHelper.delay):
+        deadline = time.time() + timeout
+        while not loaded() and time.time() < deadline:
+            # responses are only delivered while playwright is waiting on something
+            self.page.wait_for_timeout(100)
+
+    def _get_captured_matches(self, capture, list_name, amount, store=None):
+        chatids = capture.chat_ids(new=list_name == 'new', messaged=list_name == 'messaged')
+        if store is not None:
+            # the same seen-set as the list walk, so either picks up where the other stopped
+            seen = store.seen_chat_ids(list_name)
+            chatids = [chatid for chatid in chatids if chatid not in seen]
+        chatids = chatids[:amount]
+
+        matches = [capture.get_match(chatid) for chatid in chatids]
+        if store is not None:
+            store.mark_seen(chatids, list_name)
+        return matches
+
+    @measured('session.send_message')
     def send_message(self, chatid, message):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_message(chatid, message)
 
+    @measured('session.send_gif')
     def send_gif(self, chatid, gifname):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_gif(chatid, gifname)
 
+    @measured('session.send_song')
     def send_song(self, chatid, songname):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_song(chatid, songname)
 
+    @measured('session.send_socials')
     def send_socials(self, chatid, media):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.send_socials(chatid, media)
 
+    @measured('session.unmatch')
     def unmatch(self, chatid):
         if self._is_logged_in():
-            helper = MatchHelper(page=self.page)
+            helper = self._helper(MatchHelper)
             self._handle_potential_popups()
             helper.unmatch(chatid)
 
+    @measured('session.run_chat_actions')
+    def run_chat_actions(self, actions):
+        """
+        Run many chat actions in one go, e.g. [("send_message", chatid, "hey"), ("get_bio", chatid)].
+        The actions are grouped per chat, so each chat is opened once however the list is ordered.
+        """
+        if self._is_logged_in():
+            helper = self._helper(MatchHelper)
+            self._handle_potential_popups()
+            return helper.run_chat_operations(actions)
+
     # Utilities
+    @measured('session.popups')
     def _handle_potential_popups(self):
-        delay = 250  # milliseconds
-
-        # last possible id based div
-        try:
-            base_element = self.page.locator(modal_manager)
-        except:
+        popup = self.popup_resolver.resolve()
+        if popup is None:
             return None
 
-        # try to deny see who liked you
-        try:
-            xpath = './/main/div/div/div[3]/button[2]'
-            deny_btn = base_element.locator(xpath)
-            deny_btn.wait_for(timeout=delay, state="visible")
-            deny_btn.click()
-            return "POPUP: Denied see who liked you"
-        except:
-            pass
-
-        # Try to dismiss a potential 'upgrade like' popup
-        try:
-            xpath = './/main/div/button[2]'
-            base_element.locator(xpath).click(timeout=delay)
-            return "POPUP: Denied upgrade to superlike"
-        except:
-            pass
-
-        # try to deny 'add tinder to homescreen'
-        try:
-            xpath = './/main/div/div[2]/button[2]'
-            add_to_home_popup = base_element.locator(xpath)
-            add_to_home_popup.click(timeout=delay)
-            return "POPUP: Denied Tinder to homescreen"
-        except:
-            pass
-
-        # deny buying more superlikes
-        try:
-            xpath = './/main/div/div[3]/button[2]'
-            deny = base_element.locator(xpath)
-            deny.click(timeout=delay)
-            return "POPUP: Denied buying more superlikes"
-        except:
-            pass
-
-        # try to dismiss match
-        matched = False
-        try:
-            xpath = '//button[@title="Back to Tinder"]'
-            match_popup = base_element.locator(xpath)
-            match_popup.click(timeout=delay)
-            matched = True
-        except:
-            try:
-                matched = True
-                self.page.reload()
-            except:
-                pass
-
-        if matched and self.may_send_email:
+        if popup.name == 'new_match' and self.may_send_email:
             try:
                 EmailHelper.send_mail_match_found(self.email)
             except:
                 print("Some error occurred when trying to send mail.")
                 print("Consider opening an Issue on Github.")
                 pass
-            return "POPUP: Dismissed NEW MATCH"
 
-        # try to say 'no thanks' to buy more (super)likes
-        try:
-            xpath = './/main/div/div[3]/button[2]'
-            deny_btn = base_element.locator(xpath)
-            deny_btn.click(timeout=delay)
-            return "POPUP: Denied buying more superlikes"
-        except:
-            try:
-                self.page.reload()
-            except:
-                pass
-
-        # Deny confirmation of email
-        try:
-            xpath = './/main/div/div[1]/div[2]/button[2]'
-            remindmelater = base_element.locator(xpath)
-            remindmelater.click(timeout=delay)
-            time.sleep(3)
-            # handle other potential popups
-            self._handle_potential_popups()
-            return "POPUP: Deny confirmation of email"
-        except:
-            pass
-
-        # Deny add location popup
-        try:
-            xpath = ".//*[contains(text(), 'No Thanks')]"
-            nothanks = base_element.locator(xpath)
-            nothanks.click(timeout=delay)
-            time.sleep(3)
-            # handle other potential popups
-            self._handle_potential_popups()
-            return "POPUP: Deny confirmation of email"
-        except:
-            pass
-
-        return None
+        return popup.message
 
+    @measured('session.login_check', on_false='logged_out')
     def _is_logged_in(self):
+        # the probe gives None while the page is mid-navigation; the TTL decides then
+        return self.login_state.is_logged_in(probe=lambda: LoginState.probe(self.backend))
+
+    def _revalidate_login(self):
         try:
-            self.page.goto("https://tinder.com/app/recs")
-            self.page.wait_for_selector('//div[@id="content"]', timeout=5000)
-            return True
+            self.backend.navigate("https://tinder.com/app/recs")
+            return self.backend.wait('//div[@id="content"]', timeout=5)
         except:
             return False
 
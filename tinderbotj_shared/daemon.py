@@ -0,0 +1,305 @@
+'''
+Keeps one logged-in browser open and runs Session actions on a cron schedule.
+
+    python -m tinderbotj.daemon daemon.json
+
+The config (see daemon.example.json) names the jobs, each a public Session method with its
+arguments and a crontab schedule. Xvfb and the browser are started once and stay up between
+jobs; the browser is only restarted when a health check fails. Job status is served as JSON
+on http://127.0.0.1:<status_port>/status and the latency metrics on /metrics.
+'''
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tinderbotj.helpers.schedule import CronSchedule
+from tinderbotj.session import Session
+
+DEFAULTS = {
+    # None: use the display we were started on (or none, headless)
+    "display": ":99",
+    "screen": "1920x1080x16",
+    "status_port": 8765,
+    # seconds between health checks while no job runs
+    "health_interval": 300,
+    # "google" or "facebook", with the credentials in TINDER_EMAIL and TINDER_PASSWORD
+    "login": None,
+    "session": {},
+    "jobs": [],
+}
+
+
+class Job:
+
+    def __init__(self, name, schedule, action, args=None):
+        if action.startswith("_") or not callable(getattr(Session, action, None)):
+            raise ValueError("job '{}': Session has no action '{}'".format(name, action))
+
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.action = action
+        self.args = args or {}
+
+        self.next_run = self.schedule.next_after(datetime.now())
+        self.last_run = None
+        self.duration = None
+        self.status = "scheduled"
+        self.result = None
+        self.error = None
+        self.runs = 0
+        self.failures = 0
+
+    def status_dict(self):
+        return {
+            "schedule": self.schedule.expression,
+            "action": self.action,
+            "next_run": _timestamp(self.next_run),
+            "last_run": _timestamp(self.last_run),
+            "duration_s": self.duration,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+
+
+class Daemon:
+    """
+    Runs the jobs one after the other in the main thread, on a single warm Session.
+
+    Only the status server runs in a thread of its own; it reads a snapshot taken under
+    ``lock`` and the .prom file written after every job, never the Session or its metrics.
+    """
+
+    def __init__(self, config):
+        self.config = dict(DEFAULTS, **config)
+        self.jobs = [Job(**job) for job in self.config["jobs"]]
+        if not self.jobs:
+            raise ValueError("the config has no jobs")
+
+        self.session = None
+        self.xvfb = None
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+
+        self.started = datetime.now()
+        self.browser_starts = 0
+        self.health = {"ok": None, "checked": None, "failures": 0}
+        self.server = None
+
+    # the display and the browser
+
+    def _ensure_display(self):
+        display = self.config["display"]
+        if not display or self.config["session"].get("headless"):
+            return
+        if self.xvfb is not None and self.xvfb.poll() is None:
+            return
+        if self.xvfb is None and os.environ.get("DISPLAY") and os.environ["DISPLAY"] != display:
+            # started from a desktop or under xvfb-run
+            return
+        if shutil.which("Xvfb") is None:
+            raise RuntimeError("Xvfb is not installed (sudo apt-get install -y xvfb)")
+
+        print("Starting Xvfb on {}".format(display))
+        self.xvfb = subprocess.Popen(["Xvfb", display, "-screen", "0", self.config["screen"]],
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["DISPLAY"] = display
+        time.sleep(1)
+
+    def _start_session(self):
+        self._ensure_display()
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+        self.session = Session(**self.config["session"])
+        self.browser_starts += 1
+
+        login = self.config["login"]
+        if login and not self.session._is_logged_in():
+            email, password = os.getenv("TINDER_EMAIL"), os.getenv("TINDER_PASSWORD")
+            if login == "google":
+                self.session.login_using_google(email, password)
+            elif login == "facebook":
+                self.session.login_using_facebook(email, password)
+
+    def _healthy(self):
+        if self.session is None or self.session.backend is None:
+            return False
+        if self.xvfb is not None and self.xvfb.poll() is not None:
+            return False
+        try:
+            return self.session.backend.evaluate("() => document.readyState") in ("interactive", "complete")
+        except:
+            return False
+
+    def check_health(self):
+        """Restart the browser (and Xvfb) when it stopped responding; True when it had to."""
+        healthy = self._healthy()
+        with self.lock:
+            self.health["ok"] = healthy
+            self.health["checked"] = datetime.now()
+            if not healthy and self.session is not None:
+                self.health["failures"] += 1
+
+        if healthy:
+            return False
+        if self.session is not None:
+            print("Health check failed, restarting the browser")
+        self._start_session()
+        return True
+
+    # the jobs
+
+    def run_job(self, job):
+        with self.lock:
+            job.status = "running"
+            job.last_run = datetime.now()
+
+        started = time.perf_counter()
+        try:
+            result = getattr(self.session, job.action)(**job.args)
+            status, error = "ok", None
+        except Exception as e:
+            traceback.print_exc()
+            result, status, error = None, "failed", "{}: {}".format(type(e).__name__, e)
+
+        with self.lock:
+            job.duration = round(time.perf_counter() - started, 2)
+            job.status = status
+            job.error = error
+            job.result = _summarize(result)
+            job.runs += 1
+            job.failures += status == "failed"
+            job.next_run = job.schedule.next_after(datetime.now())
+
+        self._write_metrics()
+
+    def _write_metrics(self):
+        metrics = self.session.metrics if self.session is not None else None
+        if metrics is not None:
+            try:
+                metrics.write_prometheus(self.prom_path)
+            except:
+                pass
+
+    @property
+    def prom_path(self):
+        metrics_path = self.config["session"].get("metrics_path", "data/metrics.sqlite3")
+        return os.path.splitext(metrics_path)[0] + ".prom" if metrics_path else None
+
+    def run(self):
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
+        self._start_server()
+        try:
+            self.check_health()
+            last_check = time.monotonic()
+            while not self.stopping.is_set():
+                job = min(self.jobs, key=lambda job: job.next_run)
+                now = datetime.now()
+                if job.next_run > now:
+                    # wake up for the next job or the next health check, whichever comes first
+                    until_check = self.config["health_interval"] - (time.monotonic() - last_check)
+                    if self.stopping.wait(min((job.next_run - now).total_seconds(), max(until_check, 0))):
+                        break
+                    if job.next_run > datetime.now():
+                        self.check_health()
+                        last_check = time.monotonic()
+                    continue
+
+                self.check_health()
+                last_check = time.monotonic()
+                print("Running job '{}' ({})".format(job.name, job.action))
+                self.run_job(job)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+        if self.session is not None:
+            self.session.close()
+        if self.xvfb is not None:
+            self.xvfb.terminate()
+            self.xvfb = None
+
+    # the status endpoint
+
+    def status(self):
+        with self.lock:
+            return {
+                "started": _timestamp(self.started),
+                "pid": os.getpid(),
+                "browser_starts": self.browser_starts,
+                "health": {"ok": self.health["ok"], "checked": _timestamp(self.health["checked"]),
+                           "failures": self.health["failures"]},
+                "jobs": {job.name: job.status_dict() for job in self.jobs},
+            }
+
+    def _start_server(self):
+        port = self.config["status_port"]
+        if not port:
+            return
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == "/status":
+                    self._send(200, "application/json", json.dumps(daemon.status(), indent=2))
+                elif self.path == "/metrics" and daemon.prom_path and os.path.exists(daemon.prom_path):
+                    with open(daemon.prom_path, "r", encoding="utf-8") as fp:
+                        self._send(200, "text/plain; version=0.0.4", fp.read())
+                else:
+                    self._send(404, "text/plain", "not found\n")
+
+            def _send(self, code, content_type, body):
+                body = body.encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        # local only: the status shows what the account is doing
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), StatusHandler)
+        threading.Thread(target=self.server.serve_forever, name="status", daemon=True).start()
+        print("Job status on http://127.0.0.1:{}/status".format(port))
+
+
+def _timestamp(moment):
+    return moment.strftime("%Y-%m-%d %H:%M:%S") if moment else None
+
+
+def _summarize(result):
+    # what the status shows of a return value: matches are counted, not listed
+    if isinstance(result, (list, tuple, dict)):
+        return len(result)
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return result
+    return type(result).__name__
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m tinderbotj.daemon <config.json>")
+        sys.exit(1)
+
+    with open(sys.argv[1], "r", encoding="utf-8") as fp:
+        Daemon(json.load(fp)).run()
@@ -0,0 +1,197 @@
+# selenium and playwright are imported where they're used, each tree only installs one of them
+from tinderbotj.helpers.metrics import measured
+
+# Takes {xpath, attribute} and returns the text (or the attribute) of every node matching the xpath
+QUERY_JS = """
+(args) => {
+    const result = document.evaluate(args.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const values = [];
+    for (let i = 0; i < result.snapshotLength; i++) {
+        const node = result.snapshotItem(i);
+        values.push(args.attribute ? node.getAttribute(args.attribute) : node.textContent);
+    }
+    return values;
+}
+"""
+
+
+class Backend:
+    """
+    The handful of browser operations the shared helpers are written against.
+
+    The same helper code runs on Selenium and on Playwright through an adapter.
+    Scripts are the source of a JS function taking one argument, like
+    ``"(key) => window.localStorage.getItem(key)"``, and every adapter calls them
+    the same way. Timeouts are in seconds.
+    """
+
+    name = None
+
+    # a Metrics instance times every browser call when set (the Session passes its own)
+    metrics = None
+
+    @property
+    def url(self):
+        raise NotImplementedError
+
+    def navigate(self, url):
+        raise NotImplementedError
+
+    def reload(self):
+        raise NotImplementedError
+
+    def evaluate(self, script, arg=None):
+        raise NotImplementedError
+
+    def query(self, xpath, attribute=None):
+        """Text (or ``attribute``) of every element matching ``xpath``, in a single round trip."""
+        return self.evaluate(QUERY_JS, {'xpath': xpath, 'attribute': attribute})
+
+    def click(self, xpath):
+        raise NotImplementedError
+
+    def press(self, key):
+        """Press a key, named as in the DOM: 'ArrowRight', 'Enter', 'Escape', 'a', ..."""
+        raise NotImplementedError
+
+    def wait(self, xpath, timeout=5, visible=True):
+        """Wait for ``xpath`` to be visible (or just present); False once the timeout runs out."""
+        raise NotImplementedError
+
+    def wait_until(self, script, arg=None, timeout=5):
+        """Wait for ``script`` to return something truthy, polled inside the page; False once the timeout runs out."""
+        raise NotImplementedError
+
+    def cookies(self):
+        """Cookies of the current page, as dicts with at least 'name' and 'value'."""
+        raise NotImplementedError
+
+
+class PlaywrightBackend(Backend):
+    name = "playwright"
+
+    def __init__(self, page, metrics=None):
+        self.page = page
+        self.metrics = metrics
+
+    @property
+    def url(self):
+        return self.page.url
+
+    @measured('browser.navigate')
+    def navigate(self, url):
+        self.page.goto(url)
+
+    @measured('browser.reload')
+    def reload(self):
+        self.page.reload()
+
+    @measured('browser.evaluate')
+    def evaluate(self, script, arg=None):
+        return self.page.evaluate(script, arg)
+
+    @measured('browser.click')
+    def click(self, xpath):
+        self.page.locator(xpath).first.click()
+
+    @measured('browser.press')
+    def press(self, key):
+        self.page.keyboard.press(key)
+
+    @measured('browser.wait', on_false='timeout')
+    def wait(self, xpath, timeout=5, visible=True):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        try:
+            self.page.wait_for_selector(xpath, timeout=timeout * 1000, state='visible' if visible else 'attached')
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    @measured('browser.wait', on_false='timeout')
+    def wait_until(self, script, arg=None, timeout=5):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        try:
+            self.page.wait_for_function(script, arg=arg, timeout=timeout * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    @measured('browser.cookies')
+    def cookies(self):
+        return self.page.context.cookies()
+
+
+class SeleniumBackend(Backend):
+    name = "selenium"
+
+    # DOM key names -> selenium Keys attributes
+    KEYS = {
+        'ArrowUp': 'ARROW_UP',
+        'ArrowDown': 'ARROW_DOWN',
+        'ArrowLeft': 'ARROW_LEFT',
+        'ArrowRight': 'ARROW_RIGHT',
+        'Enter': 'ENTER',
+        'Escape': 'ESCAPE',
+        'Tab': 'TAB',
+        'Backspace': 'BACKSPACE',
+        'Space': 'SPACE',
+    }
+
+    def __init__(self, driver, metrics=None):
+        self.driver = driver
+        self.metrics = metrics
+
+    @property
+    def url(self):
+        return self.driver.current_url
+
+    @measured('browser.navigate')
+    def navigate(self, url):
+        self.driver.get(url)
+
+    @measured('browser.reload')
+    def reload(self):
+        self.driver.refresh()
+
+    @measured('browser.evaluate')
+    def evaluate(self, script, arg=None):
+        return self.driver.execute_script("return ({})(arguments[0]);".format(script), arg)
+
+    @measured('browser.click')
+    def click(self, xpath):
+        from selenium.webdriver.common.by import By
+        self.driver.find_element(By.XPATH, xpath).click()
+
+    @measured('browser.press')
+    def press(self, key):
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
+        ActionChains(self.driver).send_keys(getattr(Keys, self.KEYS[key]) if key in self.KEYS else key).perform()
+
+    @measured('browser.wait', on_false='timeout')
+    def wait(self, xpath, timeout=5, visible=True):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+        try:
+            WebDriverWait(self.driver, timeout).until(condition((By.XPATH, xpath)))
+            return True
+        except TimeoutException:
+            return False
+
+    @measured('browser.wait', on_false='timeout')
+    def wait_until(self, script, arg=None, timeout=5):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        try:
+            # webdriver can't wait inside the page, so this polls (every 0.1s) over the wire
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(lambda driver: self.evaluate(script, arg))
+            return True
+        except TimeoutException:
+            return False
+
+    @measured('browser.cookies')
+    def cookies(self):
+        return self.driver.get_cookies()
@@ -0,0 +1,139 @@
+from tinderbotj.helpers.storage_helper import StorageHelper
+
+class Geomatch:
+    """
+    Everything read from a profile. Fields are keyword-only, so they can't end up in the wrong place.
+
+    SCHEMA lists every field with its type, in the order of ``get_dictionary``;
+    columnar exports (see match_table.py) are laid out by it.
+    """
+
+    SCHEMA = (
+        ("name", "string"),
+        ("age", "int"),
+        ("work", "string"),
+        ("study", "string"),
+        ("home", "string"),
+        ("gender", "string"),
+        ("bio", "string"),
+        ("distance", "int"),
+        ("basics", "list<string>"),
+        ("lifestyle", "list<string>"),
+        ("passions", "list<string>"),
+        ("anthem", "struct<song,artist>"),
+        ("looking_for", "string"),
+        ("image_urls", "list<string>"),
+        ("images_by_hashes", "list<string>"),
+        ("instagram", "string"),
+        ("id", "string"),
+    )
+
+    FIELDS = tuple(field for field, _ in SCHEMA)
+
+    # no __dict__ per instance: a stored collection of thousands of profiles stays small
+    __slots__ = FIELDS
+
+    def __init__(self, *, name=None, age=None, work=None, study=None, home=None, gender=None, bio=None,
+                 lifestyle=None, basics=None, anthem=None, looking_for=None, distance=None, passions=None,
+                 image_urls=None, instagram=None, images_by_hashes=None, id=None):
+        self.name = name
+        self.age = age
+        self.work = work
+        self.study = study
+        self.home = home
+        self.gender = gender
+        self.passions = passions
+        self.bio = bio
+        self.lifestyle = lifestyle
+        self.basics = basics
+        self.anthem = anthem
+        self.looking_for = looking_for
+        self.distance = distance
+        self.image_urls = image_urls
+        self.instagram = instagram
+
+        # create a unique id for this person (or keep the one it was stored with)
+        self.id = id or "{}{}_{}".format(name, age, StorageHelper.id_generator(size=4))
+        self.images_by_hashes = images_by_hashes if images_by_hashes is not None else []
+
+    @classmethod
+    def from_dictionary(cls, data):
+        """Rebuild a (geo)match from what ``get_dictionary`` returned, e.g. a stored record; unknown keys are ignored."""
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    def __repr__(self):
+        return "{}(name={!r}, age={!r}, id={!r})".format(type(self).__name__, self.name, self.age, self.id)
+
+    def get_images_ai_data(self):
+        images_ai_data = []
+        for image in self.image_urls:
+            for image_ai_data in self._get_image_ai_data(image):
+                images_ai_data.append(image_ai_data)
+        return images_ai_data
+
+    def _get_image_ai_data(self, image_url):
+        from PIL import Image
+        from deepface import DeepFace
+        from io import BytesIO
+        import requests
+        import cv2
+        import numpy as np
+        resp = requests.get(image_url, stream=True).raw
+        image = np.asarray(bytearray(resp.read()), dtype="uint8")
+        image = cv2.imdecode(image, cv2.IMREAD_COLOR)
+        return DeepFace.analyze(image, enforce_detection=False)
+
+    def get_name(self):
+        return self.name
+
+    def get_age(self):
+        return self.age
+
+    def get_work(self):
+        return self.work
+
+    def get_study(self):
+        return self.study
+
+    def get_home(self):
+        return self.home
+
+    def get_gender(self):
+        return self.gender
+
+    def get_passions(self):
+        return self.passions
+
+    def get_bio(self):
+        return self.bio
+
+    def get_lifestyle(self):
+        return self.lifestyle
+
+    def get_basics(self):
+        return self.basics
+
+    def get_anthem(self):
+        return self.anthem
+
+    def get_looking_for(self):
+        return self.looking_for
+
+    def get_distance(self):
+        return self.distance
+
+    def get_image_urls(self):
+        return self.image_urls
+
+    def get_instagram(self):
+        return self.instagram
+
+    def get_id(self):
+        return self.id
+
+    def get_row(self):
+        """The values of every field, in SCHEMA order."""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def get_dictionary(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
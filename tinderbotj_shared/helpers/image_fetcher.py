@@ -0,0 +1,103 @@
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ImageFetcher:
+    """
+    Downloads images over a pool of keep-alive connections with bounded concurrency.
+
+    Failed downloads are retried with jittered exponential backoff inside the
+    pool's threads, so the caller only waits for the results it asks for.
+    """
+
+    max_workers = 8
+    max_attempts = 5
+    base_delay = 1.0  # seconds
+    max_delay = 30.0  # seconds
+    timeout = 20  # seconds
+    chunk_size = 64 * 1024  # bytes
+
+    # make 'undetectable' header to avoid being seen as scraper
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.11 (KHTML, like Gecko) Chrome/23.0.1271.64 Safari/537.11',
+        'Accept': 'image/avif,image/webp,image/*,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.8',
+        'Connection': 'keep-alive'}
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers=None, max_attempts=None):
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if max_attempts is not None:
+            self.max_attempts = max_attempts
+
+        self.http = requests.Session()
+        self.http.headers.update(self.HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='image-fetcher')
+
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def backoff(self, attempt):
+        # "full jitter": a random delay up to the exponential cap, so retries don't arrive in bursts
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def fetch(self, url):
+        """Return the body of ``url``, or None once every attempt failed."""
+        buffer = io.BytesIO()
+        return buffer.getvalue() if self.fetch_into(url, buffer) else None
+
+    def fetch_into(self, url, file):
+        """
+        Stream the body of ``url`` into ``file`` as it arrives; False once every attempt failed.
+
+        Every attempt starts with ``file.seek(0)`` and ``file.truncate()``, so a retry
+        never leaves a partial body behind.
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                file.seek(0)
+                file.truncate()
+                with self.http.get(url, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(self.chunk_size):
+                        file.write(chunk)
+                return True
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                # a missing or forbidden image won't appear by asking again
+                retryable = status is None or status >= 500 or status == 429
+                if not retryable or attempt + 1 == self.max_attempts:
+                    print("Giving up on {} after {} attempt(s): {}".format(url, attempt + 1, e))
+                    return False
+                delay = self.backoff(attempt)
+                print("Attempt number {} for {} failed, retrying in {:.1f} seconds ...".format(attempt + 1, url, delay))
+                time.sleep(delay)
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def map(self, fn, items):
+        """Run ``fn`` over ``items`` in the pool and return the results in order."""
+        futures = [self.executor.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.http.close()
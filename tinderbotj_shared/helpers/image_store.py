@@ -0,0 +1,165 @@
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from PIL import Image
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+# older versions stored every image flat in the root, named after the md5 of its decoded pixels
+LEGACY_NAME = re.compile(r"^[0-9a-f]{32}\.jpg$")
+
+
+class _HashingFile:
+    """Writes through to ``file`` and hashes what is written; truncating starts the hash over."""
+
+    def __init__(self, file):
+        self.file = file
+        self.truncate()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.file.seek(offset, whence)
+
+    def truncate(self):
+        self.sha256 = hashlib.sha256()
+        self.head = b''
+        return self.file.truncate(0)
+
+    def write(self, chunk):
+        if len(self.head) < len(JPEG_MAGIC):
+            self.head += chunk[:len(JPEG_MAGIC) - len(self.head)]
+        self.sha256.update(chunk)
+        return self.file.write(chunk)
+
+
+class ImageStore:
+    """
+    Content-addressed image directory: ``<root>/ab/cd/<sha256>.jpg``.
+
+    Images are decoded at most once, in memory: JPEGs are stored byte for byte
+    and anything else (WebP, PNG, ...) is transcoded to JPEG before it touches
+    the disk. Every file is written once, under the hash of its bytes, so the
+    same picture is stored once no matter how often it is seen. A small index
+    maps source urls to hashes, so known urls are never downloaded again.
+    JPEGs are hashed and written to disk as they download, never held in memory whole.
+    """
+
+    jpeg_quality = 90
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+        # the store is used from the image fetcher's threads
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, sha256 TEXT NOT NULL)")
+
+    def close(self):
+        self._index.close()
+
+    @staticmethod
+    def url_key(url):
+        # image urls carry expiring signatures in their query string; the path identifies the image
+        parts = urlsplit(url)
+        return "{}{}".format(parts.netloc, parts.path)
+
+    def path_of(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], "{}.jpg".format(sha256))
+
+    def lookup(self, url):
+        """Hash of an already stored url, or None."""
+        with self._lock:
+            row = self._index.execute("SELECT sha256 FROM urls WHERE url = ?", (self.url_key(url),)).fetchone()
+        if row and os.path.isfile(self.path_of(row[0])):
+            return row[0]
+        return None
+
+    def store(self, url, fetcher):
+        sha256 = self.lookup(url)
+        if sha256 is not None:
+            return sha256
+
+        try:
+            sha256 = self._download(url, fetcher)
+        except (OSError, Image.DecompressionBombError) as e:
+            print("Could not store image from {}: {}".format(url, e))
+            return None
+        if sha256 is None:
+            return None
+
+        with self._lock, self._index:
+            self._index.execute("INSERT OR REPLACE INTO urls (url, sha256) VALUES (?, ?)", (self.url_key(url), sha256))
+        return sha256
+
+    def _download(self, url, fetcher):
+        # the body streams into a temporary file while it's hashed; a JPEG is then only renamed
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.root)
+        try:
+            with os.fdopen(fd, 'w+b') as f:
+                download = _HashingFile(f)
+                if not fetcher.fetch_into(url, download):
+                    return None
+                if download.head != JPEG_MAGIC:
+                    f.seek(0)
+                    return self.store_bytes(f.read())
+            return self._place(temp_path, download.sha256.hexdigest())
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def store_bytes(self, content):
+        if not content.startswith(JPEG_MAGIC):
+            buffer = io.BytesIO()
+            with Image.open(io.BytesIO(content)) as im:
+                im.convert("RGB").save(buffer, "jpeg", quality=self.jpeg_quality)
+            content = buffer.getvalue()
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        if os.path.isfile(self.path_of(sha256)):
+            return sha256
+
+        # write under a unique name and rename, so readers never see half an image
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.root)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            return self._place(temp_path, sha256)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _place(self, temp_path, sha256):
+        # temp_path is in the root, on the same file system, so the rename is atomic
+        path = self.path_of(sha256)
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        return sha256
+
+    def legacy_files(self):
+        """Names of the images older versions stored flat in the root."""
+        return sorted(name for name in os.listdir(self.root) if LEGACY_NAME.match(name))
+
+    def import_legacy_files(self):
+        """
+        Store the flat images of older versions under their new hash; returns {old hash: new hash}.
+
+        The flat files stay: rewrite the records that refer to the old hashes first
+        (MatchStore.rehash_images), then call remove_legacy_files.
+        """
+        hashes = {}
+        for name in self.legacy_files():
+            with open(os.path.join(self.root, name), 'rb') as f:
+                hashes[name[:-len(".jpg")]] = self.store_bytes(f.read())
+        return hashes
+
+    def remove_legacy_files(self, hashes):
+        for old_hash in hashes:
+            os.remove(os.path.join(self.root, "{}.jpg".format(old_hash)))
@@ -0,0 +1,17 @@
+from tinderbotj.helpers.progress import Progress
+
+
+class LoadingBar(Progress):
+    """The old progress bar interface, kept for scripts using it; see Progress."""
+
+    def __init__(self, length_of_loop, explanation="", amount_of_bars=30):
+        self.length_of_loop = length_of_loop
+        self.explanation = explanation
+        self.amount_of_bars = amount_of_bars
+        super().__init__(length_of_loop, explanation, bars=amount_of_bars)
+
+    def update_loading(self, index):
+        # index is of the item just handled
+        self.advance(max(index + 1 - self.done, 0))
+        if self.done >= self.total:
+            self.finish()
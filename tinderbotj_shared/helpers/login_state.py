@@ -0,0 +1,117 @@
+import hashlib
+import json
+import time
+
+# Run in every page (as an init script), it fills in the local storage items of an origin that
+# aren't set yet once a page of that origin loads; local storage can't be written from anywhere else
+RESTORE_LOCAL_STORAGE_JS = """
+((origin, items) => {
+    if (location.origin !== origin) return;
+    for (const [name, value] of Object.entries(items)) {
+        if (localStorage.getItem(name) === null) localStorage.setItem(name, value);
+    }
+})"""
+
+
+def local_storage_script(origin):
+    """The init script restoring one origin of a saved storage state (Playwright's state.json format)."""
+    items = {item["name"]: item["value"] for item in origin.get("localStorage", [])}
+    return RESTORE_LOCAL_STORAGE_JS + "(" + json.dumps(origin["origin"]) + ", " + json.dumps(items) + ");"
+
+
+class LoginState:
+    """
+    Remembers whether the session is logged in, so actions don't reload Tinder to find out.
+
+    A successful check is trusted until the TTL runs out or something suggests
+    the login was lost: the auth cookies or the stored API token changed, the
+    browser navigated to a logged-out page or an API request came back 401.
+    Only then is the full (page navigation) check run again.
+    """
+
+    TTL = 300  # seconds
+
+    # Tinder web keeps its API token in localStorage
+    TOKEN_STORAGE_KEY = "TinderWeb/APIToken"
+
+    AUTH_COOKIE_HINTS = ("auth", "token", "session", "sid")
+    LOGGED_OUT_PATHS = ("/app/login", "/onboarding", "/auth")
+    API_HOST = "api.gotinder.com"
+
+    def __init__(self, revalidate, ttl=TTL, clock=time.monotonic):
+        self.revalidate = revalidate
+        self.ttl = ttl
+        self.clock = clock
+
+        self.logged_in = False
+        self.checked_at = None
+        self.fingerprint = None
+        self.last_invalidation = None
+
+        self.stats = {
+            "hits": 0,
+            "revalidations": 0,
+            "invalidations": 0,
+        }
+
+    @classmethod
+    def make_fingerprint(cls, cookies=(), token=None):
+        """
+        Hash of the auth cookies and API token; cookies are dicts as returned by Playwright and Selenium.
+        Returns "" when there are no credentials at all, so a logout is noticed as a change.
+        """
+        auth_cookies = sorted(
+            (cookie.get("name", ""), cookie.get("value", ""))
+            for cookie in cookies
+            if any(hint in cookie.get("name", "").lower() for hint in cls.AUTH_COOKIE_HINTS)
+        )
+        if not auth_cookies and not token:
+            return ""
+        return hashlib.sha1(repr((auth_cookies, token)).encode()).hexdigest()
+
+    @classmethod
+    def probe(cls, backend):
+        """Fingerprint of the credentials in the browser, or None when it can't tell (e.g. mid-navigation)."""
+        try:
+            token = backend.evaluate("(key) => window.localStorage.getItem(key)", cls.TOKEN_STORAGE_KEY)
+            return cls.make_fingerprint(backend.cookies(), token)
+        except Exception:
+            return None
+
+    def is_logged_in(self, probe=None, url=None):
+        # probe() and url are cheap looks at the browser: the credentials' fingerprint and the
+        # current url, None when they couldn't tell
+        if url is not None:
+            self.on_navigation(url)
+        fingerprint = probe() if probe is not None else None
+        if self.logged_in and fingerprint is not None:
+            if self.fingerprint is None:
+                # nothing to compare with yet: this becomes the baseline
+                self.fingerprint = fingerprint
+            elif fingerprint != self.fingerprint:
+                self.invalidate("auth cookies or token changed")
+
+        if self.logged_in and self.clock() - self.checked_at < self.ttl:
+            self.stats["hits"] += 1
+            return True
+
+        self.stats["revalidations"] += 1
+        self.logged_in = bool(self.revalidate())
+        self.checked_at = self.clock()
+        # the revalidation reloads the page, which may refresh the cookies or the token: probe again
+        self.fingerprint = probe() if self.logged_in and probe is not None else None
+        return self.logged_in
+
+    def invalidate(self, reason="invalidated"):
+        if self.logged_in:
+            self.stats["invalidations"] += 1
+            self.last_invalidation = reason
+        self.logged_in = False
+
+    def on_navigation(self, url):
+        if any(path in url for path in self.LOGGED_OUT_PATHS):
+            self.invalidate("navigated to {}".format(url))
+
+    def on_response(self, url, status):
+        if status == 401 and self.API_HOST in url:
+            self.invalidate("API request was unauthorized")
@@ -0,0 +1,18 @@
+from tinderbotj.helpers.geomatch import Geomatch
+
+# A match has the same information as a geomatch, except that you have a chatroom with an id
+class Match(Geomatch):
+
+    SCHEMA = Geomatch.SCHEMA + (("chatid", "string"),)
+    FIELDS = Geomatch.FIELDS + ("chatid",)
+
+    __slots__ = ("chatid",)
+
+    def __init__(self, *, chatid=None, **fields):
+        self.chatid = chatid
+
+        # invoking the __init__ of the parent class
+        Geomatch.__init__(self, **fields)
+
+    def get_chat_id(self):
+        return self.chatid
@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+import time
+
+
+class MatchStore:
+    """
+    SQLite store for (geo)matches, one row per person.
+
+    Matches are keyed by their chat id and geomatches by their generated id.
+    Inserts are upserts, so storing the same match again updates it instead of duplicating it.
+    It also remembers which chat ids a match list sync has already handed out, per list,
+    so the next sync can skip them.
+    The database runs in WAL mode, so every insert costs the same however many rows there are,
+    and a crash mid-write never leaves a half-written file behind.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS matches (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            name TEXT,
+            age INTEGER,
+            distance INTEGER,
+            home TEXT,
+            data TEXT NOT NULL,
+            stored_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS matches_kind_name ON matches (kind, name);
+        CREATE INDEX IF NOT EXISTS matches_kind_age ON matches (kind, age);
+        CREATE INDEX IF NOT EXISTS matches_kind_stored_at ON matches (kind, stored_at);
+        CREATE TABLE IF NOT EXISTS seen_chats (
+            list TEXT NOT NULL,
+            chatid TEXT NOT NULL,
+            seen_at REAL NOT NULL,
+            PRIMARY KEY (list, chatid)
+        );
+    """
+
+    UPSERT = """
+        INSERT INTO matches (key, kind, name, age, distance, home, data, stored_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET
+            kind = excluded.kind, name = excluded.name, age = excluded.age, distance = excluded.distance,
+            home = excluded.home, data = excluded.data, stored_at = excluded.stored_at
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # with WAL, NORMAL only risks losing the last commits on power loss, never corruption
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def key_of(match):
+        return match.get_chat_id() if hasattr(match, "get_chat_id") else match.get_id()
+
+    @staticmethod
+    def kind_of(match):
+        return "match" if hasattr(match, "get_chat_id") else "geomatch"
+
+    @classmethod
+    def _row(cls, key, kind, data):
+        return (key, kind, data.get("name"), data.get("age"), data.get("distance"), data.get("home"),
+                json.dumps(data), time.time())
+
+    def upsert(self, match):
+        self.upsert_many([match])
+
+    def upsert_many(self, matches):
+        """Store many (geo)matches in a single transaction."""
+        rows = [self._row(self.key_of(match), self.kind_of(match), match.get_dictionary()) for match in matches]
+        with self.connection:
+            self.connection.executemany(self.UPSERT, rows)
+        return len(rows)
+
+    def get(self, key):
+        row = self.connection.execute("SELECT data FROM matches WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __contains__(self, key):
+        return self.connection.execute("SELECT 1 FROM matches WHERE key = ?", (key,)).fetchone() is not None
+
+    def count(self, kind=None):
+        if kind is None:
+            return self.connection.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM matches WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def find(self, kind=None, name=None, min_age=None, max_age=None, max_distance=None, limit=None):
+        """Stored dictionaries matching every filter given, newest first."""
+        clauses, params = [], []
+        for clause, value in (("kind = ?", kind), ("name = ?", name), ("age >= ?", min_age),
+                              ("age <= ?", max_age), ("distance <= ?", max_distance)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        query = "SELECT data FROM matches"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY stored_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(data) for data, in self.connection.execute(query, params)]
+
+    def iter_records(self, kind=None):
+        """Every stored dictionary with its ``kind``, oldest first, read one row at a time."""
+        query = "SELECT key, kind, data FROM matches"
+        params = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        for key, row_kind, data in self.connection.execute(query + " ORDER BY stored_at", params):
+            record = json.loads(data)
+            record["kind"] = row_kind
+            record.setdefault("chatid" if row_kind == "match" else "id", key)
+            yield record
+
+    def seen_chat_ids(self, list_name):
+        return {chatid for chatid, in self.connection.execute("SELECT chatid FROM seen_chats WHERE list = ?",
+                                                                (list_name,))}
+
+    def mark_seen(self, chatids, list_name):
+        now = time.time()
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO seen_chats (list, chatid, seen_at) VALUES (?, ?, ?)",
+                                        [(list_name, chatid, now) for chatid in chatids])
+
+    def forget_seen(self, list_name=None):
+        """Start the next sync of ``list_name`` (or of every list) from scratch."""
+        with self.connection:
+            if list_name is None:
+                self.connection.execute("DELETE FROM seen_chats")
+            else:
+                self.connection.execute("DELETE FROM seen_chats WHERE list = ?", (list_name,))
+
+    def rehash_images(self, hashes):
+        """Replace the image hashes found in ``hashes`` ({old: new}) in every stored record; returns how many changed."""
+        rows = []
+        for key, data in self.connection.execute("SELECT key, data FROM matches"):
+            record = json.loads(data)
+            images = record.get("images_by_hashes") or []
+            if any(image in hashes for image in images):
+                record["images_by_hashes"] = [hashes.get(image, image) for image in images]
+                rows.append((json.dumps(record), key))
+        with self.connection:
+            self.connection.executemany("UPDATE matches SET data = ? WHERE key = ?", rows)
+        return len(rows)
+
+    def import_json(self, filepath, kind):
+        """One-time import of a matches.json/geomatches.json file written by the old StorageHelper."""
+        with open(filepath, "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+
+        rows = [self._row(record.get("chatid") or key, kind, record) for key, record in data.items()]
+        with self.connection:
+            self.connection.executemany(self.UPSERT, rows)
+        return len(rows)
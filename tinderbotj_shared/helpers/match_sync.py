@@ -0,0 +1,166 @@
+from collections import namedtuple
+
+MatchList = namedtuple('MatchList', ['name', 'tab', 'links', 'known_run'])
+
+# New matches are ordered by match date, newest on top, so everything below the first chat id
+# handed out before is known too. Messaged matches are ordered by last activity: a known chat
+# with a new message moves above chats never handed out, so only a run of known_run known
+# chat ids in a row (or the end of the list) ends a sync there.
+MATCH_LISTS = {
+    'new': MatchList('new', 'Matches', '(//div[@role="tabpanel"])[1]//div/div/a', 1),
+    'messaged': MatchList('messaged', 'Messages', '(//div[@class="messageList"])[1]//a', 10),
+}
+
+TABS = '//button[@role="tab"]'
+
+# Takes {xpath} and scrolls the list holding the first match to its end; returns how many links it holds
+SCROLL_TO_END_JS = """
+(args) => {
+    const links = document.evaluate(args.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    let node = links.snapshotLength ? links.snapshotItem(0).parentElement : null;
+    while (node && node.scrollHeight <= node.clientHeight) {
+        node = node.parentElement;
+    }
+    if (node) {
+        node.scrollTop = node.scrollHeight;
+    }
+    return links.snapshotLength;
+}
+"""
+
+# Takes {xpath, count} and is true once more than count elements match the xpath
+GREW_JS = """
+(args) => document.evaluate('count(' + args.xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue > args.count
+"""
+
+
+class MatchListSync:
+    """
+    Walks a match list from the top and hands out the chat ids that weren't handed out before.
+
+    With a MatchStore the chat ids handed out are remembered (per list) across runs and
+    skipped, and a sync stops once the list shows only known ones (see MATCH_LISTS), so a
+    refresh only reads and scrolls through what is new. Without one every chat id in the
+    list is new, once per sync.
+    The list is only scrolled once everything loaded has been handed out, and the sync
+    waits for the new entries to appear instead of sleeping.
+    """
+
+    HOME_URL = "https://tinder.com/app/recs"
+
+    def __init__(self, backend, store=None, delay=5, load_timeout=3):
+        self.backend = backend
+        self.store = store
+        self.delay = delay
+        self.load_timeout = load_timeout
+
+    def open(self, match_list):
+        # the tabs are missing on some pages (or while a chat loads); the home page always has them
+        if not self.backend.wait(TABS, timeout=self.delay, visible=False):
+            print("match tab could not be found, trying again")
+            self.backend.navigate(self.HOME_URL)
+            if not self.backend.wait(TABS, timeout=self.delay, visible=False):
+                return False
+        try:
+            self.backend.click('{}[.="{}"]'.format(TABS, match_list.tab))
+        except Exception:
+            return False
+        return self.backend.wait(match_list.links, timeout=self.delay, visible=False)
+
+    def chat_ids(self, match_list):
+        """Chat ids in the list as loaded right now, top first."""
+        chatids = []
+        for ref in self.backend.query(match_list.links, attribute='href'):
+            if not ref or "likes-you" in ref or "my-likes" in ref:
+                continue
+            chatids.append(ref.split('/')[-1])
+        return chatids
+
+    def load_more(self, match_list):
+        """Scroll to the end of the list; False when no more entries show up."""
+        count = self.backend.evaluate(SCROLL_TO_END_JS, {'xpath': match_list.links})
+        return self.backend.wait_until(GREW_JS, {'xpath': match_list.links, 'count': count},
+                                       timeout=self.load_timeout)
+
+    def known(self, name):
+        return self.store.seen_chat_ids(name) if self.store is not None else set()
+
+    def mark_seen(self, name, chatids):
+        if self.store is not None:
+            self.store.mark_seen(chatids, name)
+
+    def batches(self, name, amount):
+        """
+        Lists of chat ids not handed out before, top of the match list first, at most ``amount`` in total.
+
+        Every batch is what a pass over the loaded part of the list turned up; the list is
+        only scrolled when a pass turns up nothing new.
+        Call mark_seen for the chat ids once they're handled, so the next sync skips them.
+        """
+        match_list = MATCH_LISTS[name]
+        known = self.known(name)
+        handed_out = set()
+
+        while len(handed_out) < amount:
+            # handling a batch navigates away, so the list is reopened for every batch
+            if not self.open(match_list):
+                return
+
+            batch, reached_known = [], False
+            while not batch and not reached_known:
+                # every pass starts from the top, so a run of known chat ids carries on into what was scrolled in
+                run = 0
+                for chatid in self.chat_ids(match_list):
+                    if chatid in handed_out:
+                        continue
+                    if chatid in known:
+                        run += 1
+                        if run == match_list.known_run:
+                            reached_known = True
+                            break
+                        continue
+                    run = 0
+                    handed_out.add(chatid)
+                    batch.append(chatid)
+                    if len(handed_out) == amount:
+                        break
+
+                # everything loaded was handed out already: scroll for more, until it runs out
+                if not batch and not reached_known and not self.load_more(match_list):
+                    return
+
+            if batch:
+                yield batch
+            if reached_known:
+                return
+
+
+# Takes {xpath} and scrolls the element to its end; returns its scroll height
+SCROLL_ELEMENT_JS = """
+(args) => {
+    const element = document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!element) {
+        return null;
+    }
+    element.scrollTop = element.scrollHeight;
+    return element.scrollHeight;
+}
+"""
+
+# Takes {xpath, height} and is true once the element got taller than height
+TALLER_JS = """
+(args) => {
+    const element = document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return !element || element.scrollHeight > args.height;
+}
+"""
+
+
+def scroll_to_bottom(backend, xpath, timeout=3):
+    """Scroll the element until it stops growing, waiting for it to grow instead of polling its height."""
+    while True:
+        height = backend.evaluate(SCROLL_ELEMENT_JS, {'xpath': xpath})
+        if height is None:
+            return False
+        if not backend.wait_until(TALLER_JS, {'xpath': xpath, 'height': height}, timeout=timeout):
+            return True
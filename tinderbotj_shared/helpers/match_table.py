@@ -0,0 +1,153 @@
+'''
+Columnar export of stored (geo)matches, for analytics over the whole history.
+
+    python -m tinderbotj.helpers.match_table data/matches/matches.sqlite3 matches.parquet
+    python -m tinderbotj.helpers.match_table data/geomatches/geomatches.json geomatches.csv
+
+The columns are Match.SCHEMA plus ``kind`` ("match" or "geomatch"), so matches and
+geomatches share a layout. .parquet and .arrow/.feather files need pyarrow and keep the
+types; .csv is always available and gets a ``<file>.schema.json`` next to it with the
+column types, lists and the anthem are written as JSON in their cell.
+'''
+import csv
+import json
+import os
+import sys
+
+from tinderbotj.helpers.match import Match
+from tinderbotj.helpers.match_store import MatchStore
+
+COLUMNS = Match.SCHEMA + (("kind", "string"),)
+
+# rows per Arrow record batch, so exporting a large store never holds all of it in memory
+BATCH_SIZE = 10000
+
+
+def records_from_store(path, kind=None):
+    """Stored dictionaries of a MatchStore database, with their kind, oldest first."""
+    with MatchStore(path) as store:
+        for record in store.iter_records(kind):
+            yield record
+
+
+def records_from_json(path, kind=None):
+    """Records of a matches.json/geomatches.json file written by the old StorageHelper."""
+    if kind is None:
+        kind = "geomatch" if os.path.basename(path).startswith("geomatches") else "match"
+    with open(path, "r", encoding="utf-8") as fp:
+        data = json.load(fp)
+    for key, record in data.items():
+        record = dict(record, kind=kind)
+        if kind == "match":
+            record.setdefault("chatid", key)
+        else:
+            record.setdefault("id", key)
+        yield record
+
+
+def read_records(path, kind=None):
+    if path.endswith(".json"):
+        return records_from_json(path, kind)
+    return records_from_store(path, kind)
+
+
+def export(records, path, format=None):
+    """Write ``records`` (dictionaries) to ``path`` as parquet, arrow or csv (by its extension); returns the row count."""
+    format = format or os.path.splitext(path)[1].lstrip(".").lower()
+    if format in ("parquet", "arrow", "feather"):
+        return _write_arrow(records, path, format)
+    if format == "csv":
+        return _write_csv(records, path)
+    raise ValueError("Unknown export format '{}', use parquet, arrow or csv".format(format))
+
+
+def arrow_schema():
+    import pyarrow as pa
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "list<string>": pa.list_(pa.string()),
+        "struct<song,artist>": pa.struct([("song", pa.string()), ("artist", pa.string())]),
+    }
+    return pa.schema([(column, types[kind]) for column, kind in COLUMNS])
+
+
+def _batches(records):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_arrow(records, path, format):
+    import pyarrow as pa
+    schema = arrow_schema()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    rows = 0
+    try:
+        for batch in _batches(records):
+            arrays = [pa.array([_typed(record.get(column), kind) for record in batch], type=field.type)
+                      for (column, kind), field in zip(COLUMNS, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows
+
+
+def _write_csv(records, path):
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow([column for column, _ in COLUMNS])
+        for record in records:
+            writer.writerow([_cell(_typed(record.get(column), kind)) for column, kind in COLUMNS])
+            rows += 1
+
+    with open(path + ".schema.json", "w", encoding="utf-8") as fp:
+        json.dump({"columns": [{"name": column, "type": kind} for column, kind in COLUMNS],
+                   "encoding": "lists and structs are JSON, missing values are empty"}, fp, indent=2)
+    return rows
+
+
+def _typed(value, kind):
+    # older records hold ages and distances as text, and anthems and lists may be missing
+    if value is None:
+        return None
+    if kind == "int":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if kind == "list<string>":
+        return [str(item) for item in value] if isinstance(value, (list, tuple)) else None
+    if kind == "struct<song,artist>":
+        return {"song": value.get("song"), "artist": value.get("artist")} if isinstance(value, dict) else None
+    return str(value)
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python -m tinderbotj.helpers.match_table <store.sqlite3|matches.json> <out.parquet|out.arrow|out.csv> [match|geomatch]")
+        sys.exit(1)
+
+    source, target = sys.argv[1], sys.argv[2]
+    amount = export(read_records(source, sys.argv[3] if len(sys.argv) == 4 else None), target)
+    print("Exported {} records from {} to {}".format(amount, source, target))
@@ -0,0 +1,179 @@
+import functools
+import os
+import sqlite3
+import time
+from collections import defaultdict
+
+# upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Measurement:
+    """One timed call; the code being timed can count its retries and name its outcome."""
+
+    def __init__(self, action):
+        self.action = action
+        self.outcome = "ok"
+        self.retries = 0
+
+
+class Metrics:
+    """
+    Latency, outcome and retries of every instrumented call, kept as a time series in SQLite.
+
+    Samples are buffered and written in batches, so recording one costs next to nothing.
+    ``prometheus`` renders histograms over everything ever recorded, so the counters keep
+    growing across sessions like Prometheus expects; write them where node_exporter's
+    textfile collector picks them up to get them on a dashboard.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS samples (
+            ts REAL NOT NULL,
+            session TEXT,
+            action TEXT NOT NULL,
+            latency_ms REAL NOT NULL,
+            outcome TEXT NOT NULL,
+            retries INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS samples_action_ts ON samples (action, ts);
+    """
+
+    def __init__(self, path="data/metrics.sqlite3", session=None, flush_every=200, clock=time.time):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.session = session
+        self.flush_every = flush_every
+        self.clock = clock
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+        self.pending = []
+        self.active = []
+        # this session only: action -> [calls, total seconds, failures]
+        self.totals = defaultdict(lambda: [0, 0.0, 0])
+
+    def record(self, action, seconds, outcome="ok", retries=0):
+        self.pending.append((self.clock(), self.session, action, seconds * 1000, outcome, retries))
+        totals = self.totals[action]
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += outcome != "ok"
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def measure(self, action):
+        return _Timer(self, action)
+
+    def retry(self):
+        """Count a retry for the innermost call being measured."""
+        if self.active:
+            self.active[-1].retries += 1
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.connection:
+            self.connection.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def summary(self, top=8):
+        """Lines for the session's statistics box: where this session's time went."""
+        lines = []
+        for action, (calls, seconds, failures) in sorted(self.totals.items(), key=lambda item: -item[1][1])[:top]:
+            lines.append("{}: {} x, {:.1f}s, avg {:.0f} ms{}".format(
+                action, calls, seconds, seconds * 1000 / calls, ", {} failed".format(failures) if failures else ""))
+        return lines
+
+    def history(self, action, days=28):
+        """Per day: (day, calls, average ms, slowest ms, failures) of ``action``, oldest first."""
+        since = self.clock() - days * 86400
+        self.flush()
+        return self.connection.execute("""
+            SELECT date(ts, 'unixepoch', 'localtime') AS day, COUNT(*), ROUND(AVG(latency_ms), 1),
+                   ROUND(MAX(latency_ms), 1), SUM(outcome != 'ok')
+            FROM samples WHERE action = ? AND ts >= ? GROUP BY day ORDER BY day
+        """, (action, since)).fetchall()
+
+    def prometheus(self):
+        """Histograms of every sample recorded so far, in the Prometheus text format."""
+        self.flush()
+        buckets = ", ".join("SUM(latency_ms <= {})".format(bound * 1000) for bound in BUCKETS)
+        rows = self.connection.execute("""
+            SELECT action, outcome, COUNT(*), SUM(latency_ms), SUM(retries), {}
+            FROM samples GROUP BY action, outcome ORDER BY action, outcome
+        """.format(buckets)).fetchall()
+
+        lines = ["# HELP tinderbotj_action_seconds Latency of tinderbotj actions and browser calls.",
+                 "# TYPE tinderbotj_action_seconds histogram"]
+        for action, outcome, count, total_ms, retries, *counts in rows:
+            labels = 'action="{}",outcome="{}"'.format(_escape(action), _escape(outcome))
+            for bound, bucket_count in zip(BUCKETS, counts):
+                lines.append('tinderbotj_action_seconds_bucket{{{},le="{}"}} {}'.format(labels, bound, bucket_count))
+            lines.append('tinderbotj_action_seconds_bucket{{{},le="+Inf"}} {}'.format(labels, count))
+            lines.append("tinderbotj_action_seconds_sum{{{}}} {}".format(labels, round(total_ms / 1000, 6)))
+            lines.append("tinderbotj_action_seconds_count{{{}}} {}".format(labels, count))
+
+        lines += ["# HELP tinderbotj_action_retries_total Retries of tinderbotj actions.",
+                  "# TYPE tinderbotj_action_retries_total counter"]
+        for action, outcome, count, total_ms, retries, *counts in rows:
+            lines.append('tinderbotj_action_retries_total{{action="{}",outcome="{}"}} {}'.format(
+                _escape(action), _escape(outcome), retries))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path="data/metrics.prom"):
+        # written next to the file and renamed over it, so a scrape never reads half a file
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as fp:
+            fp.write(self.prometheus())
+        os.replace(temporary, path)
+
+
+class _Timer:
+
+    def __init__(self, metrics, action):
+        self.metrics = metrics
+        self.measurement = Measurement(action)
+
+    def __enter__(self):
+        self.metrics.active.append(self.measurement)
+        self.started = time.perf_counter()
+        return self.measurement
+
+    def __exit__(self, exc_type, exc, traceback):
+        seconds = time.perf_counter() - self.started
+        self.metrics.active.remove(self.measurement)
+        if exc_type is not None:
+            self.measurement.outcome = "error"
+        self.metrics.record(self.measurement.action, seconds, self.measurement.outcome, self.measurement.retries)
+        return False
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def measured(action, on_false=None):
+    """Times the method with ``self.metrics`` when that is set; ``on_false`` is the outcome when it returns False."""
+    def decorate(method):
+        @functools.wraps(method)
+        def measured_method(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            with self.metrics.measure(action) as measurement:
+                result = method(self, *args, **kwargs)
+                if result is False and on_false is not None:
+                    measurement.outcome = on_false
+                return result
+        return measured_method
+    return decorate
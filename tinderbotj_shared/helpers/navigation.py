@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+# the lists of the sidebar a chat can be in, in the order they're searched by default
+CHAT_TABS = ("Messages", "Matches")
+
+# MatchHelper methods that take a chatid first, and so can be queued with run_chat_operations
+CHAT_ACTIONS = ("send_message", "send_gif", "send_song", "send_socials", "unmatch",
+                "get_match", "get_profile_record", "get_name", "get_age", "get_row_data",
+                "get_passions", "get_bio", "get_image_urls")
+
+# Takes {xpath}: clicks the first element matching it (even when something covers it); false when there's none
+CLICK_JS = """
+(args) => {
+    const node = document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!node) return false;
+    node.click();
+    return true;
+}
+"""
+
+
+class ChatNavigator:
+    """
+    Remembers where the page is, so a chat is only navigated to when it isn't open already.
+
+    ``open_chat(chatid)`` is the helper's way of getting to a chat (clicking it in the sidebar).
+    The navigator only calls it when the url shows another route, and remembers the chat it
+    opened and the sidebar tab it was found in, so the next chat is looked for there first.
+    When the helper navigates on its own (home, a reload), it calls ``forget``.
+    """
+
+    def __init__(self, backend, open_chat):
+        self.backend = backend
+        self.open_chat = open_chat
+        self.route = None
+        self.chatid = None
+        self.tab = CHAT_TABS[0]
+        # how many opens navigated, and how many were skipped because the chat was open already
+        self.navigations = 0
+        self.coalesced = 0
+
+    def is_open(self, chatid):
+        self.route = urlparse(self.backend.url).path
+        # chats live at /app/messages/<chatid>
+        return self.route.rstrip('/').split('/')[-1] == chatid
+
+    def open(self, chatid):
+        """Open the chat of ``chatid`` unless it is already; True when that took a navigation."""
+        if self.is_open(chatid):
+            self.coalesced += 1
+            self.chatid = chatid
+            return False
+
+        metrics = self.backend.metrics
+        if metrics is None:
+            self.open_chat(chatid)
+            opened = self.is_open(chatid)
+        else:
+            with metrics.measure('navigation.open_chat') as measurement:
+                self.open_chat(chatid)
+                opened = self.is_open(chatid)
+                if not opened:
+                    measurement.outcome = 'not_found'
+        self.navigations += 1
+        self.chatid = chatid if opened else None
+        return True
+
+    def forget(self):
+        """The page went elsewhere: no chat is known to be open anymore."""
+        self.route = None
+        self.chatid = None
+
+    def found_in(self, tab):
+        self.tab = tab
+
+    def tabs(self):
+        """The sidebar tabs to look for a chat in, the one the previous chat was found in first."""
+        return (self.tab,) + tuple(tab for tab in CHAT_TABS if tab != self.tab)
+
+    @staticmethod
+    def plan(operations):
+        """
+        ``(index, operation)`` pairs of ``operations``, which are ``(action, chatid, *args)`` tuples,
+        grouped per chat: chats in the order they first show up, the operations of a chat in the order given.
+        """
+        chats = OrderedDict()
+        for index, operation in enumerate(operations):
+            action, chatid = operation[0], operation[1]
+            if action not in CHAT_ACTIONS:
+                raise ValueError("Unknown chat action '{}', use one of: {}".format(action, ", ".join(CHAT_ACTIONS)))
+            chats.setdefault(chatid, []).append((index, operation))
+        return [pair for pairs in chats.values() for pair in pairs]
@@ -0,0 +1,88 @@
+from collections import Counter, namedtuple
+
+from tinderbotj.helpers.waits import Waits
+from tinderbotj.helpers.xpaths import modal_manager
+
+# name: key used in the statistics
+# xpath: button that dismisses the popup, relative to the modal manager
+# message: what _handle_potential_popups reports
+# chained: the popup is known to be followed by another one, so wait for that one briefly and look again
+Popup = namedtuple('Popup', ['name', 'xpath', 'message', 'chained'])
+
+# In order of priority; the first visible one is dismissed
+POPUPS = [
+    Popup('see_who_liked_you', './/main/div/div/div[3]/button[2]', "POPUP: Denied see who liked you", False),
+    Popup('upgrade_like', './/main/div/button[2]', "POPUP: Denied upgrade to superlike", False),
+    Popup('add_to_homescreen', './/main/div/div[2]/button[2]', "POPUP: Denied Tinder to homescreen", False),
+    Popup('buy_superlikes', './/main/div/div[3]/button[2]', "POPUP: Denied buying more superlikes", False),
+    Popup('new_match', '//button[@title="Back to Tinder"]', "POPUP: Dismissed NEW MATCH", False),
+    Popup('confirm_email', './/main/div/div[1]/div[2]/button[2]', "POPUP: Deny confirmation of email", True),
+    Popup('add_location', ".//*[contains(text(), 'No Thanks')]", "POPUP: Deny add location", True),
+]
+
+# Takes {root, popups: [[name, xpath], ...]}, clicks the first visible popup button and returns its name
+RESOLVE_POPUP_JS = """
+(args) => {
+    const root = document.evaluate(args.root, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!root) return null;
+    for (const [name, xpath] of args.popups) {
+        const button = document.evaluate(xpath, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (button && button.getClientRects().length > 0) {
+            button.click();
+            return name;
+        }
+    }
+    return null;
+}
+"""
+
+# Takes {root, popups: [[name, xpath], ...], dismissed}: true once the button of the dismissed popup
+# is gone and a popup button is visible again
+POPUP_SHOWN_JS = """
+(args) => {
+    const root = document.evaluate(args.root, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!root) return false;
+    const visible = (xpath) => {
+        const button = document.evaluate(xpath, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return button !== null && button.getClientRects().length > 0;
+    };
+    return !visible(args.dismissed) && args.popups.some(([name, xpath]) => visible(xpath));
+}
+"""
+
+
+class PopupResolver:
+    """Dismisses known popups with one script evaluation per check, on any Backend."""
+
+    max_chain = 3
+
+    def __init__(self, backend, popups=POPUPS):
+        self.backend = backend
+        self.waits = Waits(backend)
+        self.popups = {popup.name: popup for popup in popups}
+        self.args = {'root': modal_manager, 'popups': [[popup.name, popup.xpath] for popup in popups]}
+        self.counts = Counter()
+        self.checks = 0
+
+    def resolve(self):
+        """Dismiss visible popups and return the last one dismissed, or None right away when there is none."""
+        dismissed = None
+        for _ in range(self.max_chain):
+            self.checks += 1
+            try:
+                name = self.backend.evaluate(RESOLVE_POPUP_JS, self.args)
+            except Exception:
+                # page is navigating; there is nothing to click yet
+                return dismissed
+            if name is None:
+                return dismissed
+
+            dismissed = self.popups[name]
+            self.counts[name] += 1
+            if not dismissed.chained:
+                return dismissed
+            # the next popup only animates in once this one closed, so looking right away would miss it
+            if not self.waits.script('popup.chained', POPUP_SHOWN_JS, dict(self.args, dismissed=dismissed.xpath),
+                                     profile='popup'):
+                return dismissed
+        return dismissed
@@ -0,0 +1,95 @@
+from typing import NamedTuple, Optional
+
+from tinderbotj.helpers.constants_helper import Sexuality
+
+# the distance slider covers 0-160 km (100 miles)
+MAX_DISTANCE_KM = 160
+
+XPATHS = {
+    'distance': ['//*[@aria-label="Maximum distance in kilometres"]',
+                 '//*[@aria-label="Maximum distance in kilometers"]',
+                 '//*[@aria-label="Maximum distance in miles"]'],
+    'min_age': '//*[@aria-label="Minimum age"]',
+    'max_age': '//*[@aria-label="Maximum age"]',
+    'sexuality': '//*[@href="/app/settings/gender"]/div/div/div/div',
+    # only shown while global is on
+    'global_languages': '//*[@href="/app/settings/global/languages"]/div',
+}
+
+# Takes {xpaths} and returns where every control on the profile settings stands, null for a missing one
+READ_PREFERENCES_JS = """
+(args) => {
+    const first = (xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    // sliders are positioned with a style like "left: 45.5%;"
+    const percentage = (node) => {
+        if (!node) return null;
+        const value = parseFloat((node.getAttribute('style') || '').split(' ')[1]);
+        return isNaN(value) ? null : value;
+    };
+
+    let distance = null;
+    for (const xpath of args.xpaths.distance) {
+        distance = first(xpath);
+        if (distance) break;
+    }
+    const minAge = first(args.xpaths.min_age);
+    const maxAge = first(args.xpaths.max_age);
+    const sexuality = first(args.xpaths.sexuality);
+    return {
+        distance: percentage(distance),
+        minAge: percentage(minAge),
+        maxAge: percentage(maxAge),
+        ageFloor: maxAge ? parseInt(maxAge.getAttribute('aria-valuemin')) : null,
+        ageCeiling: maxAge ? parseInt(maxAge.getAttribute('aria-valuemax')) : null,
+        sexuality: sexuality ? sexuality.textContent.trim() : null,
+        global: first(args.xpaths.global_languages) !== null,
+    };
+}
+"""
+
+
+class Preferences(NamedTuple):
+    """Discovery settings; None leaves a setting as it is (or, when read, means it couldn't be read)."""
+    km: Optional[int] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    sexuality: Optional[Sexuality] = None
+    global_mode: Optional[bool] = None
+
+
+def read_preferences(backend):
+    """The current settings, read in a single round trip; returns (Preferences, raw slider values)."""
+    raw = backend.evaluate(READ_PREFERENCES_JS, {'xpaths': XPATHS})
+
+    km = None
+    if raw['distance'] is not None:
+        km = int(round(raw['distance'] * MAX_DISTANCE_KM / 100))
+
+    min_age = max_age = None
+    if raw['ageFloor'] is not None and raw['ageCeiling'] is not None:
+        per_year = 100 / (raw['ageCeiling'] - raw['ageFloor'])
+        if raw['minAge'] is not None:
+            min_age = int(round(raw['minAge'] / per_year)) + raw['ageFloor']
+        if raw['maxAge'] is not None:
+            max_age = int(round(raw['maxAge'] / per_year)) + raw['ageFloor']
+
+    sexuality = next((member for member in Sexuality if member.value == raw['sexuality']), None)
+    return Preferences(km, min_age, max_age, sexuality, raw['global']), raw
+
+
+def changed_preferences(current, wanted):
+    """The settings of ``wanted`` that differ from ``current``, as a dict."""
+    changes = {}
+    for field, value in wanted._asdict().items():
+        if value is None:
+            continue
+        now = getattr(current, field)
+        if field == 'km':
+            # the slider moves in steps of about 1%, and clamps at both ends
+            value = min(max(value, 0), MAX_DISTANCE_KM)
+            if now is not None and abs(now - value) <= MAX_DISTANCE_KM / 100:
+                continue
+        elif now == value:
+            continue
+        changes[field] = value
+    return changes
@@ -0,0 +1,225 @@
+from typing import List, NamedTuple, Optional
+
+from tinderbotj.helpers.match import Match
+from tinderbotj.helpers.xpaths import content
+
+# Row icons on an opened profile, identified by their svg path
+_WORK_SVG_PATH = "M7.15 3.434h5.7V1.452a.728.728 0 0 0-.724-.732H7.874a.737.737 0 0 0-.725.732v1.982z"
+_STUDYING_SVG_PATH = "M11.87 5.026L2.186 9.242c-.25.116-.25.589 0 .705l.474.204v2.622a.78.78 0 0 0-.344.657c0 .42.313.767.69.767.378 0 .692-.348.692-.767a.78.78 0 0 0-.345-.657v-2.322l2.097.921a.42.42 0 0 0-.022.144v3.83c0 .45.27.801.626 1.101.358.302.842.572 1.428.804 1.172.46 2.755.776 4.516.776 1.763 0 3.346-.317 4.518-.777.586-.23 1.07-.501 1.428-.803.355-.3.626-.65.626-1.1v-3.83a.456.456 0 0 0-.022-.145l3.264-1.425c.25-.116.25-.59 0-.705L12.13 5.025c-.082-.046-.22-.017-.26 0v.001zm.13.767l8.743 3.804L12 13.392 3.257 9.599l8.742-3.806zm-5.88 5.865l5.75 2.502a.319.319 0 0 0 .26 0l5.75-2.502v3.687c0 .077-.087.262-.358.491-.372.29-.788.52-1.232.68-1.078.426-2.604.743-4.29.743s-3.212-.317-4.29-.742c-.444-.161-.86-.39-1.232-.68-.273-.23-.358-.415-.358-.492v-3.687z"
+_HOME_SVG_PATH = "M19.695 9.518H4.427V21.15h15.268V9.52zM3.109 9.482h17.933L12.06 3.709 3.11 9.482z"
+_LOCATION_SVG_PATH = "M11.436 21.17l-.185-.165a35.36 35.36 0 0 1-3.615-3.801C5.222 14.244 4 11.658 4 9.524 4 5.305 7.267 2 11.436 2c4.168 0 7.437 3.305 7.437 7.524 0 4.903-6.953 11.214-7.237 11.48l-.2.167zm0-18.683c-3.869 0-6.9 3.091-6.9 7.037 0 4.401 5.771 9.927 6.897 10.972 1.12-1.054 6.902-6.694 6.902-10.95.001-3.968-3.03-7.059-6.9-7.059h.001z"
+_LOCATION_SVG_PATH_2 = "M11.445 12.5a2.945 2.945 0 0 1-2.721-1.855 3.04 3.04 0 0 1 .641-3.269 2.905 2.905 0 0 1 3.213-.645 3.003 3.003 0 0 1 1.813 2.776c-.006 1.653-1.322 2.991-2.946 2.993zm0-5.544c-1.378 0-2.496 1.139-2.498 2.542 0 1.404 1.115 2.544 2.495 2.546a2.52 2.52 0 0 0 2.502-2.535 2.527 2.527 0 0 0-2.499-2.545v-.008z"
+_GENDER_SVG_PATH = "M15.507 13.032c1.14-.952 1.862-2.656 1.862-5.592C17.37 4.436 14.9 2 11.855 2 8.81 2 6.34 4.436 6.34 7.44c0 3.07.786 4.8 2.02 5.726-2.586 1.768-5.054 4.62-4.18 6.204 1.88 3.406 14.28 3.606 15.726 0 .686-1.71-1.828-4.608-4.4-6.338"
+
+# svg path -> field, looked up in the browser so rows never cross the wire one by one
+SVG_FIELDS = {
+    _WORK_SVG_PATH: 'work',
+    _STUDYING_SVG_PATH: 'study',
+    _HOME_SVG_PATH: 'home',
+    _GENDER_SVG_PATH: 'gender',
+    _LOCATION_SVG_PATH: 'distance',
+    _LOCATION_SVG_PATH_2: 'distance',
+}
+
+_PROFILE = f'{content}/div/div[1]/div/main/div[1]/div/div/div/div[2]/div/div[1]/div/div/div[2]'
+
+XPATHS = {
+    'name': f'{_PROFILE}/div[1]/div/div[1]/div[1]/h1',
+    'age': f'{_PROFILE}/div[1]/div/div[1]/span',
+    'bio': f'{_PROFILE}/div[2]/div',
+    'passions': f'{_PROFILE}/div/div/div[2]/div[2]/div',
+    'rows': '//div[@class="Row"]',
+    'images': "//div[@aria-label='Profile slider']",
+    # one per photo, missing when there's a single photo
+    'bullets': "//*[contains(concat(' ', normalize-space(@class), ' '), ' bullet ')]",
+}
+
+# Takes {images, bullets} xpaths and returns {urls, expected}: the url of every photo of the opened profile
+# that can be read without clicking through the slider, and how many photos the slider has.
+# The photos React renders the slider from are used when they can be found, otherwise whatever the
+# slides and bullets already hold: backgrounds, data attributes, <img>/<source> srcsets and preloaded images.
+EXTRACT_IMAGES_JS = """
+(args) => {
+    const all = (xpath) => {
+        const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    };
+    const add = (urls, url) => {
+        if (!url) return;
+        try {
+            url = new URL(url, document.baseURI).href;
+        } catch (e) {
+            return;
+        }
+        if (/^https?:/.test(url) && !urls.includes(url)) urls.push(url);
+    };
+    const cssUrl = (value) => {
+        const match = /url\\(["']?([^"')]+)["']?\\)/.exec(value || '');
+        return match ? match[1] : null;
+    };
+    // "a.jpg 320w, b.jpg 640w" -> b.jpg
+    const widest = (srcset) => {
+        let best = null, bestWidth = -1;
+        for (const candidate of (srcset || '').split(',')) {
+            const [url, width] = candidate.trim().split(/\\s+/);
+            const size = parseFloat(width) || 0;
+            if (url && size > bestWidth) { best = url; bestWidth = size; }
+        }
+        return best;
+    };
+
+    const slides = all(args.images);
+    const bullets = all(args.bullets);
+    const expected = slides.length ? Math.max(bullets.length, 1) : 0;
+
+    // the props of the components above the slider hold the photos as [{url, ...}, ...]
+    const photosIn = (props) => {
+        for (const value of Object.values(props || {})) {
+            const photos = Array.isArray(value) ? value : (value && Array.isArray(value.photos) ? value.photos : null);
+            if (photos && photos.length && photos.every((photo) => photo && typeof photo.url === 'string')) {
+                return photos.map((photo) => photo.url);
+            }
+        }
+        return null;
+    };
+    const fromState = [];
+    if (slides.length) {
+        const key = Object.keys(slides[0]).find((name) => name.startsWith('__reactFiber') || name.startsWith('__reactInternalInstance'));
+        let fiber = key ? slides[0][key] : null;
+        for (let depth = 0; fiber && depth < 40; depth++, fiber = fiber.return) {
+            const photos = photosIn(fiber.memoizedProps);
+            if (photos) {
+                photos.forEach((url) => add(fromState, url));
+                break;
+            }
+        }
+    }
+
+    const fromPage = [];
+    for (const slide of slides.concat(bullets)) {
+        add(fromPage, cssUrl(window.getComputedStyle(slide).backgroundImage));
+        add(fromPage, cssUrl(slide.getAttribute('style')));
+        for (const name of ['data-image', 'data-src', 'data-background-image', 'data-bg']) {
+            const value = slide.getAttribute(name);
+            add(fromPage, cssUrl(value) || value);
+        }
+        for (const image of slide.querySelectorAll('img')) {
+            add(fromPage, widest(image.getAttribute('srcset')) || image.currentSrc || image.getAttribute('src'));
+        }
+        for (const source of slide.querySelectorAll('source[srcset]')) add(fromPage, widest(source.getAttribute('srcset')));
+    }
+    // slides that aren't shown yet are often only preloaded
+    if (fromPage.length < expected) {
+        for (const link of document.querySelectorAll('link[rel="preload"][as="image"]')) {
+            const url = link.getAttribute('href') || widest(link.getAttribute('imagesrcset'));
+            if (url && url.includes('gotinder.com')) add(fromPage, url);
+        }
+    }
+
+    return {urls: fromState.length >= fromPage.length ? fromState : fromPage, expected: expected};
+}
+"""
+
+EXTRACT_IMAGES_ARGS = {'images': XPATHS['images'], 'bullets': XPATHS['bullets']}
+
+# Takes {xpaths, svgFields} and returns every raw field of the opened profile
+EXTRACT_PROFILE_JS = """
+(args) => {
+    const all = (xpath, root) => {
+        const result = document.evaluate(xpath, root || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    };
+    const first = (xpath, root) => all(xpath, root)[0] || null;
+    const text = (xpath) => { const node = first(xpath); return node ? node.textContent : null; };
+
+    const rows = {};
+    for (const row of all(args.xpaths.rows)) {
+        const icon = first(".//*[starts-with(@d, 'M')]", row);
+        const value = first('.//div[2]', row);
+        const field = icon && args.svgFields[icon.getAttribute('d')];
+        if (field && value) rows[field] = value.textContent;
+    }
+
+    const imageUrls = [];
+    for (const slide of all(args.xpaths.images)) {
+        const url = window.getComputedStyle(slide).backgroundImage.split('"')[1];
+        if (url && !imageUrls.includes(url)) imageUrls.push(url);
+    }
+
+    return {
+        name: text(args.xpaths.name),
+        age: text(args.xpaths.age),
+        bio: text(args.xpaths.bio),
+        passions: all(args.xpaths.passions).map((node) => node.textContent),
+        rows: rows,
+        image_urls: imageUrls,
+    };
+}
+"""
+
+EXTRACT_PROFILE_ARGS = {'xpaths': XPATHS, 'svgFields': SVG_FIELDS}
+
+
+def read_image_urls(backend):
+    """
+    The photo urls of the opened profile that can be read in a single script evaluation, and whether
+    that's all of them; when it isn't (or the script fails), the rest is only found by clicking through the slider.
+    """
+    try:
+        raw = backend.evaluate(EXTRACT_IMAGES_JS, EXTRACT_IMAGES_ARGS)
+    except:
+        return [], False
+    return raw['urls'], len(raw['urls']) >= raw['expected']
+
+
+def read_profile(backend, timeout=5):
+    """Every field of the opened profile, read in a single script evaluation once its name shows up."""
+    backend.wait(XPATHS['name'], timeout=timeout, visible=False)
+    return ProfileRecord.from_raw(backend.evaluate(EXTRACT_PROFILE_JS, EXTRACT_PROFILE_ARGS))
+
+
+class ProfileRecord(NamedTuple):
+    name: Optional[str]
+    age: Optional[int]
+    work: Optional[str]
+    study: Optional[str]
+    home: Optional[str]
+    gender: Optional[str]
+    distance: Optional[int]
+    bio: Optional[str]
+    passions: List[str]
+    image_urls: List[str]
+
+    @classmethod
+    def from_raw(cls, raw):
+        rows = raw.get('rows') or {}
+
+        try:
+            age = int(raw.get('age'))
+        except (TypeError, ValueError):
+            age = None
+
+        home = rows.get('home')
+        if home is not None:
+            home = home.split(' ')[-1]
+
+        distance = rows.get('distance')
+        if distance is not None:
+            try:
+                distance = int(distance.split(' ')[0])
+            except ValueError:
+                # e.g. 'Less than 1 km away'
+                distance = None
+
+        return cls(name=raw.get('name'), age=age, work=rows.get('work'), study=rows.get('study'), home=home,
+                   gender=rows.get('gender'), distance=distance, bio=raw.get('bio'),
+                   passions=raw.get('passions') or [], image_urls=raw.get('image_urls') or [])
+
+    def to_match(self, chatid):
+        return Match(name=self.name, chatid=chatid, age=self.age, work=self.work, study=self.study, home=self.home,
+                     gender=self.gender, distance=self.distance, bio=self.bio, passions=self.passions,
+                     image_urls=self.image_urls)
@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+
+class EventLog:
+    """
+    Structured events as JSON lines, one object per line, for other tools to tail.
+
+    Every line has ``ts`` (unix time), ``event`` and the fields given to ``emit``.
+    ``shared`` writes to the file named by the TINDERBOTJ_EVENTS environment variable,
+    and is None when it isn't set.
+    """
+
+    ENV = "TINDERBOTJ_EVENTS"
+    _shared = False
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        # line buffered: every event is on disk once emit returns
+        self.fp = open(path, "a", encoding="utf-8", buffering=1)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is False:
+            path = os.getenv(cls.ENV)
+            cls._shared = cls(path) if path else None
+        return cls._shared
+
+    def emit(self, event, **fields):
+        line = json.dumps(dict(ts=round(time.time(), 3), event=event, **fields), default=str)
+        with self.lock:
+            self.fp.write(line + "\n")
+
+    def close(self):
+        self.fp.close()
+
+
+class Progress:
+    """
+    Progress of a loop, reported without ever blocking it.
+
+    ``advance`` only counts; the bar is redrawn at most every ``interval`` seconds
+    (and once more when the loop is done), so a fast loop isn't slowed down by its
+    own output. Throughput and ETA come from a moving average over the last
+    ``window`` steps. With an EventLog every step is also emitted as a structured
+    event, along with the start and the end of the loop. Safe to advance from
+    several threads.
+    """
+
+    def __init__(self, total, description="", events=None, interval=None, stream=None, window=20,
+                 bars=30, clock=time.monotonic):
+        self.total = total
+        self.description = description
+        self.events = events if events is not None else EventLog.shared()
+        self.stream = stream or sys.stdout
+        self.interactive = getattr(self.stream, "isatty", lambda: False)()
+        # a redrawn line costs nothing on a terminal, but every line stays in a log file
+        self.interval = interval if interval is not None else (0.25 if self.interactive else 10)
+        self.bars = bars
+        self.clock = clock
+
+        self.done = 0
+        self.failed = 0
+        self.started = clock()
+        self.steps = deque([(self.started, 0)], maxlen=window + 1)
+        self.rendered = None
+        self.rendered_done = None
+        self.width = 0
+        self.finished = False
+        self.lock = threading.Lock()
+
+        self._emit("progress.start", total=total)
+        self._render(self.started)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.finish(error=None if exc is None else "{}: {}".format(type(exc).__name__, exc))
+        return False
+
+    def advance(self, count=1, ok=True, **fields):
+        """Count ``count`` more items done; ``fields`` are added to the step's event."""
+        with self.lock:
+            now = self.clock()
+            self.done += count
+            self.failed += not ok
+            self.steps.append((now, self.done))
+            self._emit("progress.step", done=self.done, total=self.total, ok=ok, **fields)
+            if self.done >= self.total or self.rendered is None or now - self.rendered >= self.interval:
+                self._render(now)
+
+    def rate(self):
+        """Items per second over the moving window, None before two steps."""
+        (first, first_done), (last, last_done) = self.steps[0], self.steps[-1]
+        if last_done == first_done or last <= first:
+            return None
+        return (last_done - first_done) / (last - first)
+
+    def eta(self):
+        """Seconds left at the current rate, None while unknown."""
+        rate = self.rate()
+        if rate is None:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def finish(self, error=None):
+        with self.lock:
+            if self.finished:
+                return
+            self.finished = True
+            now = self.clock()
+            if self.rendered_done != self.done:
+                self._render(now)
+            if self.interactive:
+                self.stream.write("\n")
+                self.stream.flush()
+            self._emit("progress.end", done=self.done, total=self.total, failed=self.failed,
+                       seconds=round(now - self.started, 3), error=error)
+
+    def _emit(self, event, **fields):
+        if self.events is not None:
+            self.events.emit(event, description=self.description, **fields)
+
+    def _render(self, now):
+        self.rendered = now
+        self.rendered_done = self.done
+        percentage = 100 if self.total == 0 else min(int(self.done * 100 / self.total), 100)
+        equals = int(percentage / 100 * self.bars)
+        minus = max(self.bars - equals - 1, 0)
+
+        rate, eta = self.rate(), self.eta()
+        # [===>----] 45% of the new matches handled (9/20, 1.8/s, ETA 0:06)
+        line = "[{}>{}] {}% of the {} handled ({}/{}{}{})".format(
+            '=' * equals, '-' * minus, percentage, self.description, self.done, self.total,
+            ", {:.1f}/s".format(rate) if rate is not None else "",
+            ", ETA {}".format(_duration(eta)) if eta is not None and self.done < self.total else "")
+        if self.interactive:
+            # pad over what's left of a longer previous line
+            self.stream.write("\r" + line.ljust(self.width))
+            self.width = len(line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+def _duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "{}:{:02d}:{:02d}".format(hours, minutes, seconds) if hours else "{}:{:02d}".format(minutes, seconds)
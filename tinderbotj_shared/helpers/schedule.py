@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+
+class CronSchedule:
+    """
+    A crontab time specification: "minute hour day-of-month month day-of-week".
+
+    Fields take ``*``, numbers, ranges (``1-5``), lists (``1,15``) and steps (``*/15``,
+    ``8-20/2``). Day of week runs from 0 (Sunday) to 6, 7 is Sunday too. Like cron, when
+    both day fields are restricted a day matching either of them runs.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+    NAMES = ("minute", "hour", "day of month", "month", "day of week")
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError("'{}' should have 5 fields: minute hour day-of-month month day-of-week".format(expression))
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse(field, low, high, name) for field, (low, high), name in zip(fields, self.RANGES, self.NAMES))
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def __repr__(self):
+        return "CronSchedule('{}')".format(self.expression)
+
+    @staticmethod
+    def _parse(field, low, high, name):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/", 1)
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = int(part)
+                # "5/15" is every 15 starting at 5
+                end = high if step != 1 else start
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError("'{}' is not a valid {} (allowed {}-{})".format(field, name, low, high))
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def matches_day(self, moment):
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment):
+        """The first minute after ``moment`` (a datetime) the schedule runs at."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # every schedule runs within 4 years (29 February on a given weekday takes longest)
+        limit = candidate + timedelta(days=4 * 366 + 7)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self.matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError("'{}' never runs".format(self.expression))
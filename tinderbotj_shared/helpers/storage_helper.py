@@ -0,0 +1,110 @@
+import string
+import random
+import os
+
+from tinderbotj.helpers.match_store import MatchStore
+from tinderbotj.helpers.progress import EventLog, Progress
+
+# ImageFetcher (requests) and ImageStore (Pillow) are imported on first use, most sessions never store an image
+
+
+class StorageHelper:
+
+    @staticmethod
+    def id_generator(size=6, chars=string.ascii_uppercase + string.digits):
+        return ''.join(random.choice(chars) for _ in range(size))
+
+    # open image stores by directory
+    _image_stores = {}
+
+    @staticmethod
+    def get_image_store(directory):
+        store = StorageHelper._image_stores.get(directory)
+        if store is None:
+            from tinderbotj.helpers.image_store import ImageStore
+            store = StorageHelper._image_stores.setdefault(directory, ImageStore(directory))
+        return store
+
+    # Returns hash value of the image saved by the url given
+    @staticmethod
+    def store_image_as(url, directory, fetcher=None):
+        from tinderbotj.helpers.image_fetcher import ImageFetcher
+        store = StorageHelper.get_image_store(directory)
+        hashvalue = store.store(url, fetcher or ImageFetcher.shared())
+        if hashvalue is not None:
+            print("Image saved as {}".format(store.path_of(hashvalue)))
+        return hashvalue
+
+    @staticmethod
+    def store_images_as(urls, directory, fetcher=None):
+        """Store all urls in parallel; returns their hashes in order, None for the ones that failed."""
+        from tinderbotj.helpers.image_fetcher import ImageFetcher
+        fetcher = fetcher or ImageFetcher.shared()
+        # create the store up front rather than racing to do so in the pool
+        store = StorageHelper.get_image_store(directory)
+
+        with Progress(len(urls), "images") as progress:
+            def store_one(url):
+                # reported by the progress bar rather than printed per image
+                hashvalue = store.store(url, fetcher)
+                progress.advance(ok=hashvalue is not None, url=url, hash=hashvalue)
+                return hashvalue
+
+            return fetcher.map(store_one, urls)
+
+    # open stores by database path, so storing a match doesn't reopen the database
+    _stores = {}
+
+    @staticmethod
+    def get_store(directory, filename):
+        filepath = os.path.join(directory, "{}.sqlite3".format(filename))
+        store = StorageHelper._stores.get(filepath)
+        if store is None:
+            store = StorageHelper._stores[filepath] = MatchStore(filepath)
+
+            # import what older versions stored as one big json file, once
+            legacy = os.path.join(directory, "{}.json".format(filename))
+            if os.path.isfile(legacy):
+                kind = "match" if filename == "matches" else "geomatch"
+                amount = store.import_json(legacy, kind)
+                os.rename(legacy, legacy + ".imported")
+                print("Imported {} records from {} into {}".format(amount, legacy, filepath))
+                events = EventLog.shared()
+                if events is not None:
+                    events.emit("storage.import", source=legacy, store=filepath, records=amount)
+
+            StorageHelper.import_legacy_images(store, os.path.join(directory, "images"))
+        return store
+
+    @staticmethod
+    def import_legacy_images(store, directory):
+        """
+        Move the images older versions stored flat in ``directory``, named after the md5 of their
+        pixels, into the image store, and point the records of ``store`` to their new hashes, once.
+        """
+        if not os.path.isdir(directory):
+            return 0
+        image_store = StorageHelper.get_image_store(directory)
+        hashes = image_store.import_legacy_files()
+        if not hashes:
+            return 0
+        # the records first: if this is interrupted, the next run finds the flat files again
+        records = store.rehash_images(hashes)
+        image_store.remove_legacy_files(hashes)
+        print("Moved {} images from {} into the image store, {} records updated".format(len(hashes), directory, records))
+        events = EventLog.shared()
+        if events is not None:
+            events.emit("storage.import_images", source=directory, images=len(hashes), records=records)
+        return len(hashes)
+
+    @staticmethod
+    def store_match(match, directory, filename):
+        StorageHelper.get_store(directory, filename).upsert(match)
+
+    @staticmethod
+    def store_matches(matches, directory, filename):
+        amount = StorageHelper.get_store(directory, filename).upsert_many(matches)
+        events = EventLog.shared()
+        if events is not None:
+            events.emit("storage.upsert", directory=directory, filename=filename, records=amount)
+        return amount
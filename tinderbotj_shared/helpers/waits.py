@@ -0,0 +1,184 @@
+import time
+from collections import namedtuple
+
+# timeout: seconds to wait at most, about what the fixed sleep it replaces used to cost
+# quiet: for network waits, seconds without a matching request before the endpoint counts as idle
+WaitProfile = namedtuple('WaitProfile', ['timeout', 'quiet'])
+
+WAIT_PROFILES = {
+    # a button, menu or dialog reacting to a click
+    'ui': WaitProfile(timeout=3, quiet=0),
+    # a message, gif, song, social or unmatch reaching the API; these replaced 1.5 s sleeps, and as
+    # the endpoint patterns are guesses that may stop matching, a miss costs at most 0.5 s more
+    'send': WaitProfile(timeout=2, quiet=0.3),
+    # gif and song search results, which replaced 1.5 s sleeps as well
+    'search': WaitProfile(timeout=2, quiet=0.3),
+    # the popup known to follow a dismissed one, which animates in once that one closed
+    'popup': WaitProfile(timeout=1, quiet=0),
+    # a route of the app (or a new page) to load
+    'navigation': WaitProfile(timeout=10, quiet=0.5),
+    # the redirects of a login
+    'login': WaitProfile(timeout=20, quiet=0.5),
+}
+
+# Counts the fetch and XHR requests of the page, so waits can tell when an endpoint went quiet.
+# Installed once per document; returns the current time of the page, to only look at later requests.
+WATCH_NETWORK_JS = """
+() => {
+    if (!window.__tinderbotjNetwork) {
+        const requests = window.__tinderbotjNetwork = [];
+        const track = (url) => {
+            const entry = {url: String(url), start: performance.now(), end: null};
+            requests.push(entry);
+            if (requests.length > 500) requests.shift();
+            return entry;
+        };
+        const fetch = window.fetch;
+        window.fetch = function (input, init) {
+            const entry = track(input && input.url ? input.url : input);
+            return fetch.apply(this, arguments).finally(() => { entry.end = performance.now(); });
+        };
+        const open = XMLHttpRequest.prototype.open;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.__tinderbotjUrl = url;
+            return open.apply(this, arguments);
+        };
+        const send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            const entry = track(this.__tinderbotjUrl);
+            this.addEventListener('loadend', () => { entry.end = performance.now(); });
+            return send.apply(this, arguments);
+        };
+    }
+    return performance.now();
+}
+"""
+
+# Takes {pattern, since, quiet}: true once a request to pattern started after since, all of them ended,
+# and none started or ended for quiet ms
+NETWORK_IDLE_JS = """
+(args) => {
+    const requests = (window.__tinderbotjNetwork || []).filter(
+        (entry) => entry.start >= args.since && entry.url.includes(args.pattern));
+    if (!requests.length || requests.some((entry) => entry.end === null)) return false;
+    return performance.now() - Math.max(...requests.map((entry) => entry.end)) >= args.quiet;
+}
+"""
+
+# Takes {xpath}: observes the element for changes (attributes, children, text, anywhere below it)
+# and returns how many were seen so far; -1 when there's no such element
+WATCH_MUTATIONS_JS = """
+(args) => {
+    const node = document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const watched = window.__tinderbotjMutations = window.__tinderbotjMutations || {};
+    if (!node) return -1;
+    let watch = watched[args.xpath];
+    if (!watch || watch.node !== node) {
+        if (watch) watch.observer.disconnect();
+        watch = watched[args.xpath] = {node: node, count: 0};
+        watch.observer = new MutationObserver((mutations) => { watch.count += mutations.length; });
+        watch.observer.observe(node, {attributes: true, childList: true, characterData: true, subtree: true});
+    }
+    return watch.count;
+}
+"""
+
+# Takes {xpath, since}: true once the element changed since the count WATCH_MUTATIONS_JS returned, or was replaced
+MUTATED_JS = """
+(args) => {
+    const watch = (window.__tinderbotjMutations || {})[args.xpath];
+    if (!watch) return false;
+    const node = document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return node !== watch.node || watch.count > args.since;
+}
+"""
+
+# Takes {fragment}: true once the url of the page contains it
+URL_JS = "(args) => window.location.href.includes(args.fragment)"
+
+# Takes {xpath}: true once nothing matches the xpath anymore
+GONE_JS = """
+(args) => document.evaluate(args.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue === null
+"""
+
+
+class Waits:
+    """
+    Waits for something concrete to happen in the page instead of sleeping for a fixed time.
+
+    Every wait is named after its call site ('chat.send_message', ...) and takes a profile
+    from WAIT_PROFILES for its timeout. When the backend has metrics, each wait is
+    recorded as 'wait.<site>' with how long it actually took and whether it timed out.
+    A wait that times out returns False; callers go on as they did after the old sleep.
+    Network waits need a mark taken before the action that causes the requests.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def element(self, site, xpath, profile='ui', visible=True):
+        """Wait for ``xpath`` to show up (or just be present)."""
+        return self._timed(site, lambda timeout: self.backend.wait(xpath, timeout=timeout, visible=visible), profile)
+
+    def gone(self, site, xpath, profile='ui'):
+        """Wait for ``xpath`` to be removed, e.g. a dialog to close."""
+        return self._until(site, GONE_JS, {'xpath': xpath}, profile)
+
+    def url(self, site, fragment, profile='navigation'):
+        """Wait for the url to contain ``fragment``."""
+        return self._until(site, URL_JS, {'fragment': fragment}, profile)
+
+    def network_mark(self):
+        """Start watching the network (once per page); pass the result to ``network_idle``."""
+        try:
+            return self.backend.evaluate(WATCH_NETWORK_JS)
+        except:
+            return None
+
+    def network_idle(self, site, pattern, mark, profile='send'):
+        """Wait until the requests to urls containing ``pattern`` started after ``mark`` are done and quiet."""
+        if mark is None:
+            return self._until(site, "() => false", None, profile)
+        quiet_ms = WAIT_PROFILES[profile].quiet * 1000
+        return self._until(site, NETWORK_IDLE_JS, {'pattern': pattern, 'since': mark, 'quiet': quiet_ms}, profile)
+
+    def dom_mark(self, xpath):
+        """Start observing ``xpath`` for changes; pass the result to ``dom_changed``."""
+        try:
+            return self.backend.evaluate(WATCH_MUTATIONS_JS, {'xpath': xpath})
+        except:
+            return -1
+
+    def dom_changed(self, site, xpath, mark, profile='ui'):
+        """Wait for ``xpath`` to change (or be replaced) after ``dom_mark`` returned ``mark``."""
+        return self._until(site, MUTATED_JS, {'xpath': xpath, 'since': mark}, profile)
+
+    def script(self, site, script, arg=None, profile='ui'):
+        """Wait for ``script``, a predicate run in the page with ``arg``, to be true."""
+        return self._until(site, script, arg, profile)
+
+    def _until(self, site, script, arg, profile):
+        return self._timed(site, lambda timeout: self.backend.wait_until(script, arg, timeout=timeout), profile)
+
+    def _timed(self, site, wait, profile):
+        timeout = WAIT_PROFILES[profile].timeout
+        metrics = self.backend.metrics
+        if metrics is None:
+            return self._wait(wait, timeout)
+        with metrics.measure('wait.{}'.format(site)) as measurement:
+            done = self._wait(wait, timeout)
+            if not done:
+                measurement.outcome = 'timeout'
+            return done
+
+    @staticmethod
+    def _wait(wait, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return bool(wait(max(deadline - time.monotonic(), 0.1)))
+            except:
+                # the page navigated mid-wait, which destroys what was being evaluated: wait on in the new page
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.1)
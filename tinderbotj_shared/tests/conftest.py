@@ -0,0 +1,17 @@
+import os
+import sys
+import types
+
+SHARED_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The shared code on its own, without either tree: their tinderbotj/__init__.py imports the
+# Session, and with it Playwright or Selenium, which none of these tests need.
+if "tinderbotj" not in sys.modules:
+    package = types.ModuleType("tinderbotj")
+    package.__path__ = [SHARED_PATH]
+    package.SHARED_PATH = SHARED_PATH
+    helpers = types.ModuleType("tinderbotj.helpers")
+    helpers.__path__ = [os.path.join(SHARED_PATH, "helpers")]
+    package.helpers = helpers
+    sys.modules["tinderbotj"] = package
+    sys.modules["tinderbotj.helpers"] = helpers
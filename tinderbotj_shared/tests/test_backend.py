@@ -0,0 +1,33 @@
+import unittest
+
+from tinderbotj.helpers.backend import PlaywrightBackend
+from tinderbotj.helpers.metrics import Metrics
+
+
+class FakePage:
+    url = "https://tinder.com/app/recs"
+
+    def evaluate(self, script, arg=None):
+        return arg
+
+
+class BackendMetricsTests(unittest.TestCase):
+    def test_every_backend_records_to_its_own_metrics(self):
+        first, second = Metrics(":memory:"), Metrics(":memory:")
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        PlaywrightBackend(FakePage(), metrics=first).evaluate("(arg) => arg", 1)
+        PlaywrightBackend(FakePage(), metrics=second).evaluate("(arg) => arg", 2)
+        PlaywrightBackend(FakePage(), metrics=second).evaluate("(arg) => arg", 3)
+
+        self.assertEqual(first.totals["browser.evaluate"][0], 1)
+        self.assertEqual(second.totals["browser.evaluate"][0], 2)
+
+    def test_backend_without_metrics_records_nothing(self):
+        metrics = Metrics(":memory:")
+        self.addCleanup(metrics.close)
+        PlaywrightBackend(FakePage(), metrics=metrics)
+        self.assertEqual(PlaywrightBackend(FakePage()).evaluate("(arg) => arg", 1), 1)
+        self.assertIsNone(PlaywrightBackend.metrics)
+        self.assertEqual(dict(metrics.totals), {})
@@ -0,0 +1,106 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from tinderbotj.helpers.image_store import ImageStore
+from tinderbotj.helpers.match_store import MatchStore
+from tinderbotj.helpers.storage_helper import StorageHelper
+
+
+def image_bytes(format, color=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, format)
+    return buffer.getvalue()
+
+
+class FakeFetcher:
+    """Serves ``bodies`` by url in small chunks; a url in ``flaky`` sends half its body before it's retried."""
+
+    def __init__(self, bodies, flaky=()):
+        self.bodies = bodies
+        self.flaky = set(flaky)
+        self.requests = []
+
+    def fetch_into(self, url, file):
+        self.requests.append(url)
+        body = self.bodies.get(url)
+        if body is None:
+            return False
+        attempts = [body[:len(body) // 2], body] if url in self.flaky else [body]
+        for sent in attempts:
+            file.seek(0)
+            file.truncate()
+            for start in range(0, len(sent), 7):
+                file.write(sent[start:start + 7])
+        return True
+
+
+class ImageStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.store = ImageStore(self.root)
+        self.addCleanup(self.store.close)
+
+    def test_jpeg_is_stored_byte_for_byte_under_its_hash(self):
+        jpeg = image_bytes("jpeg")
+        fetcher = FakeFetcher({"https://images/a.jpg?sig=1": jpeg}, flaky=["https://images/a.jpg?sig=1"])
+        sha256 = self.store.store("https://images/a.jpg?sig=1", fetcher)
+        self.assertEqual(sha256, hashlib.sha256(jpeg).hexdigest())
+        with open(self.store.path_of(sha256), "rb") as f:
+            self.assertEqual(f.read(), jpeg)
+        self.assertEqual(os.path.relpath(self.store.path_of(sha256), self.root).split(os.sep)[:2], [sha256[:2], sha256[2:4]])
+        # nothing left behind by the download
+        self.assertFalse([name for name in os.listdir(self.root) if name.endswith(".tmp")])
+
+    def test_known_url_is_not_downloaded_again(self):
+        fetcher = FakeFetcher({"https://images/a.jpg?sig=1": image_bytes("jpeg")})
+        first = self.store.store("https://images/a.jpg?sig=1", fetcher)
+        self.assertEqual(self.store.store("https://images/a.jpg?sig=2", fetcher), first)
+        self.assertEqual(fetcher.requests, ["https://images/a.jpg?sig=1"])
+
+    def test_other_formats_are_transcoded_to_jpeg(self):
+        sha256 = self.store.store("https://images/a.webp", FakeFetcher({"https://images/a.webp": image_bytes("webp")}))
+        with Image.open(self.store.path_of(sha256)) as im:
+            self.assertEqual(im.format, "JPEG")
+
+    def test_failed_download_stores_nothing(self):
+        self.assertIsNone(self.store.store("https://images/missing.jpg", FakeFetcher({})))
+        self.assertFalse([name for name in os.listdir(self.root) if name.endswith(".tmp")])
+
+
+class LegacyImagesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.images = os.path.join(self.directory, "images")
+        os.makedirs(self.images)
+
+    def test_flat_images_move_into_the_store_and_records_follow(self):
+        jpeg = image_bytes("jpeg")
+        old_hash = hashlib.md5(b"pixels").hexdigest()
+        with open(os.path.join(self.images, old_hash + ".jpg"), "wb") as f:
+            f.write(jpeg)
+
+        store = MatchStore(os.path.join(self.directory, "matches.sqlite3"))
+        self.addCleanup(store.close)
+        with store.connection:
+            store.connection.execute(store.UPSERT, store._row("chat1", "match", {"name": "Ann", "images_by_hashes": [old_hash]}))
+
+        self.assertEqual(StorageHelper.import_legacy_images(store, self.images), 1)
+        image_store = StorageHelper._image_stores[self.images]
+        self.addCleanup(lambda: StorageHelper._image_stores.pop(self.images).close())
+
+        new_hash = hashlib.sha256(jpeg).hexdigest()
+        self.assertEqual(store.get("chat1")["images_by_hashes"], [new_hash])
+        self.assertTrue(os.path.isfile(image_store.path_of(new_hash)))
+        self.assertEqual(image_store.legacy_files(), [])
+        # once is enough
+        self.assertEqual(StorageHelper.import_legacy_images(store, self.images), 0)
@@ -0,0 +1,103 @@
+import json
+import shutil
+import subprocess
+import unittest
+
+from tinderbotj.helpers.login_state import LoginState, local_storage_script
+
+
+class LocalStorageScriptTests(unittest.TestCase):
+    origin = {
+        "origin": "https://tinder.com",
+        "localStorage": [
+            {"name": "TinderWeb/APIToken", "value": "abc"},
+            {"name": "quotes", "value": "it's {\"json\"}"},
+        ],
+    }
+
+    def test_script_passes_origin_and_items_as_json(self):
+        script = local_storage_script(self.origin)
+        self.assertTrue(script.endswith('("https://tinder.com", {"TinderWeb/APIToken": "abc", '
+                                        '"quotes": "it\'s {\\"json\\"}"});'))
+
+    def test_origin_without_local_storage(self):
+        self.assertTrue(local_storage_script({"origin": "https://tinder.com"}).endswith('("https://tinder.com", {});'))
+
+    @unittest.skipUnless(shutil.which("node"), "needs node")
+    def test_script_restores_missing_items_only(self):
+        page = ("const store = {'TinderWeb/APIToken': 'kept'};"
+                "globalThis.location = {origin: 'https://tinder.com'};"
+                "globalThis.localStorage = {getItem: (k) => k in store ? store[k] : null,"
+                " setItem: (k, v) => { store[k] = v; }};")
+        output = subprocess.run(["node", "-e", page + local_storage_script(self.origin) + "console.log(JSON.stringify(store));"],
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(json.loads(output), {"TinderWeb/APIToken": "kept", "quotes": "it's {\"json\"}"})
+
+
+class LoginStateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.logged_in = True
+        self.state = LoginState(self.revalidate, ttl=60, clock=lambda: self.now)
+        self.fingerprints = []
+
+    def revalidate(self):
+        return self.logged_in
+
+    def probe(self):
+        # the fingerprint the browser shows now, None when it can't tell
+        return self.fingerprints[0] if self.fingerprints else None
+
+    def check(self, fingerprint=None, url=None):
+        self.fingerprints[:] = [fingerprint]
+        return self.state.is_logged_in(probe=self.probe, url=url)
+
+    def test_check_is_trusted_until_the_ttl_runs_out(self):
+        self.assertTrue(self.check("abc"))
+        self.now = 59
+        self.assertTrue(self.check("abc"))
+        self.now = 61
+        self.assertTrue(self.check("abc"))
+        self.assertEqual(self.state.stats, {"hits": 1, "revalidations": 2, "invalidations": 0})
+
+    def test_changed_credentials_invalidate(self):
+        self.check("abc")
+        self.logged_in = False
+        self.assertFalse(self.check("def"))
+        self.assertEqual(self.state.stats["invalidations"], 1)
+        self.assertEqual(self.state.last_invalidation, "auth cookies or token changed")
+
+    def test_fingerprint_is_probed_again_after_revalidating(self):
+        # the page reload of the revalidation refreshes the token
+        self.fingerprints[:] = ["before"]
+        self.state.revalidate = lambda: self.fingerprints.__setitem__(0, "after") or True
+        self.assertTrue(self.state.is_logged_in(probe=self.probe))
+        self.assertTrue(self.check("after"))
+        self.assertEqual(self.state.stats, {"hits": 1, "revalidations": 1, "invalidations": 0})
+
+    def test_unknown_fingerprint_is_never_the_baseline(self):
+        self.check(None)
+        self.check("abc")
+        self.check("abc")
+        self.assertEqual(self.state.fingerprint, "abc")
+        self.assertEqual(self.state.stats, {"hits": 2, "revalidations": 1, "invalidations": 0})
+
+    def test_unknown_fingerprint_doesnt_invalidate(self):
+        self.check("abc")
+        self.assertTrue(self.check(None))
+        self.assertEqual(self.state.fingerprint, "abc")
+
+    def test_logged_out_page_invalidates(self):
+        self.check("abc", url="https://tinder.com/app/recs")
+        self.assertEqual(self.state.stats["hits"], 0)
+        self.check("abc", url="https://tinder.com/app/login")
+        self.assertEqual(self.state.stats, {"hits": 0, "revalidations": 2, "invalidations": 1})
+
+    def test_unauthorized_api_response_invalidates(self):
+        self.check("abc")
+        self.state.on_response("https://tinder.com/static/app.js", 401)
+        self.assertTrue(self.state.logged_in)
+        self.state.on_response("https://api.gotinder.com/v2/recs/core", 401)
+        self.assertFalse(self.state.logged_in)
+        self.assertEqual(self.state.last_invalidation, "API request was unauthorized")
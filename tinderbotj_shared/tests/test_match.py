@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tinderbotj.helpers.geomatch import Geomatch
+from tinderbotj.helpers.match import Match
+from tinderbotj.helpers.match_store import MatchStore
+
+
+def profile(**fields):
+    return dict(name="Ann", age=25, work="Engineer", study="UGent", home="Ghent", gender="Woman", bio="Hi",
+                distance=12, basics=["Leo"], lifestyle=["Dogs"], passions=["Hiking"],
+                anthem={"song": "Song", "artist": "Artist"}, looking_for="Friends",
+                image_urls=["https://images/1.jpg"], images_by_hashes=["ab" * 32], instagram="ann", **fields)
+
+
+class FromDictionaryTests(unittest.TestCase):
+
+    def test_geomatch_round_trip(self):
+        geomatch = Geomatch(id="Ann25_AB12", **profile())
+        copy = Geomatch.from_dictionary(geomatch.get_dictionary())
+        self.assertEqual(copy.get_dictionary(), geomatch.get_dictionary())
+        self.assertEqual(copy.get_row(), geomatch.get_row())
+
+    def test_match_round_trip_keeps_the_chat_id(self):
+        match = Match(chatid="chat1", id="Ann25_AB12", **profile())
+        copy = Match.from_dictionary(match.get_dictionary())
+        self.assertEqual(copy.get_chat_id(), "chat1")
+        self.assertEqual(copy.get_dictionary(), match.get_dictionary())
+
+    def test_round_trip_through_the_store(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store = MatchStore(os.path.join(directory, "matches.sqlite3"))
+        self.addCleanup(store.close)
+
+        match = Match(chatid="chat1", id="Ann25_AB12", **profile())
+        store.upsert(match)
+        self.assertEqual(Match.from_dictionary(store.get("chat1")).get_dictionary(), match.get_dictionary())
+
+    def test_unknown_keys_are_ignored_and_missing_ones_default(self):
+        geomatch = Geomatch.from_dictionary({"name": "Bea", "id": "Bea30_CD34", "kind": "geomatch", "chatid": "x"})
+        self.assertEqual((geomatch.name, geomatch.get_id(), geomatch.age), ("Bea", "Bea30_CD34", None))
+        self.assertEqual(geomatch.images_by_hashes, [])
+        self.assertFalse(hasattr(geomatch, "chatid"))
+
+    def test_id_is_generated_when_missing(self):
+        geomatch = Geomatch.from_dictionary({"name": "Bea", "age": 30})
+        self.assertRegex(geomatch.get_id(), r"^Bea30_[A-Z0-9]{4}$")
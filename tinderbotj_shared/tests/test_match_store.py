@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tinderbotj.helpers.geomatch import Geomatch
+from tinderbotj.helpers.match import Match
+from tinderbotj.helpers.match_store import MatchStore
+
+
+class MatchStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = MatchStore(os.path.join(self.directory, "matches.sqlite3"))
+        self.addCleanup(self.store.close)
+
+    def test_storing_a_match_again_updates_it(self):
+        self.store.upsert(Match(chatid="chat1", name="Ann", age=25, bio="first"))
+        self.store.upsert(Match(chatid="chat1", name="Ann", age=26, bio="second"))
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.get("chat1")["bio"], "second")
+        self.assertEqual(self.store.find(min_age=26)[0]["age"], 26)
+
+    def test_matches_are_keyed_by_chat_id_and_geomatches_by_id(self):
+        geomatch = Geomatch(name="Bea", age=30, id="Bea30_AB12")
+        self.assertEqual(self.store.upsert_many([Match(chatid="chat1", name="Ann"), geomatch]), 2)
+        self.assertIn("chat1", self.store)
+        self.assertIn("Bea30_AB12", self.store)
+        self.assertEqual(self.store.count("match"), 1)
+        self.assertEqual(self.store.count("geomatch"), 1)
+        self.assertEqual([record["kind"] for record in self.store.iter_records()], ["match", "geomatch"])
+
+    def test_find_filters_and_orders_newest_first(self):
+        self.store.upsert_many([Geomatch(name="Ann", age=22, distance=5, id="a"),
+                                Geomatch(name="Bea", age=30, distance=50, id="b")])
+        self.store.upsert(Geomatch(name="Cat", age=28, distance=10, id="c"))
+        self.assertEqual([record["id"] for record in self.store.find(max_distance=20)], ["c", "a"])
+        self.assertEqual([record["id"] for record in self.store.find(min_age=25, max_age=29)], ["c"])
+        self.assertEqual(len(self.store.find(limit=2)), 2)
+
+    def test_import_json_of_the_old_storage_helper(self):
+        legacy = os.path.join(self.directory, "matches.json")
+        with open(legacy, "w", encoding="utf-8") as fp:
+            json.dump({
+                "Ann25_AB12": {"name": "Ann", "age": 25, "chatid": "chat1", "id": "Ann25_AB12"},
+                "Bea30_CD34": {"name": "Bea", "age": 30, "chatid": None, "id": "Bea30_CD34"},
+            }, fp)
+        self.assertEqual(self.store.import_json(legacy, "match"), 2)
+        # keyed by chat id where there is one, by the json key otherwise
+        self.assertEqual(self.store.get("chat1")["name"], "Ann")
+        self.assertEqual(self.store.get("Bea30_CD34")["name"], "Bea")
+        # importing again changes nothing
+        self.store.import_json(legacy, "match")
+        self.assertEqual(self.store.count("match"), 2)
+
+    def test_seen_chat_ids_are_kept_per_list(self):
+        self.store.mark_seen(["chat1", "chat2"], "new")
+        self.store.mark_seen(["chat2"], "new")
+        self.store.mark_seen(["chat3"], "messaged")
+        self.assertEqual(self.store.seen_chat_ids("new"), {"chat1", "chat2"})
+        self.store.forget_seen("new")
+        self.assertEqual(self.store.seen_chat_ids("new"), set())
+        self.assertEqual(self.store.seen_chat_ids("messaged"), {"chat3"})
@@ -0,0 +1,72 @@
+import unittest
+
+from tinderbotj.helpers.match_sync import MatchListSync
+
+
+class FakeBackend:
+    """A match list of ``chatids``, top first, that loads ``page`` more entries on every scroll."""
+
+    def __init__(self, chatids, page=5):
+        self.chatids = chatids
+        self.page = page
+        self.loaded = page
+
+    def wait(self, xpath, timeout=None, visible=True):
+        return True
+
+    def click(self, xpath):
+        pass
+
+    def query(self, xpath, attribute=None):
+        return ["/app/messages/" + chatid for chatid in self.chatids[:self.loaded]]
+
+    def evaluate(self, script, arg=None):
+        return min(self.loaded, len(self.chatids))
+
+    def wait_until(self, script, arg=None, timeout=None):
+        if self.loaded >= len(self.chatids):
+            return False
+        self.loaded += self.page
+        return True
+
+
+class FakeStore:
+    def __init__(self, seen):
+        self.seen = seen
+
+    def seen_chat_ids(self, list_name):
+        return set(self.seen.get(list_name, ()))
+
+
+def ids(*numbers):
+    return ["c{}".format(number) for number in numbers]
+
+
+class MatchListSyncTests(unittest.TestCase):
+
+    def sync(self, name, chatids, seen=(), amount=100):
+        sync = MatchListSync(FakeBackend(chatids), FakeStore({name: seen}))
+        return [chatid for batch in sync.batches(name, amount) for chatid in batch]
+
+    def test_without_store_every_chat_id_is_handed_out_once(self):
+        sync = MatchListSync(FakeBackend(ids(*range(12))))
+        self.assertEqual([chatid for batch in sync.batches('new', 100) for chatid in batch], ids(*range(12)))
+
+    def test_amount_is_respected(self):
+        self.assertEqual(self.sync('messaged', ids(*range(12)), amount=7), ids(*range(7)))
+
+    def test_new_list_stops_at_the_first_known_chat_id(self):
+        self.assertEqual(self.sync('new', ids(*range(12)), seen=ids(3, 8)), ids(0, 1, 2))
+
+    def test_messaged_list_skips_known_chat_ids_moved_to_the_top(self):
+        # c0 and c2 got a new message, c5 and c7 were never handed out
+        chatids = ids(0, 2, 5, 1, 3, 7, 4, 6)
+        self.assertEqual(self.sync('messaged', chatids, seen=ids(0, 1, 2, 3, 4, 6)), ids(5, 7))
+
+    def test_messaged_list_stops_after_a_run_of_known_chat_ids(self):
+        chatids = ids(*range(30))
+        seen = ids(*range(1, 11)) + ids(*range(12, 30))
+        # the run of ten from c1 ends the sync before c11
+        self.assertEqual(self.sync('messaged', chatids, seen=seen), ids(0))
+        seen = ids(*range(1, 10)) + ids(*range(11, 30))
+        self.assertEqual(self.sync('messaged', chatids, seen=seen), ids(0, 10))
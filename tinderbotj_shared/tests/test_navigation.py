@@ -0,0 +1,58 @@
+import unittest
+
+from tinderbotj.helpers.navigation import ChatNavigator
+
+
+class FakeBackend:
+    metrics = None
+
+    def __init__(self, url="https://tinder.com/app/recs"):
+        self.url = url
+
+
+class ChatNavigatorTests(unittest.TestCase):
+
+    def test_plan_groups_operations_per_chat_in_order(self):
+        operations = [
+            ("send_message", "chat1", "hi"),
+            ("get_name", "chat2"),
+            ("send_gif", "chat1", "cat"),
+            ("unmatch", "chat3"),
+            ("get_bio", "chat2"),
+        ]
+        self.assertEqual(ChatNavigator.plan(operations), [
+            (0, ("send_message", "chat1", "hi")),
+            (2, ("send_gif", "chat1", "cat")),
+            (1, ("get_name", "chat2")),
+            (4, ("get_bio", "chat2")),
+            (3, ("unmatch", "chat3")),
+        ])
+
+    def test_plan_of_nothing(self):
+        self.assertEqual(ChatNavigator.plan([]), [])
+
+    def test_plan_rejects_unknown_actions(self):
+        with self.assertRaises(ValueError):
+            ChatNavigator.plan([("send_message", "chat1", "hi"), ("like", "chat1")])
+
+    def test_open_chat_is_not_navigated_to_again(self):
+        backend = FakeBackend()
+        opened = []
+
+        def open_chat(chatid):
+            opened.append(chatid)
+            backend.url = "https://tinder.com/app/messages/" + chatid
+
+        navigator = ChatNavigator(backend, open_chat)
+        self.assertTrue(navigator.open("chat1"))
+        self.assertFalse(navigator.open("chat1"))
+        # a chat id that merely ends the same way is another chat
+        self.assertTrue(navigator.open("hat1"))
+        self.assertEqual(opened, ["chat1", "hat1"])
+        self.assertEqual((navigator.navigations, navigator.coalesced), (2, 1))
+
+    def test_previous_tab_is_searched_first(self):
+        navigator = ChatNavigator(FakeBackend(), lambda chatid: None)
+        self.assertEqual(navigator.tabs(), ("Messages", "Matches"))
+        navigator.found_in("Matches")
+        self.assertEqual(navigator.tabs(), ("Matches", "Messages"))
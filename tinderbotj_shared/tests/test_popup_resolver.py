@@ -0,0 +1,50 @@
+import unittest
+
+from tinderbotj.helpers.popup_resolver import POPUP_SHOWN_JS, RESOLVE_POPUP_JS, PopupResolver
+
+
+class FakeBackend:
+    """Dismisses the popups in ``shown``, one per check; ``chained_shows`` says whether the next one shows up in time."""
+
+    metrics = None
+
+    def __init__(self, shown, chained_shows=True):
+        self.shown = list(shown)
+        self.chained_shows = chained_shows
+        self.calls = []
+
+    def evaluate(self, script, arg=None):
+        assert script == RESOLVE_POPUP_JS
+        self.calls.append("check")
+        return self.shown.pop(0) if self.shown else None
+
+    def wait_until(self, script, arg=None, timeout=5):
+        assert script == POPUP_SHOWN_JS
+        self.calls.append(("wait", arg["dismissed"]))
+        return self.chained_shows
+
+
+class PopupResolverTests(unittest.TestCase):
+
+    def test_no_popup_is_one_check(self):
+        backend = FakeBackend([])
+        self.assertIsNone(PopupResolver(backend).resolve())
+        self.assertEqual(backend.calls, ["check"])
+
+    def test_popup_without_a_follow_up_is_not_waited_for(self):
+        backend = FakeBackend(["new_match"])
+        self.assertEqual(PopupResolver(backend).resolve().name, "new_match")
+        self.assertEqual(backend.calls, ["check"])
+
+    def test_chained_popup_is_waited_for_before_looking_again(self):
+        backend = FakeBackend(["confirm_email", "add_location", "new_match"])
+        resolver = PopupResolver(backend)
+        self.assertEqual(resolver.resolve().name, "new_match")
+        confirm_email, add_location = resolver.popups["confirm_email"], resolver.popups["add_location"]
+        self.assertEqual(backend.calls, ["check", ("wait", confirm_email.xpath), "check", ("wait", add_location.xpath), "check"])
+        self.assertEqual(resolver.counts, {"confirm_email": 1, "add_location": 1, "new_match": 1})
+
+    def test_no_follow_up_in_time_ends_the_check(self):
+        backend = FakeBackend(["confirm_email", "new_match"], chained_shows=False)
+        self.assertEqual(PopupResolver(backend).resolve().name, "confirm_email")
+        self.assertEqual(backend.calls, ["check", ("wait", PopupResolver(backend).popups["confirm_email"].xpath)])
@@ -0,0 +1,48 @@
+import unittest
+
+from tinderbotj.helpers.constants_helper import Sexuality
+from tinderbotj.helpers.preferences import Preferences, changed_preferences, read_preferences
+
+
+class FakeBackend:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def evaluate(self, script, arg=None):
+        return self.raw
+
+
+class PreferencesTests(unittest.TestCase):
+
+    current = Preferences(km=80, min_age=20, max_age=30, sexuality=Sexuality.WOMEN, global_mode=False)
+
+    def test_nothing_wanted_changes_nothing(self):
+        self.assertEqual(changed_preferences(self.current, Preferences()), {})
+
+    def test_only_differing_settings_change(self):
+        wanted = Preferences(km=80, min_age=22, max_age=30, sexuality=Sexuality.EVERYONE, global_mode=False)
+        self.assertEqual(changed_preferences(self.current, wanted), {'min_age': 22, 'sexuality': Sexuality.EVERYONE})
+
+    def test_distance_within_a_slider_step_is_left_alone(self):
+        self.assertEqual(changed_preferences(self.current, Preferences(km=81)), {})
+        self.assertEqual(changed_preferences(self.current, Preferences(km=90)), {'km': 90})
+
+    def test_distance_is_clamped_to_the_slider(self):
+        self.assertEqual(changed_preferences(self.current, Preferences(km=500)), {'km': 160})
+        self.assertEqual(changed_preferences(self.current._replace(km=160), Preferences(km=500)), {})
+
+    def test_settings_that_couldnt_be_read_are_changed(self):
+        unknown = Preferences()
+        self.assertEqual(changed_preferences(unknown, Preferences(km=50, global_mode=True)), {'km': 50, 'global_mode': True})
+
+    def test_read_preferences_converts_the_sliders(self):
+        raw = {'distance': 50.0, 'ageFloor': 18, 'ageCeiling': 100, 'minAge': 2.439, 'maxAge': 14.634,
+               'sexuality': "Women", 'global': True}
+        preferences, read = read_preferences(FakeBackend(raw))
+        self.assertEqual(preferences, Preferences(km=80, min_age=20, max_age=30, sexuality=Sexuality.WOMEN, global_mode=True))
+        self.assertIs(read, raw)
+
+    def test_read_preferences_with_missing_sliders(self):
+        raw = {'distance': None, 'ageFloor': None, 'ageCeiling': None, 'minAge': None, 'maxAge': None,
+               'sexuality': None, 'global': False}
+        self.assertEqual(read_preferences(FakeBackend(raw))[0], Preferences(global_mode=False))
@@ -0,0 +1,48 @@
+import unittest
+from datetime import datetime
+
+from tinderbotj.helpers.schedule import CronSchedule
+
+
+class CronScheduleTests(unittest.TestCase):
+
+    def test_fields(self):
+        schedule = CronSchedule("*/15 8-20/4 1,15 * 7")
+        self.assertEqual(schedule.minutes, {0, 15, 30, 45})
+        self.assertEqual(schedule.hours, {8, 12, 16, 20})
+        self.assertEqual(schedule.days, {1, 15})
+        self.assertEqual(schedule.months, set(range(1, 13)))
+        # 7 is Sunday too
+        self.assertEqual(schedule.weekdays, {0})
+
+    def test_step_from_a_start(self):
+        self.assertEqual(CronSchedule("5/20 * * * *").minutes, {5, 25, 45})
+
+    def test_invalid_expressions(self):
+        for expression in ("* * * *", "60 * * * *", "* 5-1 * * *", "* * 0 * *", "*/0 * * * *", "a * * * *"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                CronSchedule(expression)
+
+    def test_next_after_is_strictly_later(self):
+        schedule = CronSchedule("30 9 * * *")
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 1, 9, 29, 59)), datetime(2024, 5, 1, 9, 30))
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 1, 9, 30)), datetime(2024, 5, 2, 9, 30))
+
+    def test_next_after_crosses_months_and_years(self):
+        schedule = CronSchedule("0 0 1 1 *")
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 1, 12, 0)), datetime(2025, 1, 1, 0, 0))
+        self.assertEqual(CronSchedule("0 0 29 2 *").next_after(datetime(2025, 3, 1)), datetime(2028, 2, 29))
+
+    def test_either_day_field_when_both_are_restricted(self):
+        # the 15th or any Monday; 2024-05-06 is a Monday
+        schedule = CronSchedule("0 12 15 * 1")
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 1)), datetime(2024, 5, 6, 12, 0))
+        self.assertEqual(schedule.next_after(datetime(2024, 5, 13, 12, 0)), datetime(2024, 5, 15, 12, 0))
+
+    def test_weekdays_only(self):
+        # 2024-05-04 is a Saturday
+        self.assertEqual(CronSchedule("0 9 * * 1-5").next_after(datetime(2024, 5, 4, 8, 0)), datetime(2024, 5, 6, 9, 0))
+
+    def test_schedule_that_never_runs(self):
+        with self.assertRaises(ValueError):
+            CronSchedule("0 0 30 2 *").next_after(datetime(2024, 1, 1))